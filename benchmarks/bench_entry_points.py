@@ -0,0 +1,339 @@
+"""
+Benchmarks the public entry points of pyAFL offline, against recorded (or synthetic) afltables pages
+(see `pyAFL.testing.fixtures`), and compares the results with a saved baseline.
+
+Pages are served by a requests adapter mounted on the session, so every operation runs the whole path of
+a real lookup (request cache, link rewriting, parsing, local store and parse cache) without the network.
+The request cache, local store and player index are kept in a temporary directory, so the user's caches
+are neither used nor changed. Each operation is measured:
+ - cold: every cache empty (a first lookup)
+ - disk: the request cache and local store filled, the in-memory caches empty (a later process)
+ - warm: every cache filled (a repeated lookup in the same process)
+
+The link rewriters of the session's `post_process` are measured on every raw page.
+
+For each operation this reports the best and median time of `--repeat` runs, and the peak memory
+allocated by one run (measured separately with `tracemalloc`, which only sees allocations made through
+Python's allocators, eg not those of lxml). The report is saved as json with `--report`. Operations more
+than `--tolerance` slower, or `--memory-tolerance` larger, than in the baseline are flagged as
+regressions, and the benchmark then exits with status 1.
+
+Usage:
+    python -m benchmarks.bench_entry_points                       # compare with benchmarks/baseline.json
+    python -m benchmarks.bench_entry_points --fixtures DIR        # use pages recorded with pyAFL.testing.fixtures
+    python -m benchmarks.bench_entry_points --report report.json  # also save the report
+    python -m benchmarks.bench_entry_points --save-baseline       # save the results as the new baseline
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from io import BytesIO
+
+import pandas as pd
+from requests import Response
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from pyAFL import config
+from pyAFL.base.memo import parse_cache
+from pyAFL.base.store import page_digest, store
+from pyAFL.players.index import PlayerIndex, player_index
+from pyAFL.players.models import Player
+from pyAFL.seasons.models import Season
+from pyAFL.session import session
+from pyAFL.session.backends import CompressedSQLiteCache
+from pyAFL.session.rewriters import LINK_REWRITERS
+from pyAFL.teams.models import Team
+from pyAFL.testing.fixtures import load_pages, synthetic_pages
+
+# Bump whenever the operations or the fields of the report change, so that old baselines are not compared
+REPORT_VERSION = 1
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+CASES = ("cold", "disk", "warm")
+
+PLAYER_NAME = "Stuart Magee"
+TEAM = "richmond"
+YEAR = 2019
+
+PLAYER_URL = config.AFLTABLES_STATS_BASE_URL + "stats/players/S/Stuart_Magee.html"
+
+# Public entry points, called with a new object each time so that nothing is kept on the instances
+OPERATIONS = {
+    "player_lookup": lambda: Player(PLAYER_NAME).url,
+    "player_stats": lambda: Player(PLAYER_NAME, url=PLAYER_URL).get_player_stats(),
+    "team_players": lambda: Team(TEAM.title(), TEAM).players,
+    "team_games": lambda: Team(TEAM.title(), TEAM).games,
+    "team_season_stats": lambda: Team(TEAM.title(), TEAM).season_stats(YEAR),
+    "season_stats": lambda: Season(YEAR).get_season_stats(),
+}
+
+
+class FixtureAdapter(HTTPAdapter):
+    """
+    A requests adapter which serves `pages` (url -> raw html), with an ETag, instead of sending requests.
+    Unknown urls get a 404.
+    """
+
+    def __init__(self, pages: dict):
+        super().__init__()
+        self.pages = pages
+
+    def send(self, request, **kwargs):
+        body = self.pages.get(request.url)
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        if body is None:
+            status, reason, body = 404, "Not Found", b""
+        else:
+            status, reason = 200, "OK"
+            headers["ETag"] = '"%s"' % page_digest(body)
+        headers["Content-Length"] = str(len(body))
+        raw = HTTPResponse(
+            body=BytesIO(body),
+            headers=headers,
+            status=status,
+            reason=reason,
+            preload_content=False,
+            decode_content=False,
+            request_url=request.url,
+        )
+        return self.build_response(request, raw)
+
+
+class _State(object):
+    """Points the request cache, local store and player index of this process at a temporary directory."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._count = 0
+
+    def reset(self):
+        """Starts from empty caches."""
+        self._count += 1
+        path = os.path.join(self.root, str(self._count))
+        os.makedirs(path)
+        config.CACHE_DIR = path  # Nothing is created in the user cache dir, even by the first use of the session
+        session.cache = CompressedSQLiteCache(os.path.join(path, "cache.sqlite"))
+        store.path = os.path.join(path, "store.sqlite")
+        player_index.path = os.path.join(path, "player_index.json")
+        self.drop_memory()
+
+    def drop_memory(self):
+        """Empties the in-memory caches, as in a new process; the caches saved to disk are kept."""
+        store._local = threading.local()
+        PlayerIndex.__init__(player_index, player_index.path, player_index.base_url)
+        parse_cache.clear()
+
+
+def _run(setup, fn, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        setup()
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": min(times), "median_seconds": statistics.median(times), "peak_bytes": peak}
+
+
+def _measure_operation(state: _State, fn, case: str, repeat: int) -> dict:
+    if case == "cold":
+        return _run(state.reset, fn, repeat)
+
+    state.reset()
+    fn()
+    return _run(state.drop_memory if case == "disk" else lambda: None, fn, repeat)
+
+
+def _measure_post_process(pages: dict, rewriter: str, repeat: int) -> dict:
+    responses = {url: Response() for url in pages}
+
+    def fn():
+        for url, response in responses.items():
+            response._content = pages[url]
+            session.post_process(url, response)
+
+    previous = session.link_rewriter
+    session.link_rewriter = rewriter
+    try:
+        return _run(lambda: None, fn, repeat)
+    finally:
+        session.link_rewriter = previous
+
+
+def _machine() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "pandas": pd.__version__,
+        "html_parser": config.HTML_PARSER,
+    }
+
+
+def run(fixtures_dir: str = None, repeat: int = 5, only=None) -> dict:
+    """
+    Runs the benchmarks and returns the report.
+
+    Parameters
+    ----------
+        fixtures_dir : str
+            directory of recorded pages (see `pyAFL.testing.fixtures`); missing pages are synthetic
+        repeat : int
+            number of timed runs of each operation
+        only : iterable of str
+            names of the operations to run (default: every operation, and "post_process")
+
+    Returns
+    ----------
+        report : dict
+            machine, settings and the results of each operation, keyed "{operation}/{case}"
+    """
+    pages = synthetic_pages(PLAYER_NAME, TEAM, YEAR)
+    if fixtures_dir:
+        pages.update(load_pages(fixtures_dir))
+    pages = {config.AFLTABLES_STATS_BASE_URL + path: body for path, body in pages.items()}
+    names = list(only or list(OPERATIONS) + ["post_process"])
+    results = {}
+
+    root = tempfile.mkdtemp(prefix="pyafl-bench-")
+    session.use_snapshot(None)
+    session.mount(config.AFLTABLES_STATS_BASE_URL, FixtureAdapter(pages))
+    state = _State(root)
+    try:
+        for name in names:
+            if name == "post_process":
+                for rewriter in LINK_REWRITERS:
+                    results[f"post_process/{rewriter}"] = _measure_post_process(pages, rewriter, repeat)
+                continue
+            for case in CASES:
+                results[f"{name}/{case}"] = _measure_operation(state, OPERATIONS[name], case, repeat)
+    finally:
+        session.adapters.pop(config.AFLTABLES_STATS_BASE_URL)
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "version": REPORT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": _machine(),
+        "fixtures": {url: len(body) for url, body in pages.items()},
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.25, memory_tolerance: float = 0.10,
+            min_seconds: float = 0.001) -> list:
+    """
+    Adds the ratios to the baseline to each result of `report`, and returns the keys of the regressions:
+    results more than `tolerance` slower (and at least `min_seconds` slower, to ignore the noise of very
+    fast operations), or allocating more than `memory_tolerance` more memory, than in `baseline`.
+    """
+    if baseline.get("version") != REPORT_VERSION:
+        return []
+
+    regressions = []
+    for key, result in report["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        result["baseline_seconds"] = base["seconds"]
+        result["baseline_peak_bytes"] = base["peak_bytes"]
+        result["time_ratio"] = result["seconds"] / base["seconds"] if base["seconds"] else None
+        result["memory_ratio"] = result["peak_bytes"] / base["peak_bytes"] if base["peak_bytes"] else None
+        slower = (
+            result["time_ratio"] is not None and
+            result["time_ratio"] > 1 + tolerance and
+            result["seconds"] - base["seconds"] >= min_seconds
+        )
+        larger = result["memory_ratio"] is not None and result["memory_ratio"] > 1 + memory_tolerance
+        result["regression"] = slower or larger
+        if result["regression"]:
+            regressions.append(key)
+
+    return regressions
+
+
+def _print_report(report: dict):
+    print(f"{'operation':<32}{'best ms':>10}{'median ms':>11}{'peak KiB':>11}{'time x':>9}{'mem x':>8}")
+    for key, result in report["results"].items():
+        ratios = "".join(
+            f"{result[ratio]:>{width}.2f}" if result.get(ratio) is not None else f"{'':>{width}}"
+            for ratio, width in (("time_ratio", 9), ("memory_ratio", 8))
+        )
+        print(
+            f"{key:<32}{result['seconds'] * 1000:>10.2f}{result['median_seconds'] * 1000:>11.2f}"
+            f"{result['peak_bytes'] / 1024:>11.0f}{ratios}{'  REGRESSION' if result.get('regression') else ''}"
+        )
+
+
+def _load_json(path: str):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_json(obj: dict, path: str):
+    with open(path, "w") as f:
+        json.dump(obj, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(args) -> int:
+    report = run(args.fixtures, args.repeat, args.only)
+
+    baseline = None if args.save_baseline else _load_json(args.baseline)
+    regressions = []
+    if baseline is not None:
+        if baseline.get("machine") != report["machine"]:
+            print(f"Note: the baseline {args.baseline} was measured on another machine or setup", file=sys.stderr)
+        regressions = compare(report, baseline, args.tolerance, args.memory_tolerance, args.min_seconds)
+        report["baseline"] = {"path": args.baseline, "created": baseline.get("created"), "regressions": regressions}
+
+    _print_report(report)
+    if args.report:
+        _save_json(report, args.report)
+    if args.save_baseline:
+        _save_json(report, args.baseline)
+        print(f"Saved the baseline to {args.baseline}")
+    if regressions:
+        print(f"{len(regressions)} regressions: {', '.join(regressions)}", file=sys.stderr)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", help="directory of recorded pages (see pyAFL.testing.fixtures)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed runs of each operation")
+    parser.add_argument("--only", nargs="*", choices=list(OPERATIONS) + ["post_process"], help="operations to run")
+    parser.add_argument("--report", help="json file to save the report to")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="json baseline to compare with (or to save)")
+    parser.add_argument("--save-baseline", action="store_true", help="save the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="slowdown flagged as a regression (0.25: 25%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10, help="memory growth flagged as a regression")
+    parser.add_argument("--min-seconds", type=float, default=0.001, help="smallest slowdown flagged as a regression")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,89 @@
+"""
+Benchmarks the cold start of pyAFL: the time taken to import its modules in a fresh interpreter, and which
+heavy dependencies each import loads.
+
+Importing pyAFL should not import pandas, numpy, BeautifulSoup, lxml, requests or requests_cache, nor
+create the shared session (which opens the request cache): they are loaded when first used. Importing the
+package itself (eg for `pyAFL.config`) should not import the datasets, metrics, executor, parse cache or
+store modules either. Each statement below is run `--repeat` times, each time in a new interpreter, and
+timed from inside it. The benchmark exits with status 1 if a statement which should be light takes more
+than `--max-ms` milliseconds, or loads a module it must not load.
+
+Usage:
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --repeat 10 --max-ms 80
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules which importing pyAFL must not load
+HEAVY_MODULES = ("pandas", "numpy", "bs4", "lxml.etree", "requests", "requests_cache", "aiohttp", "fuzzywuzzy")
+
+# Modules of pyAFL which importing the package itself must not load
+PACKAGE_MODULES = (
+    "pyAFL.base.datasets", "pyAFL.base.metrics", "pyAFL.base.executor", "pyAFL.base.memo", "pyAFL.base.store",
+)
+
+# name -> (statement, modules it must not load; a statement with none has no time budget either)
+STATEMENTS = {
+    "import pyAFL": ("import pyAFL", HEAVY_MODULES + PACKAGE_MODULES),
+    "import config": ("import pyAFL.config", HEAVY_MODULES + PACKAGE_MODULES),
+    "import pyAFL.teams": ("import pyAFL.teams", HEAVY_MODULES),
+    "team url": ("from pyAFL.teams import RIC; RIC.all_time_games_url", HEAVY_MODULES),
+    "import models": ("import pyAFL.players.models, pyAFL.seasons.models, pyAFL.teams.models", HEAVY_MODULES),
+    "create session": ("from pyAFL.session import session; session.cache", ()),
+}
+
+_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+exec({statement!r})
+seconds = time.perf_counter() - start
+from pyAFL.session import session
+print(json.dumps({{
+    "seconds": seconds,
+    "loaded": [name for name in {modules!r} if name in sys.modules],
+    "session": session.created,
+}}))
+"""
+
+
+def _measure(statement: str) -> dict:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    script = _SCRIPT.format(statement=statement, modules=HEAVY_MODULES + PACKAGE_MODULES)
+    output = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, check=True, text=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main(repeat: int = 5, max_ms: float = 100) -> int:
+    failures = []
+    print(f"{'statement':<16}{'best ms':>10}{'median ms':>11}  loads")
+    for name, (statement, forbidden) in STATEMENTS.items():
+        runs = [_measure(statement) for _ in range(repeat)]
+        times = [run["seconds"] * 1000 for run in runs]
+        if forbidden:
+            loads = [module for module in runs[0]["loaded"] if module in forbidden]
+        else:
+            loads = [module for module in runs[0]["loaded"] if module in HEAVY_MODULES]
+        loads += ["session"] if runs[0]["session"] else []
+        flag = ""
+        if forbidden and (min(times) > max_ms or loads):
+            failures.append(name)
+            flag = "  TOO SLOW" if min(times) > max_ms else "  TOO HEAVY"
+        print(f"{name:<16}{min(times):>10.1f}{statistics.median(times):>11.1f}  {', '.join(loads) or '-'}{flag}")
+
+    if failures:
+        print(f"{len(failures)} statements over budget: {', '.join(failures)}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="number of fresh interpreters per statement")
+    parser.add_argument("--max-ms", type=float, default=100, help="budget of each light statement, in milliseconds")
+    args = parser.parse_args()
+    sys.exit(main(args.repeat, args.max_ms))
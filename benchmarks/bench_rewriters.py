@@ -0,0 +1,62 @@
+"""
+Benchmarks the "soup" and "fast" link rewriters (see `pyAFL.session.rewriters`) on the large afltables pages.
+
+For each page this reports the time taken by each rewriter, the size of the rewritten page, and the time
+`pd.read_html` then takes to read the rewritten page.
+
+Usage:
+    python -m benchmarks.bench_rewriters                 # download the raw pages from afltables.com
+    python -m benchmarks.bench_rewriters --html-dir DIR  # use raw pages saved in DIR (eg stats_2019.html)
+"""
+import argparse
+import os
+import timeit
+from io import StringIO
+
+import pandas as pd
+import requests
+
+from pyAFL import config
+from pyAFL.session.rewriters import LINK_REWRITERS
+
+PAGES = [
+    "teams/adelaide/allgames.html",
+    "teams/carlton/allgames.html",
+    "stats/2019.html",
+    "stats/1990.html",
+    "stats/playersB_idx.html",
+    "stats/playersM_idx.html",
+]
+
+
+def _raw_page(page: str, html_dir: str = None) -> bytes:
+    if html_dir:
+        with open(os.path.join(html_dir, page.replace("/", "_")), "rb") as f:
+            return f.read()
+    # Use plain requests: the pyAFL session would return an already rewritten page
+    return requests.get(config.AFLTABLES_STATS_BASE_URL + page).content
+
+
+def main(html_dir: str = None, repeat: int = 5):
+    print(f"{'page':<32}{'rewriter':<10}{'rewrite ms':>12}{'size KiB':>10}{'read_html ms':>14}")
+    for page in PAGES:
+        url = config.AFLTABLES_STATS_BASE_URL + page
+        raw = _raw_page(page, html_dir)
+        print(f"{page:<32}{'raw':<10}{'':>12}{len(raw) / 1024:>10.0f}")
+
+        for name, (rewriter, _) in LINK_REWRITERS.items():
+            rewrite_time = min(timeit.repeat(lambda: rewriter(url, raw), number=1, repeat=repeat))
+            html = rewriter(url, raw).decode("utf-8", errors="replace")
+            read_time = min(timeit.repeat(lambda: pd.read_html(StringIO(html)), number=1, repeat=repeat))
+            print(
+                f"{'':<32}{name:<10}{rewrite_time * 1000:>12.1f}{len(html.encode()) / 1024:>10.0f}"
+                f"{read_time * 1000:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--html-dir", help="directory of raw pages, instead of downloading them")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timing repeats (the best is reported)")
+    args = parser.parse_args()
+    main(args.html_dir, args.repeat)
@@ -0,0 +1,61 @@
+"""
+Benchmarks the concurrent fetching of the session (`session.get_many`) under simulated load: a local
+stand-in server (see `pyAFL.testing.server`) replays pages with the given latency, bandwidth and error
+rate, and the session fetches them through `session.use_base_url`, with an empty request cache.
+
+For each number of workers this reports the time taken to fetch every page, the throughput, and the
+number of failed requests.
+
+Usage:
+    python -m benchmarks.bench_session_load --pages 64 --latency 0.1
+    python -m benchmarks.bench_session_load --latency 0.05 --bandwidth 500000 --error-rate 0.05
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from pyAFL import config
+from pyAFL.session import session
+from pyAFL.session.backends import CompressedSQLiteCache
+from pyAFL.testing.fixtures import season_page
+from pyAFL.testing.server import StandInServer
+
+
+def main(pages: int = 64, workers=(1, 4, 8, 16), latency: float = 0.1, bandwidth: float = None, error_rate: float = 0):
+    # Many small season pages, as when loading the stats of every player of a team
+    page = season_page(rounds=2, finals=False)
+    paths = [f"seas/{1900 + i}.html" for i in range(pages)]
+    urls = [config.AFLTABLES_STATS_BASE_URL + path for path in paths]
+
+    root = tempfile.mkdtemp(prefix="pyafl-bench-")
+    server = StandInServer(
+        {path: page for path in paths}, latency=latency, bandwidth=bandwidth, error_rate=error_rate, seed=0
+    )
+    cache = session.cache
+    print(f"{'workers':>8}{'seconds':>10}{'pages/s':>10}{'failed':>8}")
+    with server:
+        session.use_base_url(server.base_url)
+        try:
+            for max_workers in workers:
+                session.cache = CompressedSQLiteCache(os.path.join(root, f"cache{max_workers}.sqlite"))
+                start = time.perf_counter()
+                failed = sum(resp.status_code != 200 for resp in session.get_many(urls, max_workers=max_workers))
+                seconds = time.perf_counter() - start
+                print(f"{max_workers:>8}{seconds:>10.2f}{pages / seconds:>10.1f}{failed:>8}")
+        finally:
+            session.use_base_url(None)
+            session.cache = cache
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=64, help="number of pages to fetch")
+    parser.add_argument("--workers", type=int, nargs="*", default=[1, 4, 8, 16], help="numbers of workers to compare")
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds before each response")
+    parser.add_argument("--bandwidth", type=float, help="bytes per second of each response")
+    parser.add_argument("--error-rate", type=float, default=0, help="proportion of requests which fail")
+    args = parser.parse_args()
+    main(args.pages, args.workers, args.latency, args.bandwidth, args.error_rate)
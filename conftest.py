@@ -0,0 +1,87 @@
+import tempfile
+import threading
+
+import pytest
+
+from pyAFL.testing.fixtures import PLAYER_PAGE, index_page, synthetic_pages
+from pyAFL.testing.server import StandInServer
+
+_cache_dir = tempfile.TemporaryDirectory(prefix="pyAFL-tests-")
+
+
+def pytest_addoption(parser):
+    parser.addoption("--network", action="store_true", help="also run the tests which fetch afltables.com")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "network: fetches pages from afltables.com (skipped without --network)")
+    # The request cache, local store, player index and datasets of the tests are kept in a temporary
+    # directory, rather than with the user's caches
+    from pyAFL import config as pyafl_config
+
+    pyafl_config.CACHE_DIR = _cache_dir.name
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--network"):
+        return
+    skip = pytest.mark.skip(reason="fetches pages from afltables.com (run with --network)")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_unconfigure(config):
+    _cache_dir.cleanup()
+
+
+@pytest.fixture
+def stand_in():
+    """Yields the url of a local stand-in server (see `pyAFL.testing.server`) and the server."""
+    server = StandInServer(
+        {
+            "stats/playersA_idx.html": (
+                b'<html><body><a href="players/A/Aaron_Black.html">Black, Aaron</a></body></html>'
+            ),
+            "stats/players/S/Stuart_Magee.html": PLAYER_PAGE,
+        }
+    )
+    server.add_pages(
+        {f"seas/{year}.html": f"<html><body>Season {year}</body></html>".encode() for year in range(2010, 2020)}
+    )
+    with server:
+        yield server.url, server
+
+
+@pytest.fixture
+def afltables(tmp_path, monkeypatch):
+    """
+    Serves synthetic afltables pages (see `pyAFL.testing.fixtures.synthetic_pages`) from a local stand-in
+    server, which the session fetches every afltables url from. Yields the server.
+    """
+    from pyAFL.players.index import PlayerIndex
+    from pyAFL.session import session
+
+    pages = synthetic_pages(team="adelaide")
+    pages.update({f"stats/players{letter}_idx.html": index_page(f"Aaron {letter}ardy") for letter in "AB"})
+    # The lookups must not leave synthetic pages or players in the caches the other tests share
+    monkeypatch.setattr("pyAFL.players.models.player_index", PlayerIndex(str(tmp_path / "player_index.json")))
+    session.cache.clear()
+    with StandInServer(pages) as server:
+        session.use_base_url(server.base_url)
+        yield server
+        session.use_base_url(None)
+    session.cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def entity_store(tmp_path, monkeypatch):
+    """Points the local entity store at an empty sqlite file, and empties the parse cache, for each test."""
+    from pyAFL.base.memo import parse_cache
+    from pyAFL.base.store import store
+
+    monkeypatch.setattr(store, "path", str(tmp_path / "store.sqlite"))
+    monkeypatch.setattr(store, "_local", threading.local())
+    parse_cache.clear()
+    yield store
+    parse_cache.clear()
@@ -0,0 +1,11 @@
+__all__ = ["export_history", "load_games", "load_matches", "load_season_stats"]
+
+
+def __getattr__(name):
+    # The dataset functions are imported from `pyAFL.base.datasets` when first used, so that importing a
+    # pyAFL module (eg `pyAFL.config`) does not import the datasets and the modules they use
+    if name in __all__:
+        from pyAFL.base import datasets
+
+        return getattr(datasets, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,402 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import warnings
+from datetime import datetime
+
+from pyAFL import config
+from pyAFL.base.exceptions import LookupError, SnapshotMissError
+from pyAFL.base.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Bump whenever a schema below changes, so that files exported by older versions are not loaded
+DATASETS_VERSION = 1
+
+# Default directory of the datasets, in the cache dir (see `pyAFL.config.cache_path`)
+DATASETS_DIR = "pyAFL_datasets"
+
+FIRST_SEASON = 1897
+
+# Stats columns of the yearly stats pages (https://afltables.com/afl/stats/{year}.html). Older seasons have
+# fewer columns; stats missing from a season are null.
+SEASON_STATS_COLUMNS = (
+    "KI", "MK", "HB", "DI", "GL", "BH", "HO", "TK", "RB", "IF", "CL", "CG", "FF", "FA", "BR", "CP", "UP", "CM",
+    "MI", "1%", "BO", "GA", "%P",
+)
+
+
+def _schemas() -> dict:
+    # pyarrow is imported here so that it is only loaded when the datasets are used
+    import pyarrow as pa
+
+    team = pa.dictionary(pa.int32(), pa.string())
+    return {
+        "matches": pa.schema([
+            ("year", pa.int16()),
+            ("date", pa.timestamp("s")),
+            ("round", pa.int16()),
+            ("game_number", pa.int16()),
+            ("finals_stage", team),
+            ("venue", team),
+            ("home_team", team),
+            ("away_team", team),
+            ("home_team_score", pa.int16()),
+            ("away_team_score", pa.int16()),
+            ("home_team_score_detail", pa.list_(pa.int16())),
+            ("away_team_score_detail", pa.list_(pa.int16())),
+            ("winning_team", team),
+            ("margin", pa.int16()),
+            ("result", pa.string()),
+        ]),
+        "games": pa.schema([
+            ("team", team),
+            ("date", pa.timestamp("s")),
+            ("round", team),
+            ("home_away", team),
+            ("opponent", team),
+            ("score_for", pa.int16()),
+            ("score_against", pa.int16()),
+            ("result", team),
+            ("margin", pa.int16()),
+            ("venue", team),
+            ("crowd", pa.int32()),
+        ]),
+        "season_stats": pa.schema(
+            [("year", pa.int16()), ("team", team), ("number", pa.int16()), ("player", pa.string())] +
+            [(column, pa.float32() if column == "%P" else pa.int32()) for column in SEASON_STATS_COLUMNS]
+        ),
+    }
+
+
+def _score_detail_array(details: np.ndarray):
+    # Fixed-width quarter scores padded with -1 (see `pyAFL.seasons.models.MatchTable`) to a list array
+    import pyarrow as pa
+
+    valid = details >= 0
+    offsets = np.concatenate([[0], np.cumsum(valid.sum(axis=1))]).astype(np.int32)
+
+    return pa.ListArray.from_arrays(pa.array(offsets), pa.array(details[valid], type=pa.int16()))
+
+
+def _int_array(values, type):
+    import pyarrow as pa
+
+    values = pd.to_numeric(pd.Series(values), errors="coerce").astype("float64")
+    return pa.array(values.to_numpy(), type=pa.float64(), from_pandas=True).cast(type, safe=False)
+
+
+def _strings(values, type):
+    import pyarrow as pa
+
+    values = pd.Series(values, dtype=object)
+    return pa.array(values.where(values.notna(), None).astype(object), type=pa.string()).cast(type)
+
+
+def matches_table(year: int, matches):
+    """
+    Converts a season's `MatchTable` to a pyarrow Table with the "matches" schema.
+    """
+    import pyarrow as pa
+
+    schema = _schemas()["matches"]
+    columns = {
+        "year": pa.array(np.full(len(matches), year, dtype=np.int16)),
+        "date": pa.array(np.asarray(matches.date).astype("datetime64[s]")),
+        "round": pa.array(np.asarray(matches.round, dtype=np.int16)),
+        "game_number": pa.array(np.asarray(matches.game_number, dtype=np.int16)),
+        "home_team_score": pa.array(np.asarray(matches.home_team_score, dtype=np.int16)),
+        "away_team_score": pa.array(np.asarray(matches.away_team_score, dtype=np.int16)),
+        "home_team_score_detail": _score_detail_array(np.asarray(matches.home_team_score_detail)),
+        "away_team_score_detail": _score_detail_array(np.asarray(matches.away_team_score_detail)),
+        "margin": pa.array(np.asarray(matches.margin, dtype=np.int16)),
+        "result": _strings(matches.result, pa.string()),
+    }
+    for field in ("finals_stage", "venue", "home_team", "away_team", "winning_team"):
+        columns[field] = _strings(np.asarray(getattr(matches, field), dtype=object), schema.field(field).type)
+
+    return pa.table([columns[field.name] for field in schema], schema=schema)
+
+
+def games_table(team: str, games: pd.DataFrame):
+    """
+    Converts a team's game log (`Team.games`) to a pyarrow Table with the "games" schema.
+    """
+    import pyarrow as pa
+
+    schema = _schemas()["games"]
+    games = games.reset_index(drop=True)
+
+    def column(name):
+        return games[name] if name in games else pd.Series([None] * len(games), dtype=object)
+
+    columns = {
+        "team": _strings([team] * len(games), schema.field("team").type),
+        "date": pa.array(pd.to_datetime(games["Date"]).to_numpy().astype("datetime64[s]")),
+        "round": _strings(column("Rnd").astype(object), schema.field("round").type),
+        "home_away": _strings(column("T").astype(object), schema.field("home_away").type),
+        "opponent": _strings(column("Opponent").astype(object), schema.field("opponent").type),
+        "score_for": _int_array(column("For"), pa.int16()),
+        "score_against": _int_array(column("Against"), pa.int16()),
+        "result": _strings(column("Result").astype(object), schema.field("result").type),
+        "margin": _int_array(column("Margin"), pa.int16()),
+        "venue": _strings(column("Venue").astype(object), schema.field("venue").type),
+        "crowd": _int_array(column("Crowd"), pa.int32()),
+    }
+
+    return pa.table([columns[field.name] for field in schema], schema=schema)
+
+
+def season_stats_table(year: int, season_stats: pd.DataFrame):
+    """
+    Converts the stats of every team for a year (`pyAFL.teams.season_stats_all_teams`) to a pyarrow Table
+    with the "season_stats" schema. Stats which are not in `SEASON_STATS_COLUMNS` are dropped.
+    """
+    import pyarrow as pa
+
+    schema = _schemas()["season_stats"]
+    season_stats = season_stats.reset_index(drop=True)
+    columns = {
+        "year": pa.array(np.full(len(season_stats), year, dtype=np.int16)),
+        "team": _strings(season_stats["Team"], schema.field("team").type),
+        "number": _int_array(season_stats["#"] if "#" in season_stats else [None] * len(season_stats), pa.int16()),
+        "player": _strings(season_stats["Player"], pa.string()),
+    }
+    for column in SEASON_STATS_COLUMNS:
+        values = season_stats[column] if column in season_stats else [None] * len(season_stats)
+        columns[column] = _int_array(values, schema.field(column).type)
+
+    return pa.table([columns[field.name] for field in schema], schema=schema)
+
+
+def _partition_file(name: str, key, format: str) -> str:
+    extension = ".arrow" if format == "arrow" else ".parquet"
+    return os.path.join(name, re.sub(r"[^A-Za-z0-9]+", "_", str(key)) + extension)
+
+
+class DatasetWriter(object):
+    """
+    Writes the "matches", "games" and "season_stats" datasets to `path`, one file per partition (a year or
+    a team), plus a `manifest.json` listing the partitions.
+     - "arrow" files are uncompressed Arrow IPC files, which the loaders memory-map without decoding.
+     - "parquet" files are compressed, for use with other tools.
+     - Each file is written to a temporary file and renamed, so that readers never see a partial file.
+    """
+
+    def __init__(self, path: str = None, format: str = "arrow"):
+        if format not in ("arrow", "parquet"):
+            raise ValueError(f"Unknown dataset format: {format}. Use 'arrow' or 'parquet'.")
+        self.path = path or config.cache_path(DATASETS_DIR)
+        self.format = format
+        self.manifest = _read_manifest(self.path) or {}
+        if self.manifest.get("version") != DATASETS_VERSION or self.manifest.get("format") != format:
+            self.manifest = {"version": DATASETS_VERSION, "format": format, "datasets": {}}
+
+    def write(self, name: str, key, table):
+        """Writes the pyarrow `table` as partition `key` (eg a year) of dataset `name`."""
+        import pyarrow as pa
+
+        filename = _partition_file(name, key, self.format)
+        path = os.path.join(self.path, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        if self.format == "arrow":
+            with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        else:
+            import pyarrow.parquet as pq
+
+            pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+
+        self.manifest["datasets"].setdefault(name, {})[str(key)] = {"file": filename, "rows": table.num_rows}
+
+    def save_manifest(self):
+        self.manifest["exported"] = datetime.now().isoformat(timespec="seconds")
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = os.path.join(self.path, f"manifest.json.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp_path, os.path.join(self.path, "manifest.json"))
+
+
+def export_history(path: str = None, years=None, teams=None, format: str = "arrow") -> str:
+    """
+    Exports the full AFL history to columnar files which `load_matches`, `load_games` and
+    `load_season_stats` can memory-map, so that worker processes do not fetch or parse any html.
+     - Season matches and yearly player stats are partitioned by year; team games by team.
+     - Pages come from the request cache and parsed objects from the local store, where possible.
+     - Seasons with no page or no completed match (eg this year's, before it starts) are skipped. The skipped
+     years are listed in a warning, and under "skipped" in the manifest.
+
+    Parameters
+    ----------
+        path : str
+            directory to export to (default: "pyAFL_datasets" in the cache directory)
+        years : iterable of int (optional)
+            seasons to export (default: every season from 1897 to this year)
+        teams : list of pyAFL.teams.models.Team (optional)
+            teams whose games to export (default: `pyAFL.teams.ALL_TEAMS`)
+        format : str
+            "arrow" (default, memory-mappable) or "parquet" (compressed)
+
+    Returns
+    ----------
+        path : str
+            the directory the datasets were written to
+    """
+    from pyAFL.seasons.models import Season
+    from pyAFL.teams import ALL_TEAMS
+    from pyAFL.teams.models import season_stats_all_teams
+
+    years = range(FIRST_SEASON, datetime.now().year + 1) if years is None else years
+    teams = ALL_TEAMS if teams is None else teams
+    writer = DatasetWriter(path, format)
+
+    skipped = []
+    for year in years:
+        try:
+            matches = Season(year).get_season_stats().season_matches
+        except SnapshotMissError:
+            raise  # Missing from an offline snapshot, rather than from afltables
+        except LookupError:
+            matches = []
+        if not len(matches):
+            skipped.append(year)
+            continue
+        writer.write("matches", year, matches_table(year, matches))
+        writer.write("season_stats", year, season_stats_table(year, season_stats_all_teams(year)))
+    for team in teams:
+        writer.write("games", team.name, games_table(team.name, team.games))
+    writer.manifest["skipped"] = skipped
+    writer.save_manifest()
+
+    if skipped:
+        warnings.warn(f"Skipped seasons with no completed match: {', '.join(str(year) for year in skipped)}")
+
+    return writer.path
+
+
+def _read_manifest(path: str):
+    try:
+        with open(os.path.join(path, "manifest.json")) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _load(name: str, keys, path: str, filters: dict, as_arrow: bool):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    path = path or config.cache_path(DATASETS_DIR)
+    manifest = _read_manifest(path)
+    if manifest is None or manifest.get("version") != DATASETS_VERSION:
+        raise FileNotFoundError(f"No pyAFL datasets found at {path}. Run `pyAFL.export_history()` first.")
+
+    partitions = manifest["datasets"].get(name, {})
+    keys = list(partitions) if keys is None else [str(key) for key in keys]
+    tables = []
+    for key in keys:
+        if key not in partitions:
+            continue
+        file_path = os.path.join(path, partitions[key]["file"])
+        if manifest["format"] == "arrow":
+            # Buffers of the table point into the memory map, so processes loading the same file share the page cache
+            tables.append(pa.ipc.open_file(pa.memory_map(file_path, "r")).read_all())
+        else:
+            import pyarrow.parquet as pq
+
+            tables.append(pq.read_table(file_path, memory_map=True))
+
+    table = pa.concat_tables(tables) if tables else _schemas()[name].empty_table()
+    for column, values in filters.items():
+        if values is not None:
+            values = [values] if isinstance(values, str) else list(values)
+            table = table.filter(pc.is_in(table[column].cast(pa.string()), value_set=pa.array(values, pa.string())))
+
+    return table if as_arrow else table.to_pandas()
+
+
+def load_matches(years=None, teams=None, path: str = None, as_arrow: bool = False):
+    """
+    Loads exported season matches (see `export_history`), memory-mapping one file per season.
+
+    Parameters
+    ----------
+        years : iterable of int (optional)
+            seasons to load (default: every exported season)
+        teams : str or list of str (optional)
+            only load matches played by these teams (home or away)
+        path : str
+            directory the datasets were exported to
+        as_arrow : bool
+            If True, returns the pyarrow Table, whose buffers are not copied out of the memory map
+
+    Returns
+    ----------
+        matches : Pandas dataframe (or pyarrow Table)
+            one row per match, with the columns of the "matches" schema
+    """
+    table = _load("matches", years, path, {}, as_arrow=True)
+    if teams is not None:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        teams = pa.array([teams] if isinstance(teams, str) else list(teams), pa.string())
+        table = table.filter(
+            pc.or_(
+                pc.is_in(table["home_team"].cast(pa.string()), value_set=teams),
+                pc.is_in(table["away_team"].cast(pa.string()), value_set=teams),
+            )
+        )
+
+    return table if as_arrow else table.to_pandas()
+
+
+def load_games(teams=None, path: str = None, as_arrow: bool = False):
+    """
+    Loads exported team games (see `export_history`), memory-mapping one file per team.
+
+    Parameters
+    ----------
+        teams : str or list of str (optional)
+            team names, eg "Richmond" (default: every exported team)
+        path : str
+            directory the datasets were exported to
+        as_arrow : bool
+            If True, returns the pyarrow Table
+
+    Returns
+    ----------
+        games : Pandas dataframe (or pyarrow Table)
+            one row per game, with the columns of the "games" schema
+    """
+    teams = [teams] if isinstance(teams, str) else teams
+    return _load("games", teams, path, {}, as_arrow)
+
+
+def load_season_stats(years=None, teams=None, path: str = None, as_arrow: bool = False):
+    """
+    Loads exported yearly player stats (see `export_history`), memory-mapping one file per season.
+
+    Parameters
+    ----------
+        years : iterable of int (optional)
+            seasons to load (default: every exported season)
+        teams : str or list of str (optional)
+            only load the stats of these teams
+        path : str
+            directory the datasets were exported to
+        as_arrow : bool
+            If True, returns the pyarrow Table
+
+    Returns
+    ----------
+        season_stats : Pandas dataframe (or pyarrow Table)
+            one row per player (and team total) per season, with the columns of the "season_stats" schema
+    """
+    return _load("season_stats", years, path, {"team": teams}, as_arrow)
@@ -4,3 +4,11 @@ class LookupError(Exception):
     """
 
     pass
+
+
+class SnapshotMissError(LookupError):
+    """
+    Exception thrown when an offline session is asked for a page which is not in its snapshot bundle
+    """
+
+    pass
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import os
+import threading
+import typing
+
+from pyAFL.base.metrics import metrics, recorded_call
+
+if typing.TYPE_CHECKING:
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+
+def _mp_context():
+    # Worker processes are forked from a clean server process where possible, rather than from this
+    # process, whose fetching threads may hold locks
+    import multiprocessing
+
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class ParseExecutor(object):
+    """
+    Runs page parsers (eg `pyAFL.players.models.parse_player_page`), either inline or in a pool of
+    worker processes, so that parsing many pages is not serialised by the GIL.
+     - With `workers` <= 1, parsers run inline in the calling thread.
+     - Otherwise they run in a pool of `workers` processes, started when first needed. Parsers and their
+     arguments must be picklable (module-level functions), and return compact, picklable results
+     (DataFrames and numpy arrays rather than parse trees).
+
+    Attributes
+    ----------
+    workers : int
+        number of worker processes (0 or 1 to parse inline). Changing it shuts down the current pool.
+
+    Methods
+    -------
+    submit(fn, *args, **kwargs)
+        schedules `fn(*args, **kwargs)` and returns a `concurrent.futures.Future`
+    map(fn, *iterables)
+        returns the results of `fn` applied to every item, in order
+    shutdown(wait=True)
+        stops the worker processes
+    """
+
+    def __init__(self, workers: int = 0, mp_context=None):
+        self._workers = workers
+        self._mp_context = mp_context
+        self._pool = None
+        self._pending = set()  # futures of the pool not done yet
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<ParseExecutor: {self.workers or 'no'} worker processes>"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @workers.setter
+    def workers(self, workers: int):
+        self.shutdown()
+        self._workers = workers
+
+    @property
+    def parallel(self) -> bool:
+        return bool(self._workers) and self._workers > 1
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self._workers, mp_context=self._mp_context or _mp_context())
+            return self._pool
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Schedules `fn(*args, **kwargs)`. Returns a `Future`, which is already done if parsing inline."""
+        from concurrent.futures import Future
+
+        if self.parallel:
+            # The events recorded by the worker (eg parse times) are recorded again in this process
+            inner = self._get_pool().submit(recorded_call, fn, args, kwargs)
+            self._pending.add(inner)
+            future = Future()
+            future.set_running_or_notify_cancel()
+            inner.add_done_callback(self._pending.discard)
+            inner.add_done_callback(lambda inner: _resolve(future, inner))
+            return future
+
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def map(self, fn, *iterables) -> list:
+        """Returns `[fn(*items) for items in zip(*iterables)]`, computed by the executor."""
+        futures = [self.submit(fn, *items) for items in zip(*iterables)]
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._pool is not None:
+                # Work not started yet is cancelled first (`cancel_futures` needs Python 3.9)
+                for inner in list(self._pending):
+                    inner.cancel()
+                self._pool.shutdown(wait=wait)
+            self._pool = None
+
+
+def _resolve(future: Future, inner: Future):
+    # Resolves `future` with the result of `recorded_call` in a worker process
+    from concurrent.futures import CancelledError
+
+    if inner.cancelled():
+        future.set_exception(CancelledError())
+    elif inner.exception() is not None:
+        future.set_exception(inner.exception())
+    else:
+        result, events = inner.result()
+        metrics.replay(events)
+        future.set_result(result)
+
+
+def fetch_and_parse(objects, max_workers: int = 8, parse_workers: int = None, force_live: bool = False) -> list:
+    """
+    Fetches and parses the page of many models at once, eg the stats of every player of a team.
+     - Objects saved in the local store (or the parse cache) are returned without fetching their page.
+     - Pages are fetched concurrently on I/O threads (`session.get_many`). Each page is handed to the
+     parse executor as soon as it arrives, so pages are parsed in worker processes while others are still
+     being fetched.
+     - The parsed results are saved to the store, as when each object is loaded on its own.
+
+    Objects implement the bulk loading protocol of `pyAFL.base.models.AFLObject`: `_page_url()`,
+    `_page_parser()`, `_get_stored_result(resp=None)` and `_result_from_parsed(resp, parsed)`.
+
+    Parameters
+    ----------
+        objects : iterable of AFLObject (required)
+            eg a list of pyAFL.players.models.Player
+        max_workers : int
+            maximum number of requests in flight at once
+        parse_workers : int
+            number of worker processes parsing pages (default: the shared `parse_executor`)
+        force_live : bool
+            If True, does not use the local store or the cached requests
+
+    Returns
+    ----------
+        results : list
+            result for each object (eg PlayerStats), in the order of `objects`
+    """
+    from concurrent.futures import as_completed
+
+    from pyAFL.session import session
+
+    objects = list(objects)
+    results = [None] * len(objects)
+    pending = {}  # page url -> indexes of the objects loaded from it
+    for i, obj in enumerate(objects):
+        result = None if force_live else obj._get_stored_result()
+        if result is not None:
+            results[i] = result
+        else:
+            pending.setdefault(obj._page_url(), []).append(i)
+
+    if not pending:
+        return results
+
+    executor = parse_executor if parse_workers is None else ParseExecutor(parse_workers)
+    try:
+        futures = {}
+        for resp in session.get_many(pending, max_workers=max_workers, force_live=force_live):
+            indexes = pending.get(resp.url) or pending[resp.history[0].url]
+            obj = objects[indexes[0]]
+            # A page which has not changed since it was parsed (eg after a 304) is not parsed again
+            result = None if force_live else obj._get_stored_result(resp)
+            if result is not None:
+                for i in indexes:
+                    results[i] = result if i == indexes[0] else objects[i]._get_stored_result(resp)
+                continue
+            futures[executor.submit(obj._page_parser(), resp.text)] = (resp, indexes)
+
+        for future in as_completed(futures):
+            resp, indexes = futures[future]
+            parsed = future.result()
+            for i in indexes:
+                results[i] = objects[i]._result_from_parsed(resp, parsed)
+    finally:
+        if executor is not parse_executor:
+            executor.shutdown()
+
+    return results
+
+
+# Shared executor of the bulk loaders. Set `parse_executor.workers` (or PYAFL_PARSE_WORKERS) to parse in
+# worker processes, eg to the number of cores.
+parse_executor = ParseExecutor(int(os.environ.get("PYAFL_PARSE_WORKERS", "0")))
@@ -0,0 +1,108 @@
+import importlib
+import threading
+
+_modules = {}
+_modules_lock = threading.Lock()
+
+
+class LazyModule(object):
+    """
+    Stands in for a module which is only imported when one of its attributes is first used, so that
+    importing pyAFL (eg for `pyAFL.teams.RIC.name`) does not pay for importing pandas, BeautifulSoup or
+    requests_cache. Safe to use from several threads: the module is imported once, under a lock.
+
+    Attributes
+    ----------
+    __name__ : str
+        name of the module, eg "pandas"
+    """
+
+    def __init__(self, name: str):
+        self.__name__ = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<LazyModule: {self.__name__}{'' if self._module is None else ' (imported)'}>"
+
+    def __getattr__(self, attr):
+        # Only called for attributes which are not set on the proxy itself, ie the attributes of the module
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    module = importlib.import_module(self.__name__)
+                    # The attributes of the module are copied onto the proxy, so that later lookups (eg
+                    # `pd.DataFrame` in a loop) cost no more than on the module itself. Attributes the module
+                    # gains later (eg submodules imported later) are still found through `__getattr__`.
+                    for attr, value in vars(module).items():
+                        self.__dict__.setdefault(attr, value)
+                    self._module = module
+        return self._module
+
+
+class LazyObject(object):
+    """
+    Stands in for a shared object (eg the local store `pyAFL.base.store.store`) which is only created when
+    it is first used, so that importing pyAFL does not create the user cache directory or read any file.
+    As for `pyAFL.session.session`, every attribute is read from (and set on) the object itself.
+
+    Attributes
+    ----------
+    created : bool
+        whether the object has been created
+    """
+
+    def __init__(self, factory):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_object", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def __repr__(self):
+        return repr(self._object) if self.created else "<LazyObject: not created yet>"
+
+    def __len__(self):
+        return len(self._get())
+
+    @property
+    def created(self) -> bool:
+        return self._object is not None
+
+    def _get(self):
+        if self._object is None:
+            with self._lock:
+                if self._object is None:
+                    object.__setattr__(self, "_object", self._factory())
+        return self._object
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._get(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._get(), name)
+
+    def __dir__(self):
+        return dir(self._get())
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Returns a `LazyModule` for the module `name`, which imports it when first used, eg
+
+        >>> pd = lazy_import("pandas")
+        >>> pd.DataFrame(...)  # pandas is imported here
+
+    Modules which use lazily imported modules in annotations should `from __future__ import annotations`.
+    """
+    with _modules_lock:
+        if name not in _modules:
+            _modules[name] = LazyModule(name)
+        return _modules[name]
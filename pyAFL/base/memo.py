@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import copy
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from pyAFL.base.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Default memory budget of the parse cache
+DEFAULT_MAX_BYTES = 256 * 1024 ** 2
+
+
+def _copy_on_write() -> bool:
+    # pandas 3 always copies on write; pandas 2 does if the option is set
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    try:
+        return pd.get_option("mode.copy_on_write") is True
+    except KeyError:
+        return False
+
+
+def _freeze_array(array):
+    # Numpy arrays, and the numpy arrays behind pandas' extension arrays (eg the codes of a Categorical, or
+    # the values and mask of an Int32 array)
+    for name in ("_ndarray", "_data", "_mask"):
+        values = getattr(array, name, None)
+        if isinstance(values, np.ndarray):
+            values.flags.writeable = False
+    if isinstance(array, np.ndarray):
+        array.flags.writeable = False
+
+
+def freeze(value):
+    """
+    Makes the numpy arrays in a parsed object read-only, including the arrays behind the columns of its
+    DataFrames, so that they can be shared by every caller. Returns the object.
+    """
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (pd.DataFrame, pd.Series)):
+        for array in value._mgr.arrays:
+            _freeze_array(array)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            freeze(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            freeze(item)
+    return value
+
+
+def thaw(value):
+    """
+    Returns a view of a frozen parsed object which callers cannot use to change the cached object.
+     - DataFrames and Series are shallow copies, which share the frozen arrays of the cached object. Where
+     pandas copies on write, they can be changed like any frame (the arrays changed are copied first).
+     Otherwise changing their values in place raises ValueError: the caller must `copy()` them first.
+     - Categoricals are copied (their codes can be written in place). Frozen numpy arrays are shared.
+     - Containers are rebuilt, and other mutable objects deep-copied.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, pd.Categorical):
+        return value.copy()
+    if isinstance(value, (np.ndarray, str, bytes, int, float, type(None))):
+        return value
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(thaw(item) for item in value)
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    return copy.deepcopy(value)
+
+
+def sizeof(value) -> int:
+    """Estimates the memory used by a parsed object, in bytes."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        size = value.memory_usage(deep=True)
+        return int(size.sum() if isinstance(value, pd.DataFrame) else size)
+    if isinstance(value, pd.Categorical):
+        return int(value.nbytes)
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return int(value.nbytes + sum(sys.getsizeof(item) for item in value.flat))
+        return int(value.nbytes)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sizeof(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(key) + sizeof(item) for key, item in value.items())
+    return sys.getsizeof(value)
+
+
+class ParseCache(object):
+    """
+    An in-memory, least-recently-used cache of parsed objects (eg a team's games), so that repeated
+    accesses in one process do not fetch or parse the page again.
+
+    Objects are cached under their kind and key, with the version of the parser and the digest of the page
+    they were parsed from. An object is returned while its page is fresh (see `pyAFL.session.freshness`),
+    and after that as long as the page has not changed.
+
+    The cache keeps frozen copies of the objects (their numpy arrays, and the arrays of their DataFrames,
+    are read-only) and callers get a `thaw`ed view of them: DataFrames are shallow copies, so repeated
+    accesses do not copy their data, and callers cannot change the cached results.
+
+    Attributes
+    ----------
+    max_bytes : int
+        memory budget. The least recently used objects are evicted when the cache grows past it.
+
+    Methods
+    -------
+    get(kind, key, version, digest=None, expire_after=None)
+        returns a view of the cached object, or None
+    put(kind, key, obj, version, digest=None, expires=None, url=None)
+        caches an object
+    invalidate(url=None, kind=None)
+        drops the objects parsed from a page (or of a kind, or every object)
+    stats()
+        returns the number of objects and their estimated size
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (kind, key) -> _Entry, least recently used first
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return f"<ParseCache: {len(self)} objects, {self._size} bytes>"
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, kind: str, key, version, digest: str = None, expire_after=None):
+        """
+        Returns a view of the object cached under `kind` and `key` by parser `version`, or None.
+         - If `digest` is given, the object is only returned if it was parsed from a page with this digest,
+         even if it has expired (its expiry is then reset to `expire_after`, -1 to never expire).
+         - Otherwise, the object is only returned if it has not expired.
+        """
+        from pyAFL.base.store import expiry_time
+
+        with self._lock:
+            entry = self._entries.get((kind, str(key)))
+            if entry is None or entry.version != version:
+                return None
+            if digest is not None:
+                if digest != entry.digest:
+                    return None
+                if entry.expired:
+                    entry.expires = expiry_time(expire_after)
+            elif entry.expired:
+                return None
+            self._entries.move_to_end((kind, str(key)))
+            value = entry.value
+
+        return thaw(value)
+
+    def put(self, kind: str, key, obj, version, digest: str = None, expires: float = None, url: str = None):
+        """
+        Caches a frozen copy of a parsed object, replacing any cached under `kind` and `key`.
+
+        Parameters
+        ----------
+            kind, key : (required)
+                kind and key of the object, as in `pyAFL.base.store.EntityStore`
+            obj : object (required)
+                parsed object
+            version : (required)
+                version of the parser which produced the object
+            digest : str (optional)
+                `page_digest` of the page the object was parsed from
+            expires : float (optional)
+                epoch time at which the object expires (never if None)
+            url : str (optional)
+                url of the page the object was parsed from (see `invalidate`)
+        """
+        if not self.max_bytes:
+            return
+
+        # The caller keeps the object it passed in, so the cache keeps (and freezes) a copy of it
+        obj = freeze(copy.deepcopy(obj))
+        entry = _Entry(obj, version, digest, expires, url, sizeof(obj))
+        with self._lock:
+            old = self._entries.pop((kind, str(key)), None)
+            if old is not None:
+                self._size -= old.size
+            if entry.size > self.max_bytes:
+                return
+            self._entries[(kind, str(key))] = entry
+            self._size += entry.size
+            self._evict()
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._size -= entry.size
+
+    def invalidate(self, url: str = None, kind: str = None):
+        """
+        Drops the cached objects parsed from the page at `url`, and/or of `kind`. Drops every object if
+        neither is given.
+        """
+        with self._lock:
+            for cache_key, entry in list(self._entries.items()):
+                if (url is None or entry.url == url) and (kind is None or cache_key[0] == kind):
+                    del self._entries[cache_key]
+                    self._size -= entry.size
+
+    def clear(self):
+        """Drops every cached object."""
+        self.invalidate()
+
+    def stats(self) -> dict:
+        """Returns the number of cached objects, their estimated size and the memory budget."""
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size, "max_bytes": self.max_bytes}
+
+
+class _Entry(object):
+    __slots__ = ("value", "version", "digest", "expires", "url", "size")
+
+    def __init__(self, value, version, digest, expires, url, size):
+        self.value = value
+        self.version = version
+        self.digest = digest
+        self.expires = expires
+        self.url = url
+        self.size = size
+
+    @property
+    def expired(self) -> bool:
+        return self.expires is not None and time.time() >= self.expires
+
+
+parse_cache = ParseCache()
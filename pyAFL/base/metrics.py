@@ -0,0 +1,310 @@
+import contextlib
+import contextvars
+import functools
+import threading
+import time
+import warnings
+from collections import defaultdict
+
+# Page type of the parse step running in the current context, given to the frames built during it
+_page = contextvars.ContextVar("pyafl_page", default=None)
+
+# Outcomes of a request
+REQUEST_OUTCOMES = ("hit", "miss", "revalidated", "snapshot", "error")
+
+
+class _Totals(object):
+    __slots__ = ("count", "seconds", "max_seconds", "bytes", "rows")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes = 0
+        self.rows = 0
+
+    def add(self, fields: dict):
+        seconds = fields.get("seconds") or 0.0
+        self.count += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.bytes += fields.get("bytes") or 0
+        self.rows += fields.get("rows") or 0
+
+    def to_dict(self, *names) -> dict:
+        totals = {name: getattr(self, name) for name in ("count", "seconds", "max_seconds") + names}
+        totals["mean_seconds"] = self.seconds / self.count if self.count else None
+        return totals
+
+
+class _Aggregate(object):
+    """Totals of a stream of events, by event and by their outcome (requests) or page type (other events)."""
+
+    def __init__(self):
+        self._totals = defaultdict(_Totals)  # (event, outcome or page) -> _Totals
+
+    def add(self, event: str, fields: dict):
+        self._totals[(event, fields.get("outcome", fields.get("page")))].add(fields)
+
+    def stats(self) -> dict:
+        requests, rewrite = _Totals(), _Totals()
+        outcomes = dict.fromkeys(REQUEST_OUTCOMES, 0)
+        parse, frames = {}, {}
+        for (event, key), totals in self._totals.items():
+            if event == "request":
+                outcomes[key] = outcomes.get(key, 0) + totals.count
+                requests.count += totals.count
+                requests.seconds += totals.seconds
+                requests.max_seconds = max(requests.max_seconds, totals.max_seconds)
+                requests.bytes += totals.bytes
+            elif event == "rewrite":
+                rewrite = totals
+            elif event == "parse":
+                parse[key or "other"] = totals.to_dict("bytes")
+            elif event == "frame":
+                frames[key or "other"] = totals.to_dict("rows")
+
+        return {
+            "requests": dict(requests.to_dict("bytes"), **outcomes),
+            "rewrite": rewrite.to_dict("bytes"),
+            "parse": parse,
+            "frames": frames,
+        }
+
+
+class Profile(object):
+    """
+    The events recorded while a `Metrics.profile()` block ran (in any thread, and in parse worker processes).
+
+    Attributes
+    ----------
+    events : list
+        (event, fields) tuples, in the order they were recorded
+    seconds : float
+        wall time of the block
+
+    Methods
+    -------
+    stats()
+        returns the totals of the events, in the format of `Metrics.stats()`
+    report()
+        returns a summary of the time spent fetching, rewriting, parsing and building DataFrames
+    """
+
+    def __init__(self):
+        self.events = []
+        self.seconds = None
+
+    def __repr__(self):
+        return f"<Profile: {len(self.events)} events in {self.seconds or 0:.3f} s>"
+
+    def _hook(self, event: str, fields: dict):
+        self.events.append((event, fields))
+
+    def stats(self) -> dict:
+        aggregate = _Aggregate()
+        for event, fields in self.events:
+            aggregate.add(event, fields)
+        return aggregate.stats()
+
+    def report(self) -> str:
+        stats = self.stats()
+        requests = stats["requests"]
+        lines = [
+            f"{self.seconds or 0:.3f} s in total",
+            f"requests  {requests['seconds']:8.3f} s  {requests['count']} requests ({requests['hit']} hits, "
+            f"{requests['miss']} misses, {requests['revalidated']} revalidated), {requests['bytes']:,} bytes",
+            f"rewrite   {stats['rewrite']['seconds']:8.3f} s  {stats['rewrite']['count']} pages",
+        ]
+        lines += [
+            f"parse     {totals['seconds']:8.3f} s  {totals['count']} {page} pages, {totals['bytes']:,} bytes"
+            for page, totals in stats["parse"].items()
+        ]
+        lines += [
+            f"frames    {totals['seconds']:8.3f} s  {totals['count']} {page} frames, {totals['rows']:,} rows"
+            for page, totals in stats["frames"].items()
+        ]
+        return "\n".join(lines)
+
+
+class Metrics(object):
+    """
+    Counters and timings of every request and parse step of pyAFL, and the hooks they are reported to.
+
+    Each step is recorded as an event, with its fields:
+     - "request": url, outcome ("hit", "miss", "revalidated" for an expired page which had not changed,
+     "snapshot" or "error"), status, seconds (waited by the caller, including the link rewriting of a new
+     page) and bytes
+     - "rewrite": url, seconds and bytes of the link rewriting of a new page
+     - "parse": page (page type, eg "season"), seconds and bytes of parsing one page. This includes the
+     DataFrames built while parsing.
+     - "frame": page, seconds and rows of building one DataFrame
+
+    Attributes
+    ----------
+    enabled : bool
+        events are only recorded if True (default)
+
+    Methods
+    -------
+    add_hook(callback)
+        calls `callback(event, fields)` for every event recorded, eg to export metrics
+    remove_hook(callback)
+        stops calling `callback`
+    record(event, **fields)
+        records an event
+    timer(event, **fields)
+        context manager which records an event with the seconds its block took
+    timed(event, page)
+        decorator which records an event with the seconds (and the bytes of the html) of each call
+    page(name)
+        context manager giving the DataFrames built in its block the page type `name`
+    stats(reset=False)
+        returns the totals of the events recorded
+    profile()
+        context manager which collects the events of one call
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self._hooks = []
+        self._lock = threading.Lock()
+        self._aggregate = _Aggregate()
+
+    def __repr__(self):
+        return f"<Metrics: {len(self._hooks)} hooks>"
+
+    def add_hook(self, callback):
+        """
+        Calls `callback(event, fields)` for every event recorded, in the thread which records it. Hooks should
+        be fast (eg increment a counter or append to a queue). Exceptions raised by a hook are turned into warnings.
+        Returns `callback`, so that it can be used as a decorator.
+        """
+        with self._lock:
+            self._hooks = self._hooks + [callback]
+        return callback
+
+    def remove_hook(self, callback):
+        with self._lock:
+            self._hooks = [hook for hook in self._hooks if hook is not callback]
+
+    def record(self, event: str, **fields):
+        """Records an event: adds it to the totals and passes it to every hook."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._aggregate.add(event, fields)
+            hooks = self._hooks
+        for hook in hooks:
+            try:
+                hook(event, fields)
+            except Exception as e:
+                warnings.warn(f"Metrics hook {hook!r} failed: {e!r}")
+
+    def replay(self, events: list):
+        """Records `events` ((event, fields) tuples), eg those recorded in a parse worker process."""
+        for event, fields in events:
+            self.record(event, **fields)
+
+    @contextlib.contextmanager
+    def timer(self, event: str, **fields):
+        """
+        Records `event` with the seconds its block took (if it does not raise). The block receives the fields,
+        and can add to them (eg `fields["rows"] = len(df)`). A "page" field also applies to the frames built
+        in the block.
+        """
+        token = _page.set(fields["page"]) if "page" in fields else None
+        start = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            if token is not None:
+                _page.reset(token)
+        fields["seconds"] = time.perf_counter() - start
+        self.record(event, **fields)
+
+    def timed(self, event: str, page: str):
+        """Decorator recording `event` for every call, with the bytes of its html argument (the first string)."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                html = next((arg for arg in args if isinstance(arg, (str, bytes))), None)
+                with self.timer(event, page=page, bytes=len(html) if html is not None else 0):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextlib.contextmanager
+    def page(self, name: str):
+        """Gives the frames built in the block (eg lazily, after the page was parsed) the page type `name`."""
+        token = _page.set(name)
+        try:
+            yield
+        finally:
+            _page.reset(token)
+
+    def current_page(self):
+        """Returns the page type of the parse step running in this context, or None."""
+        return _page.get()
+
+    def stats(self, reset: bool = False) -> dict:
+        """
+        Returns the totals of the events recorded since the process started (or the last reset).
+
+        Parameters
+        ----------
+            reset : bool
+                If True, resets the totals after reporting them
+
+        Returns
+        ----------
+            stats : dict
+                requests : count, seconds, mean_seconds, max_seconds and bytes of every request, and the
+                number of each outcome (hit, miss, revalidated, snapshot, error)
+                rewrite : count, seconds, mean_seconds, max_seconds and bytes of the link rewriting
+                parse : count, seconds, mean_seconds, max_seconds and bytes of the parse steps, by page type
+                frames : count, seconds, mean_seconds, max_seconds and rows of the DataFrames built, by page type
+        """
+        with self._lock:
+            stats = self._aggregate.stats()
+            if reset:
+                self._aggregate = _Aggregate()
+        return stats
+
+    def reset(self):
+        with self._lock:
+            self._aggregate = _Aggregate()
+
+    @contextlib.contextmanager
+    def profile(self):
+        """
+        Collects the events recorded while the block runs, eg:
+
+            >>> with metrics.profile() as profile:
+            ...     Season(2019).get_season_stats()
+            >>> print(profile.report())
+
+        Yields a `Profile`. Events of every thread are collected, so profile one call at a time.
+        """
+        profile = Profile()
+        hook = self.add_hook(profile._hook)  # Bound once: each `profile._hook` is a new bound method
+        start = time.perf_counter()
+        try:
+            yield profile
+        finally:
+            profile.seconds = time.perf_counter() - start
+            self.remove_hook(hook)
+
+
+def recorded_call(fn, args: tuple, kwargs: dict) -> tuple:
+    """Returns `fn(*args, **kwargs)` and the events it recorded, eg to send them back from a worker process."""
+    events = []
+    hook = metrics.add_hook(lambda event, fields: events.append((event, fields)))
+    try:
+        return fn(*args, **kwargs), events
+    finally:
+        metrics.remove_hook(hook)
+
+
+# Shared instrumentation of pyAFL (also reported by `pyAFL.session.session.stats()`)
+metrics = Metrics()
@@ -1,16 +1,109 @@
+from pyAFL.base.memo import parse_cache
+from pyAFL.base.store import expiry_time, page_digest, store
+from pyAFL.session import session
+
+
 class AFLObject(object):
-    def _get_object_from_db(self, **kwargs):
+    # Bump whenever the parsing of a subclass changes, so that objects parsed by the old version are ignored
+    PARSER_VERSION = 1
+
+    def _get_object_from_db(self, response=None, **kwargs):
         """
-        Searches local DB for queried object.
+        Searches the in-memory parse cache, then the local DB, for queried object.
+         - An expired object is only returned if it was parsed from the same page as `response`.
+         - Objects parsed by another `PARSER_VERSION` are ignored.
+         - Objects found in the local DB are added to the parse cache.
 
         Parameters
         ----------
+            response : requests.Response (optional)
+                current response for the page the object is parsed from
             **kwargs : query terms
+                kind : str (required)
+                    kind of object, eg "player"
+                key : str (required)
+                    key of the object, eg the player url
 
         Returns
         -------
             Database object if found;
             else None
         """
+        kind, key = kwargs["kind"], kwargs["key"]
+        if response is None:
+            digest = expire_after = None
+        else:
+            digest, expire_after = page_digest(response.content), self._page_expire_after(response)
+
+        obj = parse_cache.get(kind, key, self.PARSER_VERSION, digest=digest, expire_after=expire_after)
+        if obj is not None:
+            return obj
+
+        entry = store.get_entry(
+            kind, key, digest=digest, expire_after=expire_after, parser_version=self.PARSER_VERSION
+        )
+        if entry is None:
+            return None
+
+        obj, saved_digest, expires = entry
+        parse_cache.put(kind, key, obj, self.PARSER_VERSION, digest=saved_digest, expires=expires)
+        return obj
+
+    def _save_object_to_db(self, obj, response=None, **kwargs):
+        """
+        Saves an object to the local DB and the in-memory parse cache, so that `_get_object_from_db` finds it.
+
+        Parameters
+        ----------
+            obj : object (required)
+                object to save (must be picklable)
+            response : requests.Response (optional)
+                response for the page the object was parsed from. The object expires with the page.
+            **kwargs : attributes of the object
+                kind : str (required)
+                key : str (required)
+                name, team, year, info : (optional) indexed attributes (see `pyAFL.base.store.EntityStore.put`)
+        """
+        if response is not None:
+            kwargs.update(digest=page_digest(response.content), expire_after=self._page_expire_after(response))
+
+        store.put(obj=obj, parser_version=self.PARSER_VERSION, **kwargs)
+
+        expire_after = kwargs.get("expire_after")
+        parse_cache.put(
+            kwargs["kind"],
+            kwargs["key"],
+            obj,
+            self.PARSER_VERSION,
+            digest=kwargs.get("digest"),
+            expires=expiry_time(store.expire_after if expire_after is None else expire_after),
+            url=getattr(response, "url", None),
+        )
+
+    @staticmethod
+    def _caching_enabled() -> bool:
+        # Parsed objects are only worth converting for saving if the local DB or the parse cache is enabled
+        return store.enabled or bool(parse_cache.max_bytes)
+
+    def _page_expire_after(self, response):
+        if session.freshness is None:
+            return None
+        return session.freshness.expire_after(response.url, response.content)
+
+    # Bulk loading protocol, implemented by models whose page can be loaded with many others at once
+    # (see `pyAFL.base.executor.fetch_and_parse`)
+    def _page_url(self) -> str:
+        """Returns the url of the page the object is loaded from."""
+        raise NotImplementedError
+
+    def _page_parser(self):
+        """Returns a picklable function which parses the page html into a compact, picklable result."""
+        raise NotImplementedError
+
+    def _get_stored_result(self, resp=None):
+        """Returns the result saved in the local store (for the page `resp`, if given), or None."""
+        raise NotImplementedError
 
-        return None
\ No newline at end of file
+    def _result_from_parsed(self, resp, parsed):
+        """Saves the result of the page parser for the page `resp`, and returns the object's result."""
+        raise NotImplementedError
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import re
+
+from pyAFL import config
+from pyAFL.base.lazy import lazy_import
+from pyAFL.base.metrics import metrics
+
+bs4 = lazy_import("bs4")
+etree = lazy_import("lxml.etree")
+lxml_html = lazy_import("lxml.html")
+pd = lazy_import("pandas")
+
+# Parser backends `parse_html` accepts
+PARSERS = ("lxml", "html.parser", "html5lib")
+
+# Same whitespace clean-up as `pd.read_html`, so frames built here match its output cell for cell.
+_RE_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+
+# The functions below accept elements of either a BeautifulSoup tree or an lxml tree. lxml trees are
+# much faster to walk, and are used for the largest pages.
+
+
+def _is_lxml(element) -> bool:
+    return isinstance(element, etree._Element)
+
+
+def parse_html(html, parser: str = None):
+    """
+    Parses a page with the configured parser backend. Every model parses its pages with this function, and
+    reads them with the functions below, which accept either kind of tree.
+
+    Parameters
+    ----------
+        html : str or bytes (required)
+            page html
+        parser : str
+            "lxml" for an lxml tree (the fast path), or "html.parser" or "html5lib" for a BeautifulSoup
+            tree (default: `pyAFL.config.HTML_PARSER`)
+
+    Returns
+    ----------
+        document : lxml.html.HtmlElement or bs4.BeautifulSoup
+    """
+    parser = parser or config.HTML_PARSER
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser '{parser}'. Choose one of: {', '.join(PARSERS)}")
+    if parser != "lxml":
+        return bs4.BeautifulSoup(html, parser)
+
+    try:
+        return lxml_html.document_fromstring(html)
+    except ValueError:
+        # lxml does not accept str with an xml encoding declaration
+        return lxml_html.document_fromstring(html.encode("utf-8"))
+    except etree.ParserError:
+        # Empty page
+        return lxml_html.document_fromstring("<html></html>")
+
+
+def find_all(element, tag: str) -> list:
+    """Returns the descendants of `element` with this tag name, in document order."""
+    if _is_lxml(element):
+        return [child for child in element.iterdescendants(tag)]
+    return element.find_all(tag)
+
+
+def find_first(element, tag: str):
+    """Returns the first descendant of `element` with this tag name, or None."""
+    if _is_lxml(element):
+        return next(element.iterdescendants(tag), None)
+    return element.find(tag)
+
+
+def find_parent(element, tag: str):
+    """Returns the closest ancestor of `element` with this tag name, or None."""
+    if _is_lxml(element):
+        return next(element.iterancestors(tag), None)
+    return element.find_parent(tag)
+
+
+def find_text(element, pattern) -> str:
+    """
+    Returns the first text of `element` (or its descendants) which matches the regular expression `pattern`,
+    or None.
+    """
+    pattern = re.compile(pattern)
+    if _is_lxml(element):
+        return next((str(text) for text in element.xpath(".//text()") if pattern.search(text)), None)
+    text = element.find(string=pattern)
+    return None if text is None else str(text)
+
+
+def get_text(element, separator: str = "") -> str:
+    """Returns the text of `element` and its descendants, joined with `separator`."""
+    if _is_lxml(element):
+        return separator.join(element.xpath(".//text()"))
+    return element.get_text(separator)
+
+
+def tail_text(element) -> str:
+    """Returns the text which directly follows `element` (eg the value after a <b>Born:</b> label), or ""."""
+    if _is_lxml(element):
+        return element.tail or ""
+    sibling = element.next_sibling
+    return str(sibling) if isinstance(sibling, bs4.NavigableString) else ""
+
+
+def get_attribute(element, name: str):
+    """Returns the value of the attribute `name` of `element`, or None."""
+    return _attr(element, name)
+
+
+def find_tables(soup, match: str = ".+") -> list:
+    """
+    Returns the <table> elements of a parsed page which contain text matching `match`, in page order.
+    This is the table selection `pd.read_html(..., match=match)` applies.
+
+    Parameters
+    ----------
+        soup : bs4.BeautifulSoup, bs4.Tag or lxml.html.HtmlElement (required)
+            parsed page (or part of a page) to search
+        match : str
+            regular expression the text of a table must match
+
+    Returns
+    ----------
+        tables : list
+            list of <table> elements, of the same kind as `soup`
+    """
+    pattern = re.compile(match)
+
+    if _is_lxml(soup):
+        return [
+            table for table in soup.iter("table")
+            if any(pattern.search(text) for text in table.xpath(".//text()"))
+        ]
+    return [table for table in soup.find_all("table") if table.find(string=pattern) is not None]
+
+
+def _cells(row) -> list:
+    if _is_lxml(row):
+        return row.xpath("./td|./th")
+    return row.find_all(("td", "th"), recursive=False)
+
+
+def _tag(element) -> str:
+    return element.tag if _is_lxml(element) else element.name
+
+
+def _attr(element, name: str):
+    return element.get(name) if _is_lxml(element) else element.attrs.get(name)
+
+
+def _cell_text(cell) -> str:
+    # <br> counts as a line break, as it does for `pd.read_html`
+    if _is_lxml(cell):
+        text = cell.text_content() if cell.find(".//br") is None else "".join(_lxml_text_parts(cell))
+    elif cell.br is None:
+        text = cell.get_text()
+    else:
+        text = "".join(
+            "\n" if element.name == "br" else element
+            for element in cell.descendants
+            if element.name == "br" or type(element) is bs4.NavigableString
+        )
+
+    return _RE_WHITESPACE.sub(" ", text.strip())
+
+
+def _lxml_text_parts(element):
+    # Yields the text of `element` and its descendants in document order, with a line break for each <br>
+    yield element.text or ""
+    for child in element:
+        if child.tag == "br":
+            yield "\n"
+        elif isinstance(child.tag, str):
+            yield from _lxml_text_parts(child)
+        yield child.tail or ""
+
+
+def _expand_colspan_rowspan(rows, remainder=None, overflow=True):
+    # Returns the text rows of the <tr>s in `rows`, with the text of each cell repeated `colspan` times
+    # across and `rowspan` times down. Cells which span past the last row are returned as the remainder.
+    all_texts = []
+    remainder = remainder if remainder is not None else []
+
+    for tr in rows:
+        texts = []
+        next_remainder = []
+
+        index = 0
+        for td in _cells(tr):
+            while remainder and remainder[0][0] <= index:
+                prev_i, prev_text, prev_rowspan = remainder.pop(0)
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+                index += 1
+
+            text = _cell_text(td)
+            rowspan = int(_attr(td, "rowspan") or 1)
+            colspan = int(_attr(td, "colspan") or 1)
+
+            for _ in range(colspan):
+                texts.append(text)
+                if rowspan > 1:
+                    next_remainder.append((index, text, rowspan - 1))
+                index += 1
+
+        for prev_i, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+
+        all_texts.append(texts)
+        remainder = next_remainder
+
+    if not overflow:
+        while remainder:
+            next_remainder = []
+            texts = []
+            for prev_i, prev_text, prev_rowspan in remainder:
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+            all_texts.append(texts)
+            remainder = next_remainder
+
+    return all_texts, remainder
+
+
+def table_rows(table) -> tuple:
+    """
+    Returns the text of the header, body and footer rows of an already parsed <table> element, split the
+    same way `pd.read_html` splits them: <thead> rows (or the leading rows made only of <th> cells) are
+    header rows, and colspan/rowspan cells are repeated.
+
+    Parameters
+    ----------
+        table : bs4.Tag or lxml.html.HtmlElement (required)
+            <table> element
+
+    Returns
+    ----------
+        rows : tuple
+            (header, body, footer), each a list of rows, each row a list of str
+    """
+    if _is_lxml(table):
+        header_rows = table.xpath(".//thead/tr")
+        body_rows = table.xpath(".//tbody//tr") + table.xpath("./tr")
+        footer_rows = table.xpath(".//tfoot//tr")
+    else:
+        header_rows = table.select("thead tr")
+        body_rows = table.select("tbody tr") + table.find_all("tr", recursive=False)
+        footer_rows = table.select("tfoot tr")
+
+    if not header_rows:
+        while body_rows and all(_tag(cell) == "th" for cell in _cells(body_rows[0])):
+            header_rows.append(body_rows.pop(0))
+
+    head, remainder = _expand_colspan_rowspan(header_rows)
+    body, remainder = _expand_colspan_rowspan(body_rows, remainder, overflow=len(footer_rows) > 0)
+    foot, _ = _expand_colspan_rowspan(footer_rows, remainder, overflow=False)
+
+    return head, body, foot
+
+
+def table_to_frame(table) -> pd.DataFrame:
+    """
+    Converts an already parsed <table> element to a DataFrame, without serialising and re-parsing the html.
+     - Produces the same frame as `pd.read_html(StringIO(str(table)))[0]`: header rows are found by
+     `table_rows`, and the columns are type converted with "," as the thousands separator.
+     - Raises `pandas.errors.EmptyDataError` if the table has no cells.
+
+    Parameters
+    ----------
+        table : bs4.Tag or lxml.html.HtmlElement (required)
+            <table> element
+
+    Returns
+    ----------
+        df : pandas.DataFrame
+    """
+    return rows_to_frame(*table_rows(table))
+
+
+def rows_to_frame(head: list, body: list, foot: list) -> pd.DataFrame:
+    """
+    Converts the header, body and footer rows returned by `table_rows` to a DataFrame, exactly as
+    `pd.read_html` converts them.
+    """
+    header = None
+    if head:
+        body = head + body
+        header = 0 if len(head) == 1 else [i for i, row in enumerate(head) if any(row)]
+    body = body + foot
+
+    # Pad ragged rows, as `pd.read_html` does
+    width = max((len(row) for row in body), default=0)
+    body = [row + [""] * (width - len(row)) for row in body]
+
+    with metrics.timer("frame", page=metrics.current_page()) as fields:
+        with pd.io.parsers.TextParser(body, header=header, thousands=",") as parser:
+            df = parser.read()
+        fields["rows"] = len(df)
+    return df
+
+
+def read_tables(soup, match: str = ".+") -> list:
+    """
+    Equivalent of `pd.read_html(StringIO(html), match=match)` for a page which has already been parsed.
+    Empty tables are skipped.
+
+    Parameters
+    ----------
+        soup : bs4.BeautifulSoup, bs4.Tag or lxml.html.HtmlElement (required)
+            parsed page (or part of a page)
+        match : str
+            regular expression the text of a table must match
+
+    Returns
+    ----------
+        dfs : list
+            list of pandas.DataFrame, in page order
+    """
+    dfs = []
+    for table in find_tables(soup, match):
+        try:
+            dfs.append(table_to_frame(table))
+        except pd.errors.EmptyDataError:
+            continue
+
+    return dfs
@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+
+from pyAFL import config
+from pyAFL.base.lazy import LazyObject, lazy_import
+
+pd = lazy_import("pandas")
+
+# Bump whenever the schema or the pickled payloads change, so that old stores are rebuilt
+STORE_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    name TEXT,
+    team TEXT,
+    year INTEGER,
+    info TEXT,
+    payload BLOB NOT NULL,
+    parser_version INTEGER,
+    digest TEXT,
+    updated REAL NOT NULL,
+    expires REAL,
+    PRIMARY KEY (kind, key)
+);
+CREATE INDEX IF NOT EXISTS entities_name ON entities (kind, name);
+CREATE INDEX IF NOT EXISTS entities_team ON entities (kind, team);
+CREATE INDEX IF NOT EXISTS entities_year ON entities (kind, year);
+
+CREATE TABLE IF NOT EXISTS matches (
+    year INTEGER NOT NULL,
+    round INTEGER,
+    game_number INTEGER,
+    date TEXT,
+    finals_stage TEXT,
+    venue TEXT,
+    home_team TEXT,
+    away_team TEXT,
+    home_team_score INTEGER,
+    away_team_score INTEGER,
+    winning_team TEXT,
+    margin INTEGER,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS matches_year ON matches (year, round);
+CREATE INDEX IF NOT EXISTS matches_date ON matches (date);
+CREATE INDEX IF NOT EXISTS matches_home_team ON matches (home_team, date);
+CREATE INDEX IF NOT EXISTS matches_away_team ON matches (away_team, date);
+
+CREATE TABLE IF NOT EXISTS games (
+    team TEXT NOT NULL,
+    date TEXT,
+    round TEXT,
+    opponent TEXT,
+    venue TEXT,
+    result TEXT,
+    score_for INTEGER,
+    score_against INTEGER,
+    margin INTEGER,
+    crowd INTEGER
+);
+CREATE INDEX IF NOT EXISTS games_team ON games (team, date);
+CREATE INDEX IF NOT EXISTS games_date ON games (date);
+"""
+
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def page_digest(content: bytes) -> str:
+    """Returns the digest of a page, saved with the entities parsed from it."""
+    return hashlib.sha1(content).hexdigest()
+
+
+def expiry_time(expire_after):
+    """Returns the epoch time at which an entity expires, or None if it never does (`expire_after` is -1 or None)."""
+    if expire_after is None or expire_after == -1:
+        return None
+    if isinstance(expire_after, timedelta):
+        expire_after = expire_after.total_seconds()
+    return time.time() + expire_after
+
+
+def _dates(values) -> list:
+    return [None if pd.isna(value) else value.strftime(_DATE_FORMAT) for value in pd.to_datetime(values)]
+
+
+def _ints(values) -> list:
+    return [None if pd.isna(value) else int(value) for value in values]
+
+
+class EntityStore(object):
+    """
+    A local SQLite store of parsed pyAFL entities: players (bio and stats), team game logs, seasons
+    (matches and ladders) and yearly player stats.
+
+    Each entity is saved whole (pickled) under its kind and key, with indexed name, team and year
+    columns, so that models can return it without fetching or parsing any html. Entities expire with the
+    page they were parsed from (see `pyAFL.session.freshness`). An expired entity is still returned if
+    the page has not changed since, which is checked with the digest of the page. Season matches and team
+    games are also saved one row per match, with indexes on year, team and date, so that they can be
+    queried directly with `matches()`, `games()` or `query()`.
+
+    Attributes
+    ----------
+    path : str
+        sqlite file the store is saved to (the store is disabled if None)
+    expire_after : timedelta
+        age after which a saved entity is ignored (and parsed again), unless it is saved with its own expiry
+
+    Methods
+    -------
+    get(kind, key, digest=None, expire_after=None, parser_version=None)
+        returns the saved entity, or None
+    put(kind, key, obj, name=None, team=None, year=None, info=None, digest=None, expire_after=None,
+        parser_version=None)
+        saves an entity
+    matches(year=None, team=None, start=None, end=None)
+        returns saved season matches as a DataFrame
+    games(team=None, start=None, end=None)
+        returns saved team games as a DataFrame
+    query(sql, params=())
+        runs a SQL query against the store and returns a DataFrame
+    clear()
+        deletes everything in the store
+    """
+
+    def __init__(self, path: str = None, expire_after: timedelta = timedelta(days=365)):
+        self.path = path
+        self.expire_after = expire_after
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<EntityStore: {self.path}>"
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; sqlite serialises the writes
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != STORE_VERSION:
+                with self._lock, connection:
+                    connection.executescript(
+                        "DROP TABLE IF EXISTS entities; DROP TABLE IF EXISTS matches; DROP TABLE IF EXISTS games;"
+                    )
+                    connection.executescript(_SCHEMA)
+                    connection.execute(f"PRAGMA user_version = {STORE_VERSION}")
+            self._local.connection = connection
+        return connection
+
+    def get(self, kind: str, key: str, digest: str = None, expire_after=None, parser_version: int = None):
+        """
+        Returns the entity saved under `kind` and `key`, or None if there is none (or it has expired).
+         - If `digest` is given, the entity is only returned if it was parsed from a page with this digest.
+         It is then returned even if it has expired (the page has not changed since), and its expiry is
+         reset to `expire_after`.
+         - If `parser_version` is given, the entity is only returned if it was saved with this version.
+
+        Parameters
+        ----------
+            kind : str (required)
+                kind of entity, eg "player"
+            key : str (required)
+                key of the entity, eg the player url
+            digest : str (optional)
+                `page_digest` of the current page
+            expire_after : timedelta or int (optional)
+                new freshness of an expired entity whose page has not changed (-1 to never expire)
+            parser_version : int (optional)
+                version of the parser the entity must have been parsed with (see `AFLObject.PARSER_VERSION`)
+
+        Returns
+        ----------
+            obj : object
+                the saved entity, or None
+        """
+        entry = self.get_entry(kind, key, digest=digest, expire_after=expire_after, parser_version=parser_version)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, kind: str, key: str, digest: str = None, expire_after=None, parser_version: int = None):
+        """
+        As `get`, but returns a tuple of the entity, the digest of its page and the epoch time at which it
+        expires (None if never), or None.
+        """
+        if not self.enabled:
+            return None
+
+        row = self._connection().execute(
+            "SELECT payload, parser_version, digest, expires FROM entities WHERE kind = ? AND key = ?",
+            (kind, str(key)),
+        ).fetchone()
+        if row is None:
+            return None
+
+        payload, saved_parser_version, saved_digest, expires = row
+        if parser_version is not None and parser_version != saved_parser_version:
+            # Parsed by another version of the parser
+            return None
+        expired = expires is not None and time.time() >= expires
+        if digest is not None and digest != saved_digest:
+            return None
+        if expired and digest is None:
+            return None
+        if expired:
+            expires = expiry_time(expire_after)
+            with self._connection() as connection:
+                connection.execute(
+                    "UPDATE entities SET expires = ? WHERE kind = ? AND key = ?", (expires, kind, str(key))
+                )
+
+        return pickle.loads(payload), saved_digest, expires
+
+    def put(
+        self,
+        kind: str,
+        key: str,
+        obj,
+        name: str = None,
+        team: str = None,
+        year: int = None,
+        info: dict = None,
+        digest: str = None,
+        expire_after=None,
+        parser_version: int = None,
+    ):
+        """
+        Saves an entity under `kind` and `key`, replacing any saved before.
+
+        Parameters
+        ----------
+            kind : str (required)
+                kind of entity, eg "player"
+            key : str (required)
+                key of the entity, eg the player url
+            obj : object (required)
+                the entity (must be picklable)
+            name, team, year : (optional)
+                indexed attributes of the entity
+            info : dict (optional)
+                attributes of the entity which are saved as json, eg a player bio
+            digest : str (optional)
+                `page_digest` of the page the entity was parsed from
+            expire_after : timedelta or int (optional)
+                freshness of the entity (-1 to never expire). Defaults to `self.expire_after`.
+            parser_version : int (optional)
+                version of the parser the entity was parsed with (see `AFLObject.PARSER_VERSION`)
+        """
+        if not self.enabled:
+            return
+
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO entities "
+                "(kind, key, name, team, year, info, payload, parser_version, digest, updated, expires) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    kind,
+                    str(key),
+                    name,
+                    team,
+                    year,
+                    json.dumps(info) if info is not None else None,
+                    pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL),
+                    parser_version,
+                    digest,
+                    time.time(),
+                    expiry_time(self.expire_after if expire_after is None else expire_after),
+                ),
+            )
+
+    def put_matches(self, year: int, matches: pd.DataFrame):
+        """
+        Saves the rows of a season's matches (a `MatchTable.to_frame()`), replacing the rows saved for `year`.
+        """
+        if not self.enabled:
+            return
+
+        rows = zip(
+            [year] * len(matches),
+            _ints(matches["Round"]),
+            _ints(matches["Game number"]),
+            _dates(matches["Date"]),
+            matches["Year stage"].astype(str),
+            matches["Venue"].astype(str),
+            matches["Home team"].astype(str),
+            matches["Away Team"].astype(str),
+            _ints(matches["Home team score"]),
+            _ints(matches["Away team score"]),
+            matches["Winning team"].astype(str),
+            _ints(matches["Margin"]),
+            matches["Result"].astype(str),
+        )
+        with self._connection() as connection:
+            connection.execute("DELETE FROM matches WHERE year = ?", (year,))
+            connection.executemany("INSERT INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def put_games(self, team: str, games: pd.DataFrame):
+        """
+        Saves the rows of a team's game log (`Team.games`), replacing the rows saved for `team`.
+        """
+        if not self.enabled:
+            return
+
+        def column(name):
+            return games[name] if name in games else [None] * len(games)
+
+        rows = zip(
+            [team] * len(games),
+            _dates(games["Date"]),
+            [None if pd.isna(value) else str(value) for value in column("Rnd")],
+            [None if pd.isna(value) else str(value) for value in column("Opponent")],
+            [None if pd.isna(value) else str(value) for value in column("Venue")],
+            [None if pd.isna(value) else str(value) for value in column("Result")],
+            _ints(column("For")),
+            _ints(column("Against")),
+            _ints(column("Margin")),
+            _ints(column("Crowd")),
+        )
+        with self._connection() as connection:
+            connection.execute("DELETE FROM games WHERE team = ?", (team,))
+            connection.executemany("INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def query(self, sql: str, params=()) -> pd.DataFrame:
+        """
+        Runs a SQL query against the store and returns the result as a DataFrame.
+        The tables are `entities`, `matches` (one row per season match) and `games` (one row per team game).
+        """
+        return pd.read_sql_query(sql, self._connection(), params=params)
+
+    def matches(self, year: int = None, team: str = None, start: str = None, end: str = None) -> pd.DataFrame:
+        """
+        Returns the saved season matches, filtered by year, by team (home or away) and by date range.
+
+        Parameters
+        ----------
+            year : int (optional)
+                season year
+            team : str (optional)
+                team name, eg "Richmond"
+            start, end : str (optional)
+                first and last date (inclusive), eg "2019-01-01"
+
+        Returns
+        ----------
+            matches : Pandas dataframe
+                one row per match, ordered by date
+        """
+        where, params = self._date_range("date", start, end)
+        if year is not None:
+            where.append("year = ?")
+            params.append(year)
+        if team is not None:
+            where.append("(home_team = ? OR away_team = ?)")
+            params.extend([team, team])
+
+        return self._select("matches", where, params)
+
+    def games(self, team: str = None, start: str = None, end: str = None) -> pd.DataFrame:
+        """
+        Returns the saved team games, filtered by team and by date range (see `matches`).
+        """
+        where, params = self._date_range("date", start, end)
+        if team is not None:
+            where.append("team = ?")
+            params.append(team)
+
+        return self._select("games", where, params)
+
+    def _date_range(self, column: str, start: str, end: str):
+        where, params = [], []
+        if start is not None:
+            where.append(f"{column} >= ?")
+            params.append(pd.Timestamp(start).strftime(_DATE_FORMAT))
+        if end is not None:
+            where.append(f"{column} < ?")
+            params.append((pd.Timestamp(end) + pd.Timedelta(days=1)).strftime(_DATE_FORMAT))
+        return where, params
+
+    def _select(self, table: str, where: list, params: list) -> pd.DataFrame:
+        sql = f"SELECT * FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        df = self.query(sql + " ORDER BY date", params)
+        df["date"] = pd.to_datetime(df["date"], format=_DATE_FORMAT)
+
+        return df
+
+    def clear(self):
+        """Deletes every saved entity and row."""
+        if not self.enabled:
+            return
+
+        with self._connection() as connection:
+            connection.execute("DELETE FROM entities")
+            connection.execute("DELETE FROM matches")
+            connection.execute("DELETE FROM games")
+
+
+# Shared store of the models, created when first used (`pyAFL_store.sqlite` in the cache dir)
+store = LazyObject(lambda: EntityStore(config.cache_path("pyAFL_store.sqlite")))
@@ -0,0 +1,149 @@
+import json
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import pyAFL
+from pyAFL.base import datasets
+from pyAFL.base.datasets import DatasetWriter, games_table, matches_table, season_stats_table
+from pyAFL.base.exceptions import LookupError
+from pyAFL.seasons.models import Season
+from pyAFL.session.rewriters import soup_rewriter
+from pyAFL.teams import ADE
+from pyAFL.teams.models import SeasonStatsPage
+from pyAFL.testing.fixtures import GAMES_PAGE, STATS_PAGE, season_page
+
+
+def _season_stats(year):
+    html = soup_rewriter(f"https://afltables.com/afl/seas/{year}.html", season_page(year=year, seed=year)).decode()
+    return Season(year, url=f"https://afltables.com/afl/seas/{year}.html")._parse_season_stats(html)
+
+
+SEASONS = {year: _season_stats(year) for year in (2016, 2017)}
+GAMES = ADE._parse_games(GAMES_PAGE)
+ALL_TEAMS_STATS = SeasonStatsPage(2019, STATS_PAGE).all_teams()
+
+
+@pytest.fixture(params=["arrow", "parquet"])
+def exported(request, tmp_path):
+    writer = DatasetWriter(str(tmp_path), format=request.param)
+    for year, stats in SEASONS.items():
+        writer.write("matches", year, matches_table(year, stats.season_matches))
+    writer.write("games", "Adelaide", games_table("Adelaide", GAMES))
+    writer.write("season_stats", 2019, season_stats_table(2019, ALL_TEAMS_STATS))
+    writer.save_manifest()
+    return str(tmp_path)
+
+
+class TestTables:
+    def test_matches_table(self):
+        matches = SEASONS[2017].season_matches
+        table = matches_table(2017, matches)
+
+        assert table.schema == datasets._schemas()["matches"]
+        assert table.num_rows == len(matches)
+        assert table["home_team"].to_pylist() == list(matches.home_team)
+        assert table["home_team_score_detail"].to_pylist()[0] == matches[0].home_team_score_detail
+        assert table["date"].to_pylist()[0] == matches[0].date
+
+    def test_games_table(self):
+        table = games_table("Adelaide", GAMES)
+
+        assert table.schema == datasets._schemas()["games"]
+        assert table["score_for"].to_pylist() == GAMES.For.tolist()
+        assert table["crowd"].null_count == GAMES.Crowd.isna().sum()
+
+    def test_season_stats_table_has_every_stats_column(self):
+        table = season_stats_table(2019, ALL_TEAMS_STATS)
+
+        assert table.schema == datasets._schemas()["season_stats"]
+        assert table["KI"].to_pylist() == [1001, 350, 1351, 400, 400]
+        assert table["number"].to_pylist() == [1, 2, None, 10, None]
+        assert table["MK"].null_count == 5
+
+
+class TestLoaders:
+    def test_load_matches(self, exported):
+        matches = pyAFL.load_matches(path=exported)
+
+        assert len(matches) == sum(len(stats.season_matches) for stats in SEASONS.values())
+        assert list(matches.columns) == datasets._schemas()["matches"].names
+        assert isinstance(matches.home_team.dtype, pd.CategoricalDtype)
+        assert set(matches.year) == {2016, 2017}
+
+    def test_load_matches_by_year_and_team(self, exported):
+        matches = pyAFL.load_matches(years=[2017], teams="Richmond", path=exported)
+        expected = SEASONS[2017].season_matches.by_team("Richmond")
+
+        assert len(matches) == len(expected)
+        assert set(matches.year) == {2017}
+        pd.testing.assert_series_equal(
+            matches.margin.reset_index(drop=True), pd.Series(expected.margin, name="margin"), check_dtype=False
+        )
+
+    def test_load_matches_as_arrow(self, exported):
+        table = pyAFL.load_matches(years=[2016], path=exported, as_arrow=True)
+
+        assert isinstance(table, pa.Table)
+        assert table.num_rows == len(SEASONS[2016].season_matches)
+
+    def test_load_missing_partitions(self, exported):
+        assert len(pyAFL.load_matches(years=[1900], path=exported)) == 0
+        assert len(pyAFL.load_games(teams="Richmond", path=exported)) == 0
+
+    def test_load_games(self, exported):
+        games = pyAFL.load_games(teams="Adelaide", path=exported)
+
+        assert len(games) == len(GAMES)
+        assert games.score_for.tolist() == GAMES.For.tolist()
+
+    def test_load_season_stats(self, exported):
+        stats = pyAFL.load_season_stats(years=[2019], teams=["Port Adelaide"], path=exported)
+
+        assert stats.player.tolist() == ["Boak, Travis", "Totals"]
+
+    def test_manifest(self, exported):
+        with open(f"{exported}/manifest.json") as f:
+            manifest = json.load(f)
+
+        assert manifest["version"] == datasets.DATASETS_VERSION
+        assert manifest["datasets"]["matches"]["2017"]["rows"] == len(SEASONS[2017].season_matches)
+
+    def test_no_datasets(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            pyAFL.load_matches(path=str(tmp_path))
+
+
+class TestExportHistory:
+    def test_export_history(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Season, "get_season_stats", lambda self, force_live=False: SEASONS[self.season])
+        monkeypatch.setattr("pyAFL.teams.models.season_stats_all_teams", lambda year: ALL_TEAMS_STATS)
+        monkeypatch.setattr(type(ADE), "games", property(lambda self: GAMES))
+
+        pyAFL.export_history(str(tmp_path), years=[2016, 2017], teams=[ADE])
+
+        assert len(pyAFL.load_matches(path=str(tmp_path))) == sum(len(s.season_matches) for s in SEASONS.values())
+        assert set(pyAFL.load_season_stats(path=str(tmp_path)).year) == {2016, 2017}
+        assert len(pyAFL.load_games(path=str(tmp_path))) == len(GAMES)
+
+    def test_seasons_not_played_are_skipped(self, tmp_path, monkeypatch):
+        def get_season_stats(self, force_live=False):
+            if self.season not in SEASONS:
+                raise LookupError(f"Found no season for year {self.season}")
+            return SEASONS[self.season]
+
+        monkeypatch.setattr(Season, "get_season_stats", get_season_stats)
+        monkeypatch.setattr("pyAFL.teams.models.season_stats_all_teams", lambda year: ALL_TEAMS_STATS)
+        monkeypatch.setattr(type(ADE), "games", property(lambda self: GAMES))
+
+        with pytest.warns(UserWarning, match="2018"):
+            pyAFL.export_history(str(tmp_path), years=[2016, 2017, 2018], teams=[ADE])
+
+        assert set(pyAFL.load_matches(path=str(tmp_path)).year) == {2016, 2017}
+        with open(f"{tmp_path}/manifest.json") as f:
+            assert json.load(f)["skipped"] == [2018]
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            DatasetWriter(str(tmp_path), format="csv")
@@ -0,0 +1,104 @@
+import time
+from concurrent.futures import CancelledError
+
+import pandas as pd
+import pytest
+
+from pyAFL.base.exceptions import LookupError
+from pyAFL.base.executor import ParseExecutor, fetch_and_parse
+from pyAFL.players.models import Player, parse_player_page, player_stats_many
+from pyAFL.seasons.models import Season, parse_season_page, season_stats_many
+from pyAFL.teams.models import Team, games_many, parse_games_page
+from pyAFL.testing.fixtures import GAMES_PAGE, PLAYER_PAGE, season_page
+
+
+@pytest.fixture(scope="module")
+def process_pool():
+    with ParseExecutor(2) as executor:
+        yield executor
+
+
+class TestParseExecutor:
+    def test_inline(self):
+        executor = ParseExecutor(0)
+
+        assert not executor.parallel
+        assert executor.map(len, ["a", "bc"]) == [1, 2]
+        assert executor.submit(int, "x").exception() is not None
+
+    def test_parsers_run_in_worker_processes(self, process_pool):
+        games = process_pool.map(parse_games_page, [GAMES_PAGE])
+        player = process_pool.submit(parse_player_page, PLAYER_PAGE.decode())
+
+        pd.testing.assert_frame_equal(games[0], parse_games_page(GAMES_PAGE))
+        assert player.result()["metadata"]["born"] == "13-Oct-1943"
+        assert player.result()["years"] == [1962, 1963]
+
+    def test_parser_errors_are_raised(self, process_pool):
+        with pytest.raises(LookupError):
+            process_pool.submit(parse_season_page, "<html></html>", 2017).result()
+
+    def test_shutdown_cancels_pending_work(self):
+        executor = ParseExecutor(2)
+        futures = [executor.submit(time.sleep, 0.5) for _ in range(20)]
+
+        start = time.perf_counter()
+        executor.shutdown()
+
+        assert time.perf_counter() - start < 3
+        assert all(future.done() for future in futures)
+        assert any(isinstance(future.exception(), CancelledError) for future in futures)
+        assert executor.map(len, ["a"]) == [1]
+        executor.shutdown()
+
+
+class TestFetchAndParse:
+    def test_player_stats_many(self, stand_in):
+        base_url, handler = stand_in
+        paths = [f"/afl/stats/players/S/Stuart_Magee{i}.html" for i in range(4)]
+        handler.pages.update({path: PLAYER_PAGE for path in paths})
+        players = [Player("Stuart Magee", url=base_url + path) for path in paths]
+
+        stats = player_stats_many(players, parse_workers=2)
+        expected = Player("Stuart Magee", url=base_url + "/afl/stats/players/S/Stuart_Magee.html").get_player_stats()
+
+        assert len(stats) == len(players)
+        for player, player_stats in zip(players, stats):
+            assert player.metadata["born"] == "13-Oct-1943"
+            pd.testing.assert_frame_equal(player_stats.season_stats_total, expected.season_stats_total)
+            pd.testing.assert_frame_equal(player_stats.season_results[1962], expected.season_results[1962])
+
+        # Later loads come from the store, single or bulk
+        stored = Player("Stuart Magee", url=players[0].url).get_player_stats()
+        player_stats_many(players)
+        assert all(handler.hits[path] == 1 for path in paths)
+        pd.testing.assert_frame_equal(stored.season_stats_average, expected.season_stats_average)
+
+    def test_season_stats_many(self, stand_in, process_pool, monkeypatch):
+        base_url, handler = stand_in
+        handler.pages.update({f"/afl/seas/{year}.html": season_page(year=year) for year in (2016, 2017)})
+        monkeypatch.setattr("pyAFL.base.executor.parse_executor", process_pool)
+        seasons = [Season(year, url=base_url + f"/afl/seas/{year}.html") for year in (2016, 2017)]
+
+        stats = season_stats_many(seasons)
+
+        assert [int(str(s.season_matches.date[0])[:4]) for s in stats] == [2016, 2017]
+        season = Season(2017, url=base_url + "/afl/seas/2017.html")
+        expected = season._parse_season_stats(season_page(year=2017).decode())
+        pd.testing.assert_frame_equal(stats[1].match_summary, expected.match_summary)
+
+    def test_games_many_in_order(self, stand_in):
+        base_url, handler = stand_in
+        handler.pages["/afl/teams/adelaide/allgames.html"] = GAMES_PAGE.encode()
+        teams = [Team("Adelaide", "adelaide"), Team("Adelaide", "adelaide")]
+        for team in teams:
+            team.all_time_games_url = base_url + "/afl/teams/adelaide/allgames.html"
+
+        games = games_many(teams, parse_workers=0)
+
+        assert handler.hits["/afl/teams/adelaide/allgames.html"] == 1
+        pd.testing.assert_frame_equal(games[0], parse_games_page(GAMES_PAGE))
+        pd.testing.assert_frame_equal(games[1], games[0])
+
+    def test_empty(self):
+        assert fetch_and_parse([]) == []
@@ -0,0 +1,97 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+
+from pyAFL import config
+from pyAFL.base.lazy import LazyModule, LazyObject, lazy_import
+from pyAFL.session import session
+
+# Prints the heavy modules loaded, and whether the session was created, after the statement runs
+SCRIPT = """
+import json, sys
+{statement}
+from pyAFL.session import session
+heavy = ("pandas", "numpy", "bs4", "lxml.etree", "requests", "requests_cache", "fuzzywuzzy")
+print(json.dumps({{"heavy": [name for name in heavy if name in sys.modules], "session": session.created}}))
+"""
+
+
+def _run(statement: str, cache_dir: str = None) -> dict:
+    env = dict(os.environ, PYAFL_CACHE_DIR=cache_dir or config.CACHE_DIR)
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(statement=statement)], env=env, capture_output=True, check=True, text=True
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+class TestLazyModule:
+    def test_module_is_imported_when_first_used(self):
+        module = LazyModule("json.tool")
+
+        assert module._module is None
+        assert module.main is sys.modules["json.tool"].main
+        assert "imported" in repr(module)
+        assert lazy_import("json.tool") is lazy_import("json.tool")
+
+    def test_module_is_imported_once_by_concurrent_threads(self):
+        module = LazyModule("csv")
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(module.reader)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 8 and all(reader is sys.modules["csv"].reader for reader in results)
+
+
+class TestLazyObject:
+    def test_object_is_created_when_first_used(self):
+        created = []
+        lazy = LazyObject(lambda: created.append(1) or threading.local())
+
+        assert not lazy.created and "not created" in repr(lazy)
+        lazy.name = "store"
+        assert lazy.name == "store"
+        assert lazy._get().name == "store"
+        assert created == [1]
+
+    def test_len_is_forwarded(self):
+        assert len(LazyObject(lambda: [1, 2])) == 2
+
+
+class TestColdStart:
+    def test_importing_pyafl_loads_no_heavy_dependency(self):
+        assert _run("from pyAFL.teams import RIC; assert RIC.name == 'Richmond'") == {"heavy": [], "session": False}
+        assert _run("import pyAFL.players.models, pyAFL.seasons.models") == {"heavy": [], "session": False}
+
+    def test_datasets_are_imported_when_first_used(self):
+        statement = (
+            "import pyAFL.config; assert 'pyAFL.base.datasets' not in sys.modules; "
+            "from pyAFL import load_games; assert 'pyAFL.base.datasets' in sys.modules"
+        )
+        assert _run(statement) == {"heavy": [], "session": False}
+
+    def test_importing_pyafl_creates_no_file(self, tmp_path):
+        cache_dir = str(tmp_path / "cache")
+        _run("import pyAFL, pyAFL.teams, pyAFL.players.models, pyAFL.base.datasets", cache_dir=cache_dir)
+
+        assert not os.path.exists(cache_dir)
+
+        _run("from pyAFL.base.store import store; store.path", cache_dir=cache_dir)
+        assert os.path.exists(cache_dir)
+
+    def test_session_is_created_when_first_used(self):
+        result = _run("from pyAFL.session import session; session.cache")
+
+        assert result["session"]
+        assert "requests_cache" in result["heavy"]
+
+    def test_session_attributes_are_forwarded(self, monkeypatch):
+        monkeypatch.setattr(session, "link_rewriter", "fast")
+
+        assert session.created
+        assert session._get().link_rewriter == "fast"
+        assert session.rewriter_version == session._get().rewriter_version
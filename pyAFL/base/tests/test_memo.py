@@ -0,0 +1,215 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyAFL.base.memo import ParseCache, _copy_on_write, parse_cache
+from pyAFL.base.models import AFLObject
+from pyAFL.seasons.models import Season
+from pyAFL.teams.models import Team
+from pyAFL.teams.tests.test_models import _response
+from pyAFL.testing.fixtures import GAMES_PAGE, season_page
+
+
+def _frame(rows: int = 100) -> pd.DataFrame:
+    return pd.DataFrame({"a": np.arange(rows), "b": ["x"] * rows})
+
+
+def _write(obj, write):
+    # Writes to an object returned by the cache: pandas either copies the data it writes to (copy on write),
+    # or refuses to write to the cache's read-only arrays
+    try:
+        write(obj)
+    except ValueError:
+        assert not _copy_on_write() or isinstance(obj, np.ndarray)
+
+
+class TestParseCache:
+    def test_put_and_get(self):
+        cache = ParseCache()
+        cache.put("team_games", "url", _frame(), version=1, digest="abc")
+
+        pd.testing.assert_frame_equal(cache.get("team_games", "url", version=1), _frame())
+        assert cache.get("team_games", "url", version=2) is None
+        assert cache.get("team_games", "url", version=1, digest="def") is None
+        assert cache.get("team_games", "other url", version=1) is None
+
+    def test_expired_objects_are_only_returned_for_the_same_page(self):
+        cache = ParseCache()
+        cache.put("team_games", "url", _frame(), version=1, digest="abc", expires=0)
+
+        assert cache.get("team_games", "url", version=1) is None
+        assert cache.get("team_games", "url", version=1, digest="abc", expire_after=-1) is not None
+        assert cache.get("team_games", "url", version=1) is not None  # never expires now
+
+    def test_cached_objects_cannot_be_changed(self):
+        cache = ParseCache()
+        frame = _frame()
+        cache.put("season", "url", {"frame": frame, "array": np.arange(3)}, version=1)
+        frame.loc[0, "a"] = -1  # the cache keeps a copy
+
+        cached = cache.get("season", "url", version=1)
+        _write(cached["frame"], lambda frame: frame.loc.__setitem__((0, "a"), -2))
+        cached["frame"]["c"] = 1
+        with pytest.raises(ValueError):
+            cached["array"][0] = 1
+
+        pd.testing.assert_frame_equal(cache.get("season", "url", version=1)["frame"], _frame())
+
+    def test_changes_to_returned_frames_do_not_reach_the_cache(self):
+        cache = ParseCache()
+        frame = pd.DataFrame({
+            "a": np.arange(3),
+            "b": pd.Categorical(["x", "y", "x"]),
+            "c": pd.array([1, None, 3], dtype="Int32"),
+        })
+        cache.put("season", "url", frame, version=1)
+
+        cached = cache.get("season", "url", version=1)
+        _write(cached, lambda frame: frame.iloc.__setitem__((1, 0), -1))
+        _write(cached, lambda frame: frame.loc.__setitem__((0, "b"), "y"))
+        _write(cached, lambda frame: frame.loc.__setitem__((1, "c"), 2))
+        _write(cached["a"], lambda series: series.__setitem__(2, -1))
+        _write(cached["a"].values, lambda values: values.__setitem__(0, -1))
+
+        pd.testing.assert_frame_equal(cache.get("season", "url", version=1), frame)
+
+    def test_repeated_gets_do_not_copy_frames(self):
+        cache = ParseCache()
+        cache.put("season", "url", _frame(10 ** 6), version=1)
+        cached = cache.get("season", "url", version=1)
+
+        tracemalloc.start()
+        try:
+            frames = [cache.get("season", "url", version=1) for _ in range(20)]
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert peak < 8 * 10 ** 6 / 4  # a quarter of one copy of column "a"
+        assert all(np.shares_memory(frame["a"].values, cached["a"].values) for frame in frames)
+
+    def test_least_recently_used_objects_are_evicted(self):
+        cache = ParseCache()
+        cache.put("team_games", "a", _frame(), version=1)
+        cache.max_bytes = cache.stats()["bytes"] * 5 // 2
+        cache.put("team_games", "b", _frame(), version=1)
+        cache.get("team_games", "a", version=1)
+        cache.put("team_games", "c", _frame(), version=1)
+
+        assert len(cache) == 2
+        assert cache.get("team_games", "b", version=1) is None
+        assert cache.get("team_games", "a", version=1) is not None
+        assert cache.stats()["bytes"] <= cache.max_bytes
+
+    def test_invalidate(self):
+        cache = ParseCache()
+        cache.put("team_games", "a", _frame(), version=1, url="https://afltables.com/a.html")
+        cache.put("team_games", "b", _frame(), version=1, url="https://afltables.com/b.html")
+        cache.put("season", "c", _frame(), version=1)
+
+        cache.invalidate(url="https://afltables.com/a.html")
+        assert cache.get("team_games", "a", version=1) is None
+        assert cache.get("team_games", "b", version=1) is not None
+
+        cache.invalidate(kind="team_games")
+        assert len(cache) == 1
+
+        cache.invalidate()
+        assert len(cache) == 0 and cache.stats()["bytes"] == 0
+
+
+class TestMemoisedModels:
+    def test_team_games_are_parsed_once(self, monkeypatch, entity_store):
+        pages, parsed = [], []
+        parse_games = Team._parse_games
+
+        def get(url, *args, **kwargs):
+            pages.append(url)
+            return _response(GAMES_PAGE)
+
+        def parse(self, html):
+            parsed.append(html)
+            return parse_games(self, html)
+
+        monkeypatch.setattr("pyAFL.teams.models.session.get", get)
+        monkeypatch.setattr(Team, "_parse_games", parse)
+        games = Team("Adelaide", "adelaide").games
+        monkeypatch.setattr(entity_store, "path", None)  # served from memory, not the store
+
+        games.iloc[0, 0] = None
+        cached = Team("Adelaide", "adelaide").games
+
+        assert len(pages) == len(parsed) == 1
+        assert cached.iloc[0, 0] is not None
+        pd.testing.assert_frame_equal(cached, Team("Adelaide", "adelaide").games)
+
+    def test_season_is_memoised_without_the_store(self, stand_in, entity_store, monkeypatch):
+        base_url, handler = stand_in
+        handler.pages["/afl/seas/2017.html"] = season_page()
+        monkeypatch.setattr(entity_store, "path", None)
+        url = base_url + "/afl/seas/2017.html"
+
+        stats = Season(2017, url=url).get_season_stats()
+        stats.match_summary.drop(stats.match_summary.index, inplace=True)
+        cached = Season(2017, url=url).get_season_stats()
+
+        assert handler.hits["/afl/seas/2017.html"] == 1
+        assert len(cached.match_summary) == len(stats.season_matches)
+        assert len(cached.season_matches) == len(stats.season_matches)
+
+        parse_cache.invalidate(url=url)
+        Season(2017, url=url).get_season_stats()
+        assert len(parse_cache) == 1
+
+    def test_parser_version_bump_ignores_cached_objects(self, monkeypatch, entity_store):
+        pages = []
+
+        def get(url, *args, **kwargs):
+            pages.append(url)
+            return _response(GAMES_PAGE)
+
+        monkeypatch.setattr("pyAFL.teams.models.session.get", get)
+        Team("Adelaide", "adelaide").games
+        monkeypatch.setattr(AFLObject, "PARSER_VERSION", AFLObject.PARSER_VERSION + 1)
+        monkeypatch.setattr(entity_store, "path", None)
+        Team("Adelaide", "adelaide").games
+
+        assert len(pages) == 2
+
+    def test_parser_version_bump_ignores_stored_objects(self, monkeypatch):
+        pages = []
+
+        def get(url, *args, **kwargs):
+            pages.append(url)
+            return _response(GAMES_PAGE)
+
+        monkeypatch.setattr("pyAFL.teams.models.session.get", get)
+        Team("Adelaide", "adelaide").games
+        parse_cache.clear()
+        monkeypatch.setattr(AFLObject, "PARSER_VERSION", AFLObject.PARSER_VERSION + 1)
+        Team("Adelaide", "adelaide").games
+        Team("Adelaide", "adelaide").games
+
+        assert len(pages) == 2
+
+    def test_team_players_are_parsed_once(self, monkeypatch, entity_store):
+        pages = []
+        html = (
+            "<table><tbody><tr><td><a href='https://afltables.com/afl/stats/players/R/Rory_Sloane.html'>"
+            "Sloane, Rory</a></td></tr></tbody></table>"
+        )
+
+        def get(url, *args, **kwargs):
+            pages.append(url)
+            return _response(html)
+
+        monkeypatch.setattr("pyAFL.teams.models.session.get", get)
+        players = Team("Adelaide", "adelaide").players
+        players.clear()
+        cached = Team("Adelaide", "adelaide").players
+
+        assert len(pages) == 1
+        assert [player.url for player in cached] == ["https://afltables.com/afl/stats/players/R/Rory_Sloane.html"]
+        assert len(entity_store.query("SELECT * FROM entities WHERE kind = 'team_players'")) == 1
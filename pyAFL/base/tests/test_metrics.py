@@ -0,0 +1,142 @@
+import pytest
+
+from pyAFL.base.executor import ParseExecutor
+from pyAFL.base.metrics import Metrics, metrics
+from pyAFL.players.models import Player, parse_player_page
+from pyAFL.seasons.models import Season
+from pyAFL.session import session
+from pyAFL.teams.models import SeasonStatsPage
+from pyAFL.testing.fixtures import PLAYER_PAGE, stats_page
+
+
+@pytest.fixture
+def events():
+    """Collects the events recorded during the test."""
+    events = []
+    hook = metrics.add_hook(lambda event, fields: events.append((event, fields)))
+    yield events
+    metrics.remove_hook(hook)
+
+
+class TestMetrics:
+    def test_stats(self):
+        m = Metrics()
+        m.record("request", url="a", outcome="hit", status=200, seconds=0.0, bytes=10)
+        m.record("request", url="b", outcome="miss", status=200, seconds=0.5, bytes=30)
+        m.record("parse", page="season", seconds=0.25, bytes=30)
+        with m.timer("frame", page="season") as fields:
+            fields["rows"] = 9
+
+        stats = m.stats(reset=True)
+        assert stats["requests"]["count"] == 2
+        assert (stats["requests"]["hit"], stats["requests"]["miss"], stats["requests"]["revalidated"]) == (1, 1, 0)
+        assert stats["requests"]["bytes"] == 40
+        assert stats["requests"]["max_seconds"] == 0.5
+        assert stats["parse"] == {
+            "season": {"count": 1, "seconds": 0.25, "max_seconds": 0.25, "bytes": 30, "mean_seconds": 0.25}
+        }
+        assert stats["frames"]["season"]["rows"] == 9
+        assert m.stats()["requests"]["count"] == 0
+
+    def test_frames_take_the_page_type_of_the_parse_step(self):
+        m = Metrics()
+        with m.timer("parse", page="player"):
+            assert m.current_page() == "player"
+            with m.page("player_index"):
+                assert m.current_page() == "player_index"
+            assert m.current_page() == "player"
+        assert m.current_page() is None
+
+    def test_failed_steps_are_not_timed(self):
+        m = Metrics()
+        with pytest.raises(ValueError):
+            with m.timer("parse", page="season"):
+                raise ValueError
+
+        assert m.stats()["parse"] == {}
+
+    def test_hooks(self):
+        m = Metrics()
+        received = []
+        m.add_hook(lambda event, fields: received.append((event, fields["page"])))
+
+        @m.add_hook
+        def failing(event, fields):
+            raise RuntimeError("exporter is down")
+
+        with pytest.warns(UserWarning, match="exporter is down"):
+            m.record("parse", page="season", seconds=0.1)
+        m.remove_hook(failing)
+        m.enabled = False
+        m.record("parse", page="games", seconds=0.1)
+
+        assert received == [("parse", "season")]
+
+
+class TestInstrumentation:
+    def test_requests_are_recorded(self, afltables, events):
+        url = "https://afltables.com/afl/seas/2019.html"
+        session.get(url)
+        session.get(url)
+
+        requests = [fields for event, fields in events if event == "request"]
+        assert [fields["outcome"] for fields in requests] == ["miss", "hit"]
+        assert requests[0]["url"] == url
+        assert requests[0]["status"] == 200
+        assert requests[0]["bytes"] == requests[1]["bytes"] > 0
+        assert [fields["url"] for event, fields in events if event == "rewrite"] == [url]
+
+    def test_errors_are_recorded(self, afltables, events):
+        session.get("https://afltables.com/afl/seas/1800.html")
+
+        assert [(fields["outcome"], fields["status"]) for event, fields in events if event == "request"] == [
+            ("error", 404)
+        ]
+
+    def test_parse_and_frames_are_recorded_by_page_type(self, events):
+        page = SeasonStatsPage(2019, stats_page(year=2019).decode())
+        page.all_teams()
+        Player("Stuart Magee", url="https://afltables.com/afl/stats/players/S/Stuart_Magee.html")._parse_player_stats(
+            PLAYER_PAGE.decode()
+        ).season_stats_total
+
+        parses = [(fields["page"], fields["bytes"]) for event, fields in events if event == "parse"]
+        frames = [fields["page"] for event, fields in events if event == "frame"]
+        assert parses == [("season_stats", len(stats_page(year=2019).decode())), ("player", len(PLAYER_PAGE.decode()))]
+        assert frames == ["season_stats"] * len(page.team_names) + ["player"]
+
+    def test_events_of_worker_processes_are_recorded(self, events):
+        with ParseExecutor(2) as executor:
+            executor.submit(parse_player_page, PLAYER_PAGE.decode()).result()
+
+        assert [fields["page"] for event, fields in events if event == "parse"] == ["player"]
+        assert {fields["page"] for event, fields in events if event == "frame"} == {"player"}
+
+    def test_session_stats(self, afltables):
+        session.stats(reset=True)
+        session.get("https://afltables.com/afl/seas/2019.html")
+
+        stats = session.stats()
+        assert stats["requests"]["miss"] == 1
+        assert stats["cache"]["misses"] == 1
+        assert stats["parse_cache"]["entries"] >= 0
+
+    def test_profile(self, afltables):
+        with metrics.profile() as profile:
+            Season(2019).get_season_stats()
+
+        stats = profile.stats()
+        assert stats["requests"]["count"] == 1
+        assert stats["parse"]["season"]["count"] == 1
+        assert profile.seconds >= stats["parse"]["season"]["seconds"]
+        assert "1 season pages" in profile.report()
+
+    def test_profile_hook_is_removed(self):
+        hooks = list(metrics._hooks)
+        for _ in range(3):
+            with metrics.profile() as profile:
+                metrics.record("parse", page="season", seconds=0.1)
+        metrics.record("parse", page="season", seconds=0.1)
+
+        assert metrics._hooks == hooks
+        assert len(profile.events) == 1
@@ -0,0 +1,177 @@
+from io import StringIO
+
+import lxml.html
+import numpy as np
+import pandas as pd
+import pytest
+from bs4 import BeautifulSoup
+from pandas.errors import EmptyDataError
+
+from pyAFL import config
+from pyAFL.base.parsing import PARSERS, find_all, find_tables, find_text, parse_html, read_tables, table_to_frame
+from pyAFL.players.index import PlayerIndex
+from pyAFL.players.models import parse_player_page
+from pyAFL.players.tests.test_index import INDEX_PAGES
+from pyAFL.seasons.models import parse_season_page
+from pyAFL.session.rewriters import soup_rewriter
+from pyAFL.teams.models import SeasonStatsPage, Team, parse_games_page
+from pyAFL.testing.fixtures import GAMES_PAGE, PLAYER_PAGE, STATS_PAGE, season_page
+
+TABLES = [
+    # <thead>, <tbody> and <tfoot>, with thousands separators
+    """<table><thead><tr><th>Year</th><th>KI</th></tr></thead>
+    <tbody><tr><td>2001</td><td>1,234</td></tr><tr><td>2002</td><td>99</td></tr></tbody>
+    <tfoot><tr><td>Totals</td><td>1,333</td></tr></tfoot></table>""",
+    # No <thead>: leading rows of <th> cells become a MultiIndex header
+    """<table><tr><th colspan="2">Richmond - 2019</th></tr><tr><th>Rd</th><th>Opponent</th></tr>
+    <tr><td>R1</td><td>Carlton</td></tr><tr><td>R2</td><td>Collingwood</td></tr></table>""",
+    # rowspan, ragged rows, <br> and runs of whitespace inside cells
+    """<table><tr><th>A</th><th>B</th><th>C</th></tr>
+    <tr><td rowspan="2">x</td><td>one<br>two</td><td>  lots   of
+    space </td></tr><tr><td>y</td></tr></table>""",
+    # No header at all
+    """<table><tr><td>1</td><td>2</td></tr><tr><td>3</td><td>4</td></tr></table>""",
+]
+
+
+class TestTableToFrame:
+    @pytest.mark.parametrize("html", TABLES)
+    def test_matches_read_html(self, html):
+        table = BeautifulSoup(html, "html.parser").table
+
+        pd.testing.assert_frame_equal(table_to_frame(table), pd.read_html(StringIO(html))[0])
+
+    def test_empty_table_raises(self):
+        table = BeautifulSoup("<table><tr></tr></table>", "html.parser").table
+
+        with pytest.raises(EmptyDataError):
+            table_to_frame(table)
+
+
+class TestReadTables:
+    def test_matches_read_html(self):
+        soup = BeautifulSoup(PLAYER_PAGE, "html.parser")
+        expected = pd.read_html(StringIO(PLAYER_PAGE.decode()))
+
+        dfs = read_tables(soup)
+
+        assert len(dfs) == len(expected) == 4
+        for df, expected_df in zip(dfs, expected):
+            pd.testing.assert_frame_equal(df, expected_df)
+
+    def test_match(self):
+        soup = BeautifulSoup(PLAYER_PAGE, "html.parser")
+        expected = pd.read_html(StringIO(PLAYER_PAGE.decode()), match=r"[A-Za-z]* - [0-9]{4}")
+
+        dfs = read_tables(soup, match=r"[A-Za-z]* - [0-9]{4}")
+
+        assert len(find_tables(soup, match=r"[A-Za-z]* - [0-9]{4}")) == len(expected) == 2
+        for df, expected_df in zip(dfs, expected):
+            pd.testing.assert_frame_equal(df, expected_df)
+
+
+class TestLxmlTrees:
+    @pytest.mark.parametrize("html", TABLES)
+    def test_table_to_frame_matches_read_html(self, html):
+        table = lxml.html.fragment_fromstring(html)
+
+        pd.testing.assert_frame_equal(table_to_frame(table), pd.read_html(StringIO(html))[0])
+
+    def test_read_tables_matches_read_html(self):
+        document = lxml.html.document_fromstring(PLAYER_PAGE)
+
+        for df, expected_df in zip(read_tables(document), pd.read_html(StringIO(PLAYER_PAGE.decode()))):
+            pd.testing.assert_frame_equal(df, expected_df)
+        assert len(find_tables(document, match=r"[A-Za-z]* - [0-9]{4}")) == 2
+
+
+@pytest.fixture(params=PARSERS)
+def parser(request, monkeypatch):
+    if request.param == "html5lib":
+        pytest.importorskip("html5lib")
+    monkeypatch.setattr(config, "HTML_PARSER", request.param)
+    return request.param
+
+
+def _assert_payloads_equal(payload, expected):
+    assert payload.keys() == expected.keys()
+    for key, value in payload.items():
+        if isinstance(value, pd.DataFrame):
+            pd.testing.assert_frame_equal(value, expected[key])
+        elif isinstance(value, list) and value and isinstance(value[0], pd.DataFrame):
+            for df, expected_df in zip(value, expected[key]):
+                pd.testing.assert_frame_equal(df, expected_df)
+        elif isinstance(value, list) and value and isinstance(value[0], tuple):
+            assert value == expected[key]  # Text rows of tables
+        elif isinstance(value, dict):
+            _assert_payloads_equal(value, expected[key])
+        else:
+            np.testing.assert_array_equal(np.asarray(value), np.asarray(expected[key]))
+
+
+class TestParserBackends:
+    """Every parser backend gives the same results as BeautifulSoup's html.parser."""
+
+    def test_parse_html(self, parser):
+        document = parse_html(PLAYER_PAGE)
+
+        assert (parser == "lxml") == isinstance(document, lxml.html.HtmlElement)
+        assert len(find_all(document, "table")) == len(find_all(BeautifulSoup(PLAYER_PAGE, "html.parser"), "table"))
+        assert find_text(document, r"[A-Za-z]* - [0-9]{4}").strip() == "St Kilda - 1962"
+        assert len(find_all(parse_html(""), "table")) == 0
+
+    def test_unknown_parser(self):
+        with pytest.raises(ValueError):
+            parse_html(PLAYER_PAGE, "regex")
+
+    def test_player_page(self, parser):
+        html = PLAYER_PAGE.decode()
+        _assert_payloads_equal(parse_player_page(html), parse_player_page(html, "html.parser"))
+
+    def test_rewritten_player_page(self, parser):
+        page = soup_rewriter("https://afltables.com/afl/stats/players/S/Stuart_Magee.html", PLAYER_PAGE).decode()
+
+        _assert_payloads_equal(parse_player_page(page), parse_player_page(PLAYER_PAGE.decode(), "html.parser"))
+
+    def test_games_page(self, parser):
+        pd.testing.assert_frame_equal(parse_games_page(GAMES_PAGE), parse_games_page(GAMES_PAGE, "html.parser"))
+
+    def test_season_page(self, parser):
+        page = season_page().decode()
+
+        _assert_payloads_equal(parse_season_page(page, 2017), parse_season_page(page, 2017, "html.parser"))
+
+    def test_season_stats_page(self, parser):
+        page = SeasonStatsPage(2019, STATS_PAGE)
+
+        assert page.team_names == ["Adelaide", "Port Adelaide"]
+        expected = _html_parser(lambda: SeasonStatsPage(2019, STATS_PAGE).all_teams())
+        pd.testing.assert_frame_equal(page.all_teams(), expected)
+
+    def test_index_page(self, parser):
+        html = INDEX_PAGES["B"]
+
+        assert PlayerIndex()._parse_index_page(html) == _html_parser(lambda: PlayerIndex()._parse_index_page(html))
+
+    def test_team_players(self, parser):
+        html = (
+            "<table><thead><tr><th>Player</th></tr></thead><tbody>"
+            "<tr><td><a href='https://afltables.com/afl/stats/players/R/Rory_Sloane.html'>Sloane, Rory</a></td></tr>"
+            "<tr><td><a href='https://afltables.com/afl/stats/players/B/Brad_Crouch.html'>Crouch, Brad</a></td></tr>"
+            "</tbody></table>"
+        )
+        team = Team("Adelaide", "adelaide")
+
+        assert team._parse_players(html) == _html_parser(lambda: team._parse_players(html))
+        sloane = ("Sloane, Rory", "https://afltables.com/afl/stats/players/R/Rory_Sloane.html")
+        assert team._parse_players(html)[0] == sloane
+
+
+def _html_parser(fn):
+    # Returns fn() computed with html.parser
+    parser = config.HTML_PARSER
+    config.HTML_PARSER = "html.parser"
+    try:
+        return fn()
+    finally:
+        config.HTML_PARSER = parser
@@ -0,0 +1,159 @@
+import asyncio
+from datetime import timedelta
+
+import pandas as pd
+
+from pyAFL.base.metrics import metrics
+from pyAFL.base.store import EntityStore
+from pyAFL.players.models import Player, PlayerStats
+from pyAFL.seasons.models import MatchTable, Season
+from pyAFL.session.aio import async_session
+from pyAFL.teams.models import Team
+from pyAFL.teams.tests.test_models import _response
+from pyAFL.testing.fixtures import GAMES_PAGE, season_page
+
+
+class TestEntityStore:
+    def test_put_and_get(self, tmp_path):
+        store = EntityStore(str(tmp_path / "store.sqlite"))
+        store.put("player", "url", {"a": 1}, name="Stuart Magee", team="Richmond", info={"born": "13-Oct-1943"})
+
+        assert store.get("player", "url") == {"a": 1}
+        assert store.get("player", "other url") is None
+        assert store.get("team_games", "url") is None
+        assert store.query("SELECT name, team, info FROM entities").iloc[0].tolist() == [
+            "Stuart Magee", "Richmond", '{"born": "13-Oct-1943"}'
+        ]
+
+    def test_expired_entities_are_ignored(self, tmp_path):
+        store = EntityStore(str(tmp_path / "store.sqlite"), expire_after=timedelta(seconds=-1))
+        store.put("player", "url", {"a": 1})
+
+        assert store.get("player", "url") is None
+
+    def test_entities_of_other_parser_versions_are_ignored(self, tmp_path):
+        store = EntityStore(str(tmp_path / "store.sqlite"))
+        store.put("player", "url", {"a": 1}, parser_version=1)
+
+        assert store.get("player", "url", parser_version=1) == {"a": 1}
+        assert store.get("player", "url", parser_version=2) is None
+
+    def test_disabled_store(self):
+        store = EntityStore(None)
+        store.put("player", "url", {"a": 1})
+
+        assert not store.enabled
+        assert store.get("player", "url") is None
+
+    def test_store_is_rebuilt_for_new_version(self, tmp_path, monkeypatch):
+        from pyAFL.base import store as store_module
+
+        EntityStore(str(tmp_path / "store.sqlite")).put("player", "url", {"a": 1})
+        monkeypatch.setattr(store_module, "STORE_VERSION", store_module.STORE_VERSION + 1)
+
+        assert EntityStore(str(tmp_path / "store.sqlite")).get("player", "url") is None
+
+
+class TestStoredModels:
+    def test_player_stats_are_read_from_store(self, stand_in):
+        base_url, handler = stand_in
+        url = base_url + "/afl/stats/players/S/Stuart_Magee.html"
+        stats = Player("Stuart Magee", url=url).get_player_stats()
+
+        handler.pages.pop("/afl/stats/players/S/Stuart_Magee.html")  # the page (and cache) are not needed again
+        player = Player("Stuart Magee", url=url)
+        stored = player.get_player_stats()
+
+        assert isinstance(stored, PlayerStats)
+        assert handler.hits["/afl/stats/players/S/Stuart_Magee.html"] == 1
+        assert player.metadata["born"] == "13-Oct-1943"
+        pd.testing.assert_frame_equal(stored.season_stats_total, stats.season_stats_total)
+        pd.testing.assert_frame_equal(stored.season_stats_average, stats.season_stats_average)
+        assert stored.season_results.years == stats.season_results.years
+        pd.testing.assert_frame_equal(stored.season_results[1962], stats.season_results[1962])
+
+    def test_unread_player_sections_are_not_converted_to_save(self, stand_in):
+        base_url, handler = stand_in
+        url = base_url + "/afl/stats/players/S/Stuart_Magee.html"
+        with metrics.profile() as profile:
+            Player("Stuart Magee", url=url).get_player_stats()
+        assert profile.stats()["frames"] == {}
+
+        with metrics.profile() as profile:
+            stored = Player("Stuart Magee", url=url).get_player_stats()
+            stored.season_results[1962]
+        assert profile.stats()["frames"]["player"]["count"] == 1
+        assert list(stored.season_stats_total.Year) == ["1962", "1963", "Totals"]
+
+    def test_force_live_skips_store(self, stand_in, entity_store):
+        base_url, handler = stand_in
+        player = Player("Stuart Magee", url=base_url + "/afl/stats/players/S/Stuart_Magee.html")
+        player.get_player_stats()
+        player.get_player_stats(force_live=True)
+
+        assert handler.hits["/afl/stats/players/S/Stuart_Magee.html"] == 2
+        assert len(entity_store.query("SELECT * FROM entities WHERE kind = 'player'")) == 1
+
+    def test_async_player_stats_are_read_from_store(self, stand_in):
+        base_url, handler = stand_in
+        url = base_url + "/afl/stats/players/S/Stuart_Magee.html"
+        Player("Stuart Magee", url=url).get_player_stats()
+
+        async def main():
+            try:
+                return await Player("Stuart Magee", url=url).get_player_stats_async()
+            finally:
+                await async_session.close()
+
+        stats = asyncio.run(main())
+
+        assert handler.hits["/afl/stats/players/S/Stuart_Magee.html"] == 1
+        assert list(stats.season_stats_total.Year) == ["1962", "1963", "Totals"]
+
+    def test_season_is_read_from_store(self, stand_in, entity_store):
+        base_url, handler = stand_in
+        handler.pages["/afl/seas/2017.html"] = season_page()
+        url = base_url + "/afl/seas/2017.html"
+        stats = Season(2017, url=url).get_season_stats()
+        stored = Season(2017, url=url).get_season_stats()
+
+        assert handler.hits["/afl/seas/2017.html"] == 1
+        assert isinstance(stored.season_matches, MatchTable)
+        pd.testing.assert_frame_equal(stored.season_matches.to_frame(), stats.season_matches.to_frame())
+        pd.testing.assert_frame_equal(stored.match_summary, stats.match_summary)
+        pd.testing.assert_frame_equal(stored.final_ladder, stats.final_ladder)
+        assert len(stored.season_ladders) == len(stats.season_ladders)
+
+        matches = entity_store.matches(year=2017)
+        assert len(matches) == len(stats.season_matches)
+        assert matches.date.is_monotonic_increasing
+
+        team = stats.season_matches.home_team[0]
+        by_team = entity_store.matches(team=team)
+        assert len(by_team) == len(stats.season_matches.by_team(team))
+        assert ((by_team.home_team == team) | (by_team.away_team == team)).all()
+
+        first_date = stats.season_matches.date.min()
+        first_day = entity_store.matches(start=str(first_date)[:10], end=str(first_date)[:10])
+        first_day_matches = stats.season_matches.date.astype("datetime64[D]") == first_date.astype("datetime64[D]")
+        assert len(first_day) == first_day_matches.sum()
+
+    def test_team_games_are_read_from_store(self, monkeypatch, entity_store):
+        pages = []
+        team = Team("Adelaide", "adelaide")
+
+        def get(url, *args, **kwargs):
+            pages.append(url)
+            return _response(GAMES_PAGE)
+
+        monkeypatch.setattr("pyAFL.teams.models.session.get", get)
+        games = team.games
+        stored = Team("Adelaide", "adelaide").games
+
+        assert pages == [team.all_time_games_url]
+        pd.testing.assert_frame_equal(stored, games)
+
+        saved = entity_store.games(team="Adelaide")
+        assert len(saved) == len(games)
+        assert sorted(saved.score_for) == sorted(games.For)
+        assert len(entity_store.games(team="Adelaide", start="2100-01-01")) == 0
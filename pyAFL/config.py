@@ -1 +1,28 @@
-AFLTABLES_STATS_BASE_URL = "https://afltables.com/afl/"
\ No newline at end of file
+AFLTABLES_STATS_BASE_URL = "https://afltables.com/afl/"
+# Backend used to parse every afltables page (see `pyAFL.base.parsing.parse_html`): "lxml" (default, the
+# fastest: pages are parsed into lxml trees and read with XPath), or the BeautifulSoup backends
+# "html.parser" and "html5lib"
+HTML_PARSER = "lxml"
+# Directory of the request cache, the local store, the player index and the exported datasets. None (the
+# default) uses the `PYAFL_CACHE_DIR` environment variable if set, and otherwise the user cache directory.
+# Set it before the first request (eg to a writable temporary directory on a read-only home).
+CACHE_DIR = None
+
+
+def cache_path(name: str) -> str:
+    """
+    Returns the path of the file `name` in the cache directory (`CACHE_DIR`), where the request cache, the
+    local store and the player index are kept. By default this is the user cache directory (the same path as
+    `requests_cache.backends.sqlite.get_cache_path(name, use_cache_dir=True)`, without importing
+    requests_cache). The directory is created if needed.
+    """
+    import os
+
+    directory = CACHE_DIR or os.environ.get("PYAFL_CACHE_DIR")
+    if not directory:
+        from appdirs import user_cache_dir
+
+        directory = user_cache_dir()
+    directory = os.path.expanduser(directory)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.abspath(os.path.join(directory, name))
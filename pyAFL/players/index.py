@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import string
+import threading
+from collections import namedtuple
+
+from pyAFL import config
+from pyAFL.base.lazy import LazyObject, lazy_import
+from pyAFL.base.metrics import metrics
+from pyAFL.base.parsing import find_all, find_parent, get_attribute, get_text, parse_html
+from pyAFL.session import session
+
+fuzz = lazy_import("fuzzywuzzy.fuzz")
+np = lazy_import("numpy")
+
+# Bump whenever the saved index format (or `_parse_index_page`) changes, so old index files are rebuilt
+INDEX_VERSION = 1
+
+# Matches the href of a link to a player page
+PLAYER_HREF_RE = re.compile(r"players/[A-Za-z]/[^/]+\.html$")
+
+PlayerIndexEntry = namedtuple("PlayerIndexEntry", ["name", "url", "info"])
+PlayerIndexEntry.__doc__ = """
+A player listed on an afltables `players{initial}_idx.html` page.
+
+Attributes
+----------
+name : str
+    player name in format "[first] [last]"
+url : str
+    url to the player's information page
+info : str
+    text of the player's row on the index page, used to tell apart players with the same name
+"""
+
+
+def normalise_name(name: str) -> str:
+    """
+    Normalises a player name for index lookups.
+     - "Brown, Nathan" (index page format) becomes "nathan brown"
+     - "Nathan_Brown0" (url format) becomes "nathan brown"
+     - Case, punctuation (eg apostrophes) and repeated whitespace are ignored
+    """
+    if "," in name:
+        last, first = name.split(",", 1)
+        name = f"{first} {last}"
+    name = re.sub(r"\d+$", "", name.replace("_", " ").strip())
+    name = re.sub(r"[^a-z\- ]", "", name.lower())
+
+    return " ".join(name.split())
+
+
+def _trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerIndex(object):
+    """
+    A persistent index of every player listed on the afltables `players{A-Z}_idx.html` pages.
+
+    Each index page is downloaded and parsed once, the first time a name with that surname initial is
+    looked up, and the result is saved to `path` so that later processes do not parse the page again.
+    Normalised names map straight to their index entries, and a trigram index over the names supports
+    fast fuzzy search.
+
+    Attributes
+    ----------
+    path : str
+        json file the index is saved to (not saved if None)
+    base_url : str
+        afltables base url the index pages are fetched from
+
+    Methods
+    -------
+    lookup(name, team=None)
+        returns a list of PlayerIndexEntry for the players with this name
+    search(query, limit=10)
+        returns a list of (PlayerIndexEntry, score) tuples for the names closest to `query`
+    build()
+        loads every index page, eg before resolving many names
+    """
+
+    def __init__(self, path: str = None, base_url: str = config.AFLTABLES_STATS_BASE_URL):
+        self.path = path
+        self.base_url = base_url
+        self._pages = {}  # index page initial -> list of PlayerIndexEntry, in page order
+        self._names = {}  # normalised name -> list of PlayerIndexEntry, in page order
+        self._fetched = set()  # index page initials parsed by this process (rather than loaded from `path`)
+        self._search_index = None
+        self._lock = threading.RLock()
+        self._load()
+
+    def __repr__(self):
+        return f"<PlayerIndex: {len(self)} players>"
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._pages.values())
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            return
+
+        for letter, entries in data["pages"].items():
+            self._add_page(letter, [PlayerIndexEntry(*entry) for entry in entries])
+
+    def save(self):
+        """Saves the index to `self.path`."""
+        if not self.path:
+            return
+        with self._lock:
+            data = {"version": INDEX_VERSION, "pages": self._pages}
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+    def _add_page(self, letter: str, entries: list):
+        with self._lock:
+            for entry in self._pages.pop(letter, []):
+                self._names[normalise_name(entry.name)].remove(entry)
+            self._names = {key: page_entries for key, page_entries in self._names.items() if page_entries}
+
+            self._pages[letter] = entries
+            for entry in entries:
+                self._names.setdefault(normalise_name(entry.name), []).append(entry)
+            self._search_index = None
+
+    @metrics.timed("parse", page="player_index")
+    def _parse_index_page(self, html: str) -> list:
+        document = parse_html(html)
+
+        entries = []
+        for anchor in find_all(document, "a"):
+            href = get_attribute(anchor, "href")
+            if not href or not PLAYER_HREF_RE.search(href):
+                continue
+            name = normalise_name(href.rsplit("/", 1)[1][:-len(".html")]).title()
+            row = find_parent(anchor, "tr")
+            info = " ".join(get_text(row, " ").split()) if row is not None else get_text(anchor).strip()
+            entries.append(PlayerIndexEntry(name, href, info))
+
+        return entries
+
+    def _fetch_pages(self, letters, force: bool = False):
+        with self._lock:
+            urls = {
+                self.base_url + f"stats/players{letter}_idx.html": letter
+                for letter in letters
+                if force or letter not in self._pages
+            }
+            if not urls:
+                return
+
+            for resp in session.get_many(urls):
+                letter = re.search(r"players([A-Z])_idx\.html", resp.url).group(1)
+                self._add_page(letter, self._parse_index_page(resp.text))
+                self._fetched.add(letter)
+            self.save()
+
+    def build(self):
+        """Loads every players{A-Z}_idx.html page which is not in the index yet."""
+        self._fetch_pages(string.ascii_uppercase)
+
+        return self
+
+    def lookup(self, name: str, team: str = None) -> list:
+        """
+        Returns the index entries for the players with this name, in index page order.
+         - If the name is not found in a saved index, its index page is parsed again (eg for new players).
+         - If `team` is given, players whose index row mentions the team are returned first.
+
+        Parameters
+        ----------
+            name : str (required)
+                name of the person in format "[first] [last]"
+            team : str (optional)
+                name of team that the player has played in during their career
+
+        Returns
+        ----------
+            entries : list
+                list of PlayerIndexEntry (empty if no player has this name)
+        """
+        words = name.split()
+        letter = words[min(1, len(words) - 1)][0].upper()
+        key = normalise_name(name)
+
+        self._fetch_pages([letter])
+        if key not in self._names and letter not in self._fetched:
+            self._fetch_pages([letter], force=True)
+
+        entries = self._names.get(key, [])
+        if team:
+            entries = sorted(entries, key=lambda entry: team.lower() not in entry.info.lower())
+
+        return list(entries)
+
+    def _get_search_index(self):
+        with self._lock:
+            if self._search_index is None:
+                keys = list(self._names)
+                postings = {}
+                for i, key in enumerate(keys):
+                    for gram in _trigrams(key):
+                        postings.setdefault(gram, []).append(i)
+                postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+                gram_counts = np.array([len(_trigrams(key)) for key in keys], dtype=np.int32)
+                self._search_index = (keys, postings, gram_counts)
+
+            return self._search_index
+
+    def search(self, query: str, limit: int = 10, candidates: int = 10) -> list:
+        """
+        Returns the players whose names are closest to `query`.
+         - Candidate names are found through the trigram index, so names sharing no trigram with the
+         query are never looked at. They are ranked by trigram (Dice) similarity.
+         - The best `candidates` (at least `limit`) are then scored with fuzzywuzzy's `token_sort_ratio`,
+         which is by far the most expensive step.
+         - Every index page is loaded first (see `build`).
+
+        Parameters
+        ----------
+            query : str (required)
+                (partial or misspelt) player name
+            limit : int
+                maximum number of results
+            candidates : int
+                number of trigram matches which are scored with fuzzywuzzy
+
+        Returns
+        ----------
+            results : list
+                list of (PlayerIndexEntry, score) tuples, best match first. Scores are between 0 and 100.
+        """
+        self.build()
+        keys, postings, gram_counts = self._get_search_index()
+
+        query_key = normalise_name(query)
+        query_grams = _trigrams(query_key)
+        matched = [postings[gram] for gram in query_grams if gram in postings]
+        if not matched:
+            return []
+
+        candidates = max(candidates, limit)
+        ids, shared = np.unique(np.concatenate(matched), return_counts=True)
+        if len(ids) > candidates:
+            similarity = 2 * shared / (gram_counts[ids] + len(query_grams))
+            ids = ids[np.argpartition(-similarity, candidates)[:candidates]]
+
+        scored = sorted(((fuzz.token_sort_ratio(query_key, keys[i]), keys[i]) for i in ids), reverse=True)
+
+        return [(entry, score) for score, key in scored for entry in self._names[key]][:limit]
+
+
+# Shared index of the models, created (and read from disk) when first used
+player_index = LazyObject(lambda: PlayerIndex(config.cache_path("pyAFL_player_index.json")))
@@ -1,15 +1,35 @@
+import functools
 import re
 
-import pandas as pd
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
 
 from pyAFL import config
 from pyAFL.base.exceptions import LookupError
+from pyAFL.base.executor import fetch_and_parse
+from pyAFL.base.lazy import lazy_import
+from pyAFL.base.metrics import metrics
+from pyAFL.base.models import AFLObject
+from pyAFL.base.parsing import (
+    find_all,
+    find_tables,
+    find_text,
+    get_text,
+    parse_html,
+    rows_to_frame,
+    table_rows,
+    table_to_frame,
+    tail_text,
+)
+from pyAFL.players.index import player_index
 from pyAFL.session import session
 
+pd = lazy_import("pandas")
 
-class Player(object):
+# Matches the title of a per-season results table, eg "Richmond - 2019"
+SEASON_TABLE_RE = re.compile(r"[A-Za-z]* - ([0-9]{4})")
+
+
+class Player(AFLObject):
     """
     A class to represent an AFL player.
 
@@ -31,6 +51,7 @@ class Player(object):
     def __init__(self, name: str, url: str = None, team: str = None):
         """
         Constructs all the necessary attributes for the Player object.
+         - The player url is found in the persistent `pyAFL.players.index.player_index`.
          - If `name` returns two or more players, the (optional) parameter
          "team" is used to select the correct player.
          - If no player can be found for the given "name", "team"
@@ -46,6 +67,7 @@ class Player(object):
 
         self.name = name.title()  # Convert to title case for URL string matching
         self.name = self.name.replace("\n", "").strip()
+        self.team = team
         self.metadata = {}
         if url:
             self.url = url
@@ -55,80 +77,91 @@ class Player(object):
     def __repr__(self):
         return f"<Player: {self.name}>"
 
+    @classmethod
+    def search(cls, query: str, limit: int = 10):
+        """
+        Returns the players whose names are closest to `query` (see `pyAFL.players.index.PlayerIndex.search`).
+
+        Parameters
+        ----------
+            query : str (required)
+                (partial or misspelt) player name
+            limit : int
+                maximum number of players returned
+
+        Returns
+        ----------
+            players : list
+                list of pyAFL.Player objects, best match first
+        """
+        return [cls(entry.name, url=entry.url) for entry, _ in player_index.search(query, limit=limit)]
+
     def __str__(self):
         return self.name
 
     def _get_player_url(self):
-        last_initial = self.name.split(" ")[1][0]
-        player_list_url = (
-            config.AFLTABLES_STATS_BASE_URL + f"stats/players{last_initial}_idx.html"
-        )
-
-        resp = session.get(player_list_url)
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        url_list = soup.findAll(
-            "a",
-            href=re.compile(
-                f"players/{self.name[0]}/{self.name.replace(' ', '_')}", re.I
-            ),
-        )
+        matches = player_index.lookup(self.name, team=self.team)
 
         # If no matches found, raise LookupError
-        if len(url_list) == 0:
+        if len(matches) == 0:
             raise LookupError(
                 f"Found no players with name {self.name}. Browse https://afltables.com/afl/stats/playersA_idx.html for a list of all players. Name must be in format '[first] [last]'."
             )
 
         # If more than one name is matched, print warning message and return first.
-        if len(url_list) > 1:
+        if len(matches) > 1:
             print(
-                f"Warning: {len(url_list)} players have been found for name: {self.name}. Returning only the first"
+                f"Warning: {len(matches)} players have been found for name: {self.name}. Returning only the first"
             )
 
-        return url_list[0].attrs.get("href")
-    
-    def _get_bio_info(self, b_tags):
-        for bio in b_tags:
-
-            if re.sub(r"[\n\t\s]*", "", bio.get_text())=="Born:":
-                date_born = re.sub(r"[\n\t\s]*", "", bio.next_sibling.replace(" (",""))
-                if not date_born: self.metadata["born"] = None; continue
-
-                timestamp = datetime.strptime(date_born, '%d-%b-%Y').strftime('%d-%b-%Y')
-                self.metadata["born"] = timestamp
+        return matches[0].url
 
-            if re.sub(r"[\n\t\s]*", "", bio.get_text())=="Debut:":
-                debut = bio.next_sibling.strip() # Ex:18y 218d
-                if not debut or self.metadata["born"] == None: self.metadata["debut"] = None; continue
-
-                debut = debut.split(" ")
-                timestamp = (datetime.strptime(self.metadata["born"], '%d-%b-%Y') + timedelta(int(debut[0][:-1]) * 365 + int(debut[1][:-1]))).strftime('%d-%b-%Y')
-                self.metadata["debut"] = timestamp
+    def _get_bio_info(self, b_tags):
+        _get_bio_info(b_tags, self.metadata)
 
-            if re.sub(r"[\n\t\s]*", "", bio.get_text())=="Last:":
-                last = bio.next_sibling.replace(")","").strip()
-                if not last or self.metadata["born"] == None: self.metadata["last"] = None; continue
+    def get_player_stats(self, keep_html: bool = True, force_live: bool = False):
+        """
+        Returns player stats as per the player stats page defined in `self._get_player_url()`
+         - Stats saved in the local store (`pyAFL.base.store.store`) are returned without fetching the page,
+         until the page expires (see `pyAFL.session.freshness`). They are then returned without parsing the
+         page again if it has not changed.
+         - Otherwise the page is parsed, and every stats table is saved to the store.
 
-                last = last.split(" ")
-                timestamp = (datetime.strptime(self.metadata["born"], '%d-%b-%Y') + timedelta(int(last[0][:-1]) * 365 + int(last[1][:-1]))).strftime('%d-%b-%Y')
-                self.metadata["last"] = timestamp
+        Parameters
+        ----------
+            keep_html : bool
+                If True (default), the raw page html is kept on `self._stat_html`.
+                Set to False when loading many players to save memory.
+            force_live : bool
+                If True, does not use the local store or the cached request
 
-            if re.sub(r"[\n\t\s]*", "", bio.get_text())=="Height:":
-                height = re.sub("[^0-9]", "",bio.next_sibling)
-                if not height: self.metadata["height"] = None; continue
+        Returns
+        ----------
+            stats : obj
+                player stats Python object
 
-                self.metadata["height"] = height
+        """
+        if not force_live:
+            stats = self._get_stored_player_stats()
+            if stats is not None:
+                return stats
 
-            if re.sub(r"[\n\t\s]*", "", bio.get_text())=="Weight:":
-                weight = re.sub("[^0-9]", "",bio.next_sibling)
-                if not weight: self.metadata["weight"] = None; continue
+        resp = session.get(self.url, force_live)
 
-                self.metadata["weight"] = weight
+        return self._get_player_stats_from_page(resp, keep_html, force_live)
 
-    def get_player_stats(self):
+    async def get_player_stats_async(self, keep_html: bool = True, force_live: bool = False):
         """
-        Returns player stats as per the player stats page defined in `self._get_player_url()`
+        Awaitable version of `get_player_stats`.
+         - The page is fetched with `pyAFL.session.aio.async_session`, which shares the request cache.
+         - The page is parsed (and the local store is read and written) in the event loop's default executor.
+
+        Parameters
+        ----------
+            keep_html : bool
+                If True (default), the raw page html is kept on `self._stat_html`
+            force_live : bool
+                If True, does not use the local store or the cached request
 
         Returns
         ----------
@@ -136,51 +169,307 @@ class Player(object):
                 player stats Python object
 
         """
+        import asyncio
+
+        from pyAFL.session.aio import async_session  # Imported here so that aiohttp is only loaded when used
 
-        resp = session.get(self.url)
-        self._stat_html = resp.text
+        loop = asyncio.get_running_loop()
+        if not force_live:
+            stats = await loop.run_in_executor(None, self._get_stored_player_stats)
+            if stats is not None:
+                return stats
 
-        soup = BeautifulSoup(self._stat_html, "html.parser")
+        resp = await async_session.get(self.url, force_live)
 
-        self._get_bio_info(soup.find_all('b'))
+        return await loop.run_in_executor(None, self._get_player_stats_from_page, resp, keep_html, force_live)
 
-        all_dfs = pd.read_html(self._stat_html)
-        season_dfs = pd.read_html(self._stat_html, match=r"[A-Za-z]* - [0-9]{4}")
+    def _get_player_stats_from_page(self, resp, keep_html: bool, force_live: bool):
+        # Stats saved from the same page (eg after a 304 revalidation) are returned without parsing it again
+        stats = None if force_live else self._get_stored_player_stats(resp)
+        if stats is None:
+            stats = self._parse_player_stats(resp.text, keep_html=keep_html)
+            self._save_player_stats(stats, resp)
 
-        season_stats_total = all_dfs[0]  # The first table on the page
-        season_stats_average = all_dfs[1]  # The second table on the page
+        return stats
 
-        ret = PlayerStats(
-            season_stats_total=season_stats_total,
-            season_stats_average=season_stats_average,
-            season_results=season_dfs,
+    def _get_stored_player_stats(self, resp=None):
+        stored = self._get_object_from_db(response=resp, kind="player", key=self.url)
+        if stored is None:
+            return None
+
+        self.metadata.update(stored["metadata"])
+        return _player_stats(stored)
+
+    def _save_player_stats(self, stats, resp):
+        if not self._caching_enabled():
+            return
+
+        # Sections which have not been read yet are saved as text rows, and converted when first read
+        self._save_player_payload(_player_payload(self.metadata, stats), resp)
+
+    def _save_player_payload(self, payload: dict, resp):
+        self._save_object_to_db(
+            payload,
+            response=resp,
+            kind="player",
+            key=self.url,
+            name=self.name,
+            team=self.team,
+            info=self.metadata,
         )
 
-        return ret
+    # Bulk loading protocol (see `pyAFL.base.executor.fetch_and_parse`)
+    def _page_url(self) -> str:
+        return self.url
+
+    def _page_parser(self):
+        return functools.partial(parse_player_page, parser=config.HTML_PARSER)
+
+    def _get_stored_result(self, resp=None):
+        return self._get_stored_player_stats(resp)
+
+    def _result_from_parsed(self, resp, parsed: dict):
+        self.metadata.update(parsed["metadata"])
+        if self._caching_enabled():
+            self._save_player_payload(parsed, resp)
+        return _player_stats(parsed)
+
+    @metrics.timed("parse", page="player")
+    def _parse_player_stats(self, html: str, keep_html: bool = True):
+        # The page is parsed once; the bio and every table are read from the same tree
+        if keep_html:
+            self._stat_html = html
+        else:
+            self.__dict__.pop("_stat_html", None)
+
+        document = parse_html(html)
+
+        self._get_bio_info(find_all(document, "b"))
+
+        # The stats tables are only converted to DataFrames when first accessed
+        return PlayerStats(document=document)
 
 
 class PlayerStats(object):
     """
-    A class to represent an AFL player.
+    A class to represent the stats tables of an AFL player.
+
+    Each section is converted from the parsed player page (or from the text rows saved in the local store)
+    the first time it is accessed, and then kept.
 
     Attributes
     ----------
-    season_stats_total : object
-    season_stats_average : object
-    season_results : object
+    season_stats_total : pandas.DataFrame
+        career totals, by season (the first table on the page)
+    season_stats_average : pandas.DataFrame
+        career averages, by season (the second table on the page)
+    season_results : SeasonResults
+        per-season results tables, indexable by year (eg `stats.season_results[2019]`)
 
     Methods
     -------
     ...
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, document=None, payload: dict = None, **kwargs):
         """
         Constructs all the necessary attributes for the PlayerStats object.
-         - kwargs passed are accessed as class attributes
+         - `document` is the parsed player page the sections are read from
+         - or `payload` is the sections saved in the local store (see `_player_payload`)
+         - kwargs passed are accessed as class attributes (and replace the sections read from `document`)
 
         """
 
         super().__init__()
+        self._document = document
+        self._payload = payload
+        self._frames = {}  # id(table) -> DataFrame
         self.__dict__.update(kwargs)
-        pass
+
+    def _table_to_frame(self, table):
+        # `table` is a <table> element, its text rows (see `pyAFL.base.parsing.table_rows`) or its DataFrame
+        if id(table) not in self._frames:
+            with metrics.page("player"):
+                if isinstance(table, pd.DataFrame):
+                    frame = table
+                elif isinstance(table, tuple):
+                    frame = rows_to_frame(*table)
+                else:
+                    frame = table_to_frame(table)
+                self._frames[id(table)] = frame
+        return self._frames[id(table)]
+
+    def _saved_table(self, table):
+        # A table as saved in the local store: its DataFrame if it has been converted, otherwise its text rows
+        if id(table) in self._frames:
+            return self._frames[id(table)]
+        return table if isinstance(table, (tuple, pd.DataFrame)) else table_rows(table)
+
+    @functools.cached_property
+    def _sections(self) -> tuple:
+        # The totals table, the averages table and the (year, table) of each season results table
+        if self._payload is not None:
+            payload = self._payload
+            results = list(zip(payload["years"], payload["season_results"]))
+            return payload["season_stats_total"], payload["season_stats_average"], results
+
+        tables = find_tables(self._document)
+        results = []
+        for table in tables:
+            title = find_text(table, SEASON_TABLE_RE)
+            if title is not None:
+                results.append((int(SEASON_TABLE_RE.search(title).group(1)), table))
+
+        return tables[0], tables[1], results  # The totals and averages are the first two tables on the page
+
+    @functools.cached_property
+    def season_stats_total(self):
+        return self._table_to_frame(self._sections[0])
+
+    @functools.cached_property
+    def season_stats_average(self):
+        return self._table_to_frame(self._sections[1])
+
+    @functools.cached_property
+    def season_results(self):
+        return SeasonResults(self._sections[2], self._table_to_frame)
+
+
+class SeasonResults(object):
+    """
+    The per-season results tables of a player, in page order.
+     - Indexing by a season year (eg `season_results[2019]`) returns that season's table. If the player
+     has two tables for the season (eg played for two teams), the first is returned.
+     - Any other integer or slice indexes the tables by position, like a list.
+     - Each table is only converted to a DataFrame when first accessed.
+
+    Attributes
+    ----------
+    years : list
+        season year of each table, in page order
+    """
+
+    def __init__(self, tables: list, to_frame):
+        self._tables = [table for _, table in tables]
+        self.years = [year for year, _ in tables]
+        self._to_frame = to_frame
+
+    def __repr__(self):
+        return f"<SeasonResults: {', '.join(str(year) for year in self.years)}>"
+
+    def __len__(self):
+        return len(self._tables)
+
+    def __iter__(self):
+        return (self._to_frame(table) for table in self._tables)
+
+    def __contains__(self, year):
+        return year in self.years
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self._to_frame(table) for table in self._tables[key]]
+        if key in self.years:
+            return self._to_frame(self._tables[self.years.index(key)])
+        if isinstance(key, int) and -len(self._tables) <= key < len(self._tables):
+            return self._to_frame(self._tables[key])
+
+        raise KeyError(f"No season results for {key}. Seasons played: {', '.join(str(year) for year in self.years)}")
+
+
+def _get_bio_info(b_tags, metadata: dict):
+    for bio in b_tags:
+
+        if re.sub(r"[\n\t\s]*", "", get_text(bio))=="Born:":
+            date_born = re.sub(r"[\n\t\s]*", "", tail_text(bio).replace(" (",""))
+            if not date_born: metadata["born"] = None; continue
+
+            timestamp = datetime.strptime(date_born, '%d-%b-%Y').strftime('%d-%b-%Y')
+            metadata["born"] = timestamp
+
+        if re.sub(r"[\n\t\s]*", "", get_text(bio))=="Debut:":
+            debut = tail_text(bio).strip() # Ex:18y 218d
+            if not debut or metadata["born"] == None: metadata["debut"] = None; continue
+
+            debut = debut.split(" ")
+            timestamp = (datetime.strptime(metadata["born"], '%d-%b-%Y') + timedelta(int(debut[0][:-1]) * 365 + int(debut[1][:-1]))).strftime('%d-%b-%Y')
+            metadata["debut"] = timestamp
+
+        if re.sub(r"[\n\t\s]*", "", get_text(bio))=="Last:":
+            last = tail_text(bio).replace(")","").strip()
+            if not last or metadata["born"] == None: metadata["last"] = None; continue
+
+            last = last.split(" ")
+            timestamp = (datetime.strptime(metadata["born"], '%d-%b-%Y') + timedelta(int(last[0][:-1]) * 365 + int(last[1][:-1]))).strftime('%d-%b-%Y')
+            metadata["last"] = timestamp
+
+        if re.sub(r"[\n\t\s]*", "", get_text(bio))=="Height:":
+            height = re.sub("[^0-9]", "",tail_text(bio))
+            if not height: metadata["height"] = None; continue
+
+            metadata["height"] = height
+
+        if re.sub(r"[\n\t\s]*", "", get_text(bio))=="Weight:":
+            weight = re.sub("[^0-9]", "",tail_text(bio))
+            if not weight: metadata["weight"] = None; continue
+
+            metadata["weight"] = weight
+
+
+def _player_payload(metadata: dict, stats: "PlayerStats") -> dict:
+    # Every section of the stats, as a DataFrame if it has been read, otherwise as the text rows of its table
+    # (which are much cheaper to extract than to convert): the object saved in the local store
+    total, average, results = stats._sections
+    return {
+        "metadata": metadata,
+        "season_stats_total": stats._saved_table(total),
+        "season_stats_average": stats._saved_table(average),
+        "years": [year for year, _ in results],
+        "season_results": [stats._saved_table(table) for _, table in results],
+    }
+
+
+def _player_stats(payload: dict) -> PlayerStats:
+    return PlayerStats(payload=payload)
+
+
+@metrics.timed("parse", page="player")
+def parse_player_page(html: str, parser: str = None) -> dict:
+    """
+    Parses a player page into its bio and every stats table, as picklable objects (rather than the parse
+    tree of `Player.get_player_stats`), so that pages can be parsed in worker processes (see
+    `pyAFL.base.executor.ParseExecutor`). `parser` is the parser backend (see `pyAFL.base.parsing.parse_html`).
+     - The career totals and averages, which bulk loads read, are converted to DataFrames in the worker.
+     - The per-season results tables are returned as text rows, and only converted when read.
+    """
+    document = parse_html(html, parser)
+    metadata = {}
+    _get_bio_info(find_all(document, "b"), metadata)
+
+    stats = PlayerStats(document=document)
+    stats.season_stats_total, stats.season_stats_average  # Converted here, in the worker
+    return _player_payload(metadata, stats)
+
+
+def player_stats_many(players, max_workers: int = 8, parse_workers: int = None, force_live: bool = False) -> list:
+    """
+    Returns the stats of many players at once (see `pyAFL.base.executor.fetch_and_parse`). The pages are
+    fetched concurrently, and parsed in worker processes if `parse_workers` (or the shared
+    `parse_executor.workers`) is more than 1.
+
+    Parameters
+    ----------
+        players : iterable of Player (required)
+        max_workers : int
+            maximum number of requests in flight at once
+        parse_workers : int
+            number of worker processes parsing pages (default: `pyAFL.base.executor.parse_executor`)
+        force_live : bool
+            If True, does not use the local store or the cached requests
+
+    Returns
+    ----------
+        stats : list
+            PlayerStats of each player, in the order of `players`
+    """
+    return fetch_and_parse(players, max_workers=max_workers, parse_workers=parse_workers, force_live=force_live)
@@ -0,0 +1,150 @@
+import random
+import string
+import time
+
+import pytest
+
+from pyAFL.base.exceptions import LookupError
+from pyAFL.players import models
+from pyAFL.players.index import PlayerIndex, PlayerIndexEntry, normalise_name
+from pyAFL.players.models import Player
+from pyAFL.session import session
+
+INDEX_PAGES = {
+    "B": """<table>
+<tr><td><a href="players/N/Nathan_Brown0.html">Brown, Nathan</a></td><td>Collingwood</td></tr>
+<tr><td><a href="players/N/Nathan_Brown1.html">Brown, Nathan</a></td><td>Western Bulldogs Richmond</td></tr>
+<tr><td><a href="players/A/Aaron_Black.html">Black, Aaron</a></td><td>North Melbourne</td></tr>
+</table>""",
+    "O": """<table>
+<tr><td><a href="players/T/Tony_OBrien.html">O'Brien, Tony</a></td><td>Geelong</td></tr>
+</table>""",
+    "R": """<table>
+<tr><td><a href="players/N/Nick_Riewoldt.html">Riewoldt, Nick</a></td><td>St Kilda</td></tr>
+<tr><td><a href="players/J/Jack_Riewoldt.html">Riewoldt, Jack</a></td><td>Richmond</td></tr>
+</table>""",
+}
+
+
+@pytest.fixture
+def index_stand_in(stand_in, tmp_path):
+    base_url, handler = stand_in
+    for letter, html in INDEX_PAGES.items():
+        handler.pages[f"/afl/stats/players{letter}_idx.html"] = html.encode()
+    session.cache.clear()
+
+    return PlayerIndex(str(tmp_path / "index.json"), base_url=base_url + "/afl/"), handler
+
+
+class TestNormaliseName:
+    def test_index_page_url_and_input_formats_match(self):
+        assert normalise_name("Brown, Nathan") == "nathan brown"
+        assert normalise_name("Nathan_Brown0") == "nathan brown"
+        assert normalise_name("  nathan   BROWN ") == "nathan brown"
+        assert normalise_name("Tony O'Brien") == normalise_name("Tony_OBrien")
+
+
+class TestPlayerIndex:
+    def test_lookup_fetches_only_the_surname_index_page(self, index_stand_in):
+        index, handler = index_stand_in
+
+        entries = index.lookup("Nick Riewoldt")
+
+        assert [entry.url.rsplit("/", 1)[1] for entry in entries] == ["Nick_Riewoldt.html"]
+        assert entries[0].name == "Nick Riewoldt"
+        assert list(handler.hits) == ["/afl/stats/playersR_idx.html"]
+
+    def test_lookup_returns_duplicate_names_in_page_order(self, index_stand_in):
+        index, _ = index_stand_in
+
+        entries = index.lookup("Nathan Brown")
+
+        assert [entry.url.rsplit("/", 1)[1] for entry in entries] == ["Nathan_Brown0.html", "Nathan_Brown1.html"]
+        assert "Western Bulldogs" in entries[1].info
+
+    def test_lookup_prefers_players_from_team(self, index_stand_in):
+        index, _ = index_stand_in
+
+        entries = index.lookup("Nathan Brown", team="Richmond")
+
+        assert entries[0].url.endswith("Nathan_Brown1.html")
+
+    def test_lookup_unknown_name(self, index_stand_in):
+        index, _ = index_stand_in
+
+        assert index.lookup("Babe Ruth") == []
+
+    def test_index_is_persisted(self, index_stand_in):
+        index, handler = index_stand_in
+        index.lookup("Nick Riewoldt")
+
+        reloaded = PlayerIndex(index.path, base_url=index.base_url)
+        entries = reloaded.lookup("Jack Riewoldt")
+
+        assert entries[0].url.endswith("Jack_Riewoldt.html")
+        assert handler.hits["/afl/stats/playersR_idx.html"] == 1
+
+    def test_saved_index_page_is_refreshed_for_new_players(self, index_stand_in):
+        index, handler = index_stand_in
+        index.lookup("Nick Riewoldt")
+        session.cache.clear()
+        handler.pages["/afl/stats/playersR_idx.html"] += b'<a href="players/M/Max_Rooke.html">Rooke, Max</a>'
+
+        reloaded = PlayerIndex(index.path, base_url=index.base_url)
+
+        assert reloaded.lookup("Max Rooke")[0].url.endswith("Max_Rooke.html")
+        assert handler.hits["/afl/stats/playersR_idx.html"] == 2
+
+    def test_search_finds_misspelt_names(self, index_stand_in):
+        index, _ = index_stand_in
+
+        results = index.search("nick riewold", limit=2)
+
+        assert results[0][0].url.endswith("Nick_Riewoldt.html")
+        assert results[0][1] > results[1][1]
+
+    def test_search_is_fast_on_a_full_size_index(self):
+        random.seed(0)
+        index = PlayerIndex()
+        for letter in string.ascii_uppercase:
+            entries = []
+            for _ in range(500):
+                first = "".join(random.choice(string.ascii_lowercase) for _ in range(random.randint(3, 8))).title()
+                last = letter + "".join(random.choice(string.ascii_lowercase) for _ in range(random.randint(3, 9)))
+                entries.append(PlayerIndexEntry(f"{first} {last}", f"players/{first[0]}/{first}_{last}.html", ""))
+            index._add_page(letter, entries)
+        index.search("warm up the trigram index")
+
+        start = time.perf_counter()
+        for _ in range(100):
+            index.search("nick riewoldt")
+
+        assert len(index) == 13000
+        assert (time.perf_counter() - start) / 100 < 0.005
+
+
+class TestPlayerUsesIndex:
+    def test_player_url_comes_from_index(self, index_stand_in, monkeypatch):
+        index, _ = index_stand_in
+        monkeypatch.setattr(models, "player_index", index)
+
+        assert Player("Nathan Brown").url.endswith("Nathan_Brown0.html")
+        assert Player("Nathan Brown", team="Richmond").url.endswith("Nathan_Brown1.html")
+        assert Player("tony o'brien").url.endswith("Tony_OBrien.html")
+
+    def test_player_not_in_index_throws_exception(self, index_stand_in, monkeypatch):
+        index, _ = index_stand_in
+        monkeypatch.setattr(models, "player_index", index)
+
+        with pytest.raises(LookupError) as e:
+            Player("Babe Ruth")
+
+        assert "Found no players with name" in str(e)
+
+    def test_player_search(self, index_stand_in, monkeypatch):
+        index, _ = index_stand_in
+        monkeypatch.setattr(models, "player_index", index)
+
+        players = Player.search("Riewold", limit=2)
+
+        assert {player.name for player in players} == {"Nick Riewoldt", "Jack Riewoldt"}
@@ -1,8 +1,28 @@
+import asyncio
+from io import StringIO
+
+import pandas as pd
 import pytest
 
 from bs4 import BeautifulSoup
 from pyAFL.base.exceptions import LookupError
 from pyAFL.players.models import Player, PlayerStats
+from pyAFL.session.aio import async_session
+from pyAFL.testing.fixtures import PLAYER_PAGE, listed_index_page, player_page
+
+# Index pages listing the players looked up below, with the paths of their afltables pages
+INDEX_PAGES = {
+    "stats/playersB_idx.html": listed_index_page(
+        [("Brown, Nathan", "N/Nathan_Brown0.html"), ("Brown, Nathan", "N/Nathan_Brown1.html")]
+    ),
+    "stats/playersR_idx.html": listed_index_page(
+        [("Riewoldt, Jack", "J/Jack_Riewoldt.html"), ("Riewoldt, Nick", "N/Nick_Riewoldt.html")]
+    ),
+    "stats/playersL_idx.html": listed_index_page([("Lockett, Tony", "T/Tony_Lockett.html")]),
+    "stats/playersM_idx.html": listed_index_page(
+        [("MacGregor, Duncan", "D/Duncan_MacGregor.html"), ("Magee, Stuart", "S/Stuart_Magee.html")]
+    ),
+}
 
 
 class TestPlayerModel:
@@ -10,7 +30,9 @@ class TestPlayerModel:
         with pytest.raises(TypeError):
             Player()
 
-    def test_player_classmethod_get_player_url_success(self):
+    def test_player_classmethod_get_player_url_success(self, afltables):
+        afltables.add_pages(INDEX_PAGES)
+
         assert (
             Player("Nathan Brown")._get_player_url() ==
             "https://afltables.com/afl/stats/players/N/Nathan_Brown0.html"
@@ -28,13 +50,17 @@ class TestPlayerModel:
             "https://afltables.com/afl/stats/players/D/Duncan_MacGregor.html"
         )
 
-    def test_player_classmethod_get_player_url_failure(self):
+    def test_player_classmethod_get_player_url_failure(self, afltables):
+        afltables.add_pages(INDEX_PAGES)
+
         with pytest.raises(LookupError) as e:
             Player("Babe Ruth")._get_player_url()
 
         assert "Found no players with name" in str(e)
 
-    def test_player_classmethod_get_player_stats(self):
+    def test_player_classmethod_get_player_stats(self, afltables):
+        afltables.add_pages(INDEX_PAGES)
+        afltables.add_pages({"stats/players/N/Nick_Riewoldt.html": player_page(seasons=3)})
         player = Player("Nick Riewoldt")
 
         assert isinstance(player.get_player_stats(), PlayerStats)
@@ -50,7 +76,7 @@ class TestPlayerModel:
         # Mock an empty, or None value
         # Case: date of birth is unavailable but debut or last is/are,
         #       player.metadata['debut' and 'last'] = None
-        player = Player("Nathan Brown")
+        player = Player("Nathan Brown", url="https://afltables.com/afl/stats/players/N/Nathan_Brown0.html")
 
         html_content = """
             <html>
@@ -82,3 +108,97 @@ class TestPlayerModel:
         assert(player.metadata["height"] == None)
         assert(player.metadata["weight"] == "74")
         assert(player.metadata["last"] == None)
+
+
+class TestPlayerModelAsync:
+    def test_get_player_stats_async(self, stand_in):
+        base_url, _ = stand_in
+        player = Player("Stuart Magee", url=base_url + "/afl/stats/players/S/Stuart_Magee.html")
+
+        async def main():
+            try:
+                return await player.get_player_stats_async()
+            finally:
+                await async_session.close()
+
+        stats = asyncio.run(main())
+
+        assert isinstance(stats, PlayerStats)
+        assert list(stats.season_stats_total.Year) == ["1962", "1963", "Totals"]
+        assert len(stats.season_results) == 2
+        assert player.metadata["born"] == "13-Oct-1943"
+        assert player.metadata["debut"] == "14-May-1962"
+        assert player.metadata["last"] == "22-Aug-1975"
+
+
+class TestPlayerStatsParsing:
+    def test_parse_player_stats_matches_read_html(self):
+        player = Player("Stuart Magee", url="https://afltables.com/afl/stats/players/S/Stuart_Magee.html")
+        html = PLAYER_PAGE.decode()
+
+        stats = player._parse_player_stats(html)
+
+        all_dfs = pd.read_html(StringIO(html))
+        season_dfs = pd.read_html(StringIO(html), match=r"[A-Za-z]* - [0-9]{4}")
+        pd.testing.assert_frame_equal(stats.season_stats_total, all_dfs[0])
+        pd.testing.assert_frame_equal(stats.season_stats_average, all_dfs[1])
+        assert len(stats.season_results) == len(season_dfs)
+        for df, expected_df in zip(stats.season_results, season_dfs):
+            pd.testing.assert_frame_equal(df, expected_df)
+        assert player._stat_html == html
+
+    def test_parse_player_stats_without_html(self):
+        player = Player("Stuart Magee", url="https://afltables.com/afl/stats/players/S/Stuart_Magee.html")
+        player._stat_html = "<html></html>"
+
+        stats = player._parse_player_stats(PLAYER_PAGE.decode(), keep_html=False)
+
+        assert not hasattr(player, "_stat_html")
+        assert list(stats.season_stats_total.Year) == ["1962", "1963", "Totals"]
+        assert player.metadata["height"] == "180"
+
+
+class TestPlayerStatsSections:
+    def _stats(self):
+        player = Player("Stuart Magee", url="https://afltables.com/afl/stats/players/S/Stuart_Magee.html")
+        return player._parse_player_stats(PLAYER_PAGE.decode())
+
+    def test_sections_are_built_on_first_access(self, monkeypatch):
+        from pyAFL.players import models
+
+        converted = []
+        table_to_frame = models.table_to_frame
+        monkeypatch.setattr(models, "table_to_frame", lambda table: converted.append(table) or table_to_frame(table))
+        stats = self._stats()
+
+        assert converted == []
+
+        total = stats.season_stats_total
+        assert len(converted) == 1
+        assert stats.season_stats_total is total
+        assert len(converted) == 1
+
+        season = stats.season_results[1963]
+        assert len(converted) == 2
+        assert list(season.iloc[:, 1]) == ["Essendon"]
+        assert stats.season_results[1963] is season
+        assert len(converted) == 2
+
+    def test_season_results_by_year_and_position(self):
+        season_results = self._stats().season_results
+
+        assert season_results.years == [1962, 1963]
+        assert len(season_results) == 2
+        assert 1962 in season_results
+        assert season_results[0] is season_results[1962]
+        assert season_results[-1] is season_results[1963]
+        assert [df.columns[0][0] for df in season_results] == ["St Kilda - 1962", "St Kilda - 1963"]
+        assert len(season_results[:1]) == 1
+
+        with pytest.raises(KeyError):
+            season_results[2019]
+
+    def test_sections_can_be_given(self):
+        stats = PlayerStats(season_stats_total="total")
+
+        assert stats.season_stats_total == "total"
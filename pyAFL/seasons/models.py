@@ -1,16 +1,27 @@
-import re
+from __future__ import annotations
+
+import functools
 from datetime import datetime
 from typing import Optional
 
-import numpy as np
-import pandas as pd
-
 from pyAFL import config
 from pyAFL.base.exceptions import LookupError
+from pyAFL.base.executor import fetch_and_parse
+from pyAFL.base.lazy import lazy_import
+from pyAFL.base.metrics import metrics
+from pyAFL.base.models import AFLObject
+from pyAFL.base.parsing import find_tables, parse_html, rows_to_frame, table_rows
+from pyAFL.base.store import store
 from pyAFL.session import session
 
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Matches the start time of a match, eg "Fri 15-Apr-2022 5:40 PM (7:40 PM)" (local time, then AEST in brackets)
+MATCH_START_RE = r"^\S+ (?P<day>\S+) (?P<local>\S+ \S+)(?: \((?P<aest>\S+ \S+)\))?"
+
 
-class Season(object):
+class Season(AFLObject):
     """
     A class to represent an AFL season.
 
@@ -60,11 +71,14 @@ class Season(object):
         """
         Returns season stats as per the season stats page
         defined in `self._get_season_url()`
+         - A season saved in the local store (`pyAFL.base.store.store`) is returned without fetching the page,
+         until the page expires (see `pyAFL.session.freshness`), and then without parsing it if it has not changed.
+         - Otherwise the page is parsed, and the season (and one row per match) is saved to the store.
 
         Parameters
         ----------
             force_live : bool
-                If True, does not use cached request
+                If True, does not use the local store or the cached request
 
         Returns
         ----------
@@ -72,84 +86,311 @@ class Season(object):
                 season stats Python object
 
         """
+        if not force_live:
+            stats = self._get_stored_season_stats()
+            if stats is not None:
+                return stats
 
         resp = session.get(self.url, force_live)
-        self._stat_html = resp.text
-
-        try:
-            all_dfs = pd.read_html(self._stat_html)
-        except ValueError as exc:
-            raise LookupError(
-                f"Found no season for year {self.season}. Browse https://afltables.com/afl/seas/season_idx.html for a list of all years with data. Year must be an integer."
-            ) from exc
-
-        matches = []
-        ladders = []
-        final_ladder = []
-        finals_stage = "Regular season"
-        for df in all_dfs:
-            # work out what data is in the table represented by this dataframe
-            if df.iat[0, 0].startswith("Round"):
-                # start of a round
-                round = int(df.iat[0, 0].split(" ")[1])
-                match = 1  # set to 1 as we're starting a new round
-            elif df.shape[0] == 1:
-                # Could be denoting which stage of finals, or could be a bye (which we ignore)
-                if df.iat[0, 0].endswith("Final"):
-                    finals_stage = df.iat[0, 0]
-                    match = 1
-                    round += 1
-            else:
-                # it's a match or a ladder
-                if df.shape[0] > 1:
-                    if df.iat[0, 0].startswith("Rd"):
-                        # ladder tables start with Rd N
-                        ladders.append(df)
-                    elif isinstance(df.columns, pd.MultiIndex):
-                        # it's the end-of-season ladder (drop last row of aggregate results which mess up the formatting)
-                        final_ladder = df.head(-1)
-                    else:
-                        # it's a match
-                        if not isinstance(df.iat[0, 1], str) and np.isnan(df.iat[0, 1]):
-                            # if there are missing values it's because this season hasn't finished yet
-                            final_ladder = []
-                            break
-                        # get the match object for this match
-                        current_match = Match(df, round, match, finals_stage)
-                        matches.append(current_match)
-                        match += 1
-
-        # build a summary dataframe of match data using the following column names and source variable names
-        dataframe_fields = {
-            "Date": "date",
-            "Round": "round",
-            "Game number": "game_number",
-            "Venue": "venue",
-            "Home team": "home_team",
-            "Away Team": "away_team",
-            "Home team score": "home_team_score",
-            "Away team score": "away_team_score",
-            "Home team score detail": "home_team_score_detail",
-            "Away team score detail": "away_team_score_detail",
-            "Winning team": "winning_team",
-            "Margin": "margin",
-            "Year stage": "finals_stage",
-        }
-        match_summary = {}
-        for df_column_name, match_attribute_name in dataframe_fields.items():
-            match_summary[df_column_name] = [
-                getattr(match, match_attribute_name) for match in matches
-            ]
-        match_summary = pd.DataFrame(match_summary)
-
-        ret = SeasonStats(
-            season_matches=matches,
-            season_ladders=ladders,
-            final_ladder=final_ladder,
-            match_summary=match_summary,
+
+        return self._get_season_stats_from_page(resp, force_live)
+
+    async def get_season_stats_async(self, force_live=False):
+        """
+        Awaitable version of `get_season_stats`. The page is fetched with `pyAFL.session.aio.async_session`
+        and parsed in the event loop's default executor.
+
+        Parameters
+        ----------
+            force_live : bool
+                If True, does not use the local store or the cached request
+
+        Returns
+        ----------
+            stats : obj
+                season stats Python object
+
+        """
+        import asyncio
+
+        from pyAFL.session.aio import async_session  # Imported here so that aiohttp is only loaded when used
+
+        loop = asyncio.get_running_loop()
+        if not force_live:
+            stats = await loop.run_in_executor(None, self._get_stored_season_stats)
+            if stats is not None:
+                return stats
+
+        resp = await async_session.get(self.url, force_live)
+
+        return await loop.run_in_executor(None, self._get_season_stats_from_page, resp, force_live)
+
+    @classmethod
+    def range(
+        cls, start: int, end: int, workers: int = 8, parse_workers: int = None, score_detail: bool = False,
+        force_live: bool = False,
+    ) -> "SeasonStats":
+        """
+        Returns the stats of every season from `start` to `end` (both included) in one SeasonStats object.
+        The season pages are fetched concurrently and parsed in worker processes (see `season_stats_many`);
+        each season is parsed once, then read from the local store.
+
+        Parameters
+        ----------
+            start : int (required)
+                first season year
+            end : int (required)
+                last season year (included)
+            workers : int
+                maximum number of requests in flight at once
+            parse_workers : int
+                number of worker processes parsing pages (default: `pyAFL.base.executor.parse_executor`)
+            score_detail : bool
+                If True, the match summary includes the score detail columns (lists of ints)
+            force_live : bool
+                If True, does not use the local store or the cached requests
+
+        Returns
+        ----------
+            stats : SeasonStats
+                with attributes
+                 - seasons (dict): SeasonStats of each year
+                 - match_summary (Pandas dataframe): the matches of every season, with a "Year" column
+                 - season_ladders (Pandas dataframe): the ladder after each round of every season, one row
+                 per team and round ("Year", "Round", "Position", "Team", "Points", "Percentage")
+                 - final_ladders (dict): final ladder of each year (empty list if the season is unfinished)
+        """
+        if end < start:
+            raise ValueError(f"The last season ({end}) is before the first season ({start})")
+        years = list(range(start, end + 1))
+        stats = season_stats_many(years, max_workers=workers, parse_workers=parse_workers, force_live=force_live)
+
+        return SeasonStats(
+            seasons=dict(zip(years, stats)),
+            match_summary=_seasons_match_summary(years, stats, score_detail),
+            season_ladders=_seasons_ladders(years, stats),
+            final_ladders={year: season.final_ladder for year, season in zip(years, stats)},
         )
 
-        return ret
+    def _get_stored_season_stats(self, resp=None):
+        stored = self._get_object_from_db(response=resp, kind="season", key=self.url)
+        if stored is None:
+            return None
+
+        return _season_stats_from_payload(stored)
+
+    def _get_season_stats_from_page(self, resp, force_live: bool = False):
+        # A season saved from the same page (eg after a 304 revalidation) is returned without parsing it again
+        stats = None if force_live else self._get_stored_season_stats(resp)
+        if stats is not None:
+            return stats
+
+        stats = self._parse_season_stats(resp.text)
+        self._save_season_stats(stats, resp)
+
+        return stats
+
+    def _save_season_stats(self, stats, resp):
+        if self._caching_enabled():
+            self._save_object_to_db(
+                _season_payload(stats.season_matches, stats.season_ladders, stats.final_ladder),
+                response=resp,
+                kind="season",
+                key=self.url,
+                year=self.season,
+            )
+            store.put_matches(self.season, stats.season_matches.to_frame())
+
+    def _parse_season_stats(self, html: str):
+        self._stat_html = html
+
+        return _season_stats(*_parse_season_page(html, self.season))
+
+    # Bulk loading protocol (see `pyAFL.base.executor.fetch_and_parse`)
+    def _page_url(self) -> str:
+        return self.url
+
+    def _page_parser(self):
+        return functools.partial(parse_season_page, year=self.season, parser=config.HTML_PARSER)
+
+    def _get_stored_result(self, resp=None):
+        return self._get_stored_season_stats(resp)
+
+    def _result_from_parsed(self, resp, parsed: dict):
+        stats = _season_stats_from_payload(parsed)
+        self._save_season_stats(stats, resp)
+        return stats
+
+
+@metrics.timed("parse", page="season")
+def _parse_season_page(html: str, year: int, parser: str = None) -> tuple:
+    # Returns the matches, the ladder after each round and the final ladder of a season page
+    tables = find_tables(parse_html(html, parser))
+    if not tables:
+        raise LookupError(
+            f"Found no season for year {year}. Browse https://afltables.com/afl/seas/season_idx.html for a list "
+            "of all years with data. Year must be an integer."
+        )
+
+    # The text of each match table is collected into columns, which are then parsed all at once
+    columns = {name: [] for name in ("round", "game_number", "finals_stage", "home", "away")}
+    ladders = []
+    final_ladder = []
+    finals_stage = "Regular season"
+    for table in tables:
+        head, body, foot = table_rows(table)
+        rows = _data_rows(head, body, foot)
+        if not rows:
+            continue
+        first = rows[0][0]
+
+        # work out what data is in the table
+        if first.startswith("Round"):
+            # start of a round
+            round = int(first.split(" ")[1])
+            match = 1  # set to 1 as we're starting a new round
+        elif len(rows) == 1:
+            # Could be denoting which stage of finals, or could be a bye (which we ignore)
+            if first.endswith("Final"):
+                finals_stage = first
+                match = 1
+                round += 1
+        elif first.startswith("Rd"):
+            # ladder tables start with Rd N
+            ladders.append(rows_to_frame(head, body, foot))
+        elif sum(1 for row in head if any(row)) > 1:
+            # it's the end-of-season ladder (drop last row of aggregate results which mess up the formatting)
+            final_ladder = rows_to_frame(head, body, foot).head(-1)
+        else:
+            # it's a match
+            if rows[0][1] == "":
+                # if there are missing values it's because this season hasn't finished yet
+                final_ladder = []
+                break
+            columns["round"].append(round)
+            columns["game_number"].append(match)
+            columns["finals_stage"].append(finals_stage)
+            columns["home"].append(rows[0])
+            columns["away"].append(rows[1])
+            match += 1
+
+    return MatchTable.from_rows(**columns), ladders, final_ladder
+
+
+def parse_season_page(html: str, year: int, parser: str = None) -> dict:
+    """
+    Parses a season page into its matches (one array per `MatchTable` field) and ladders, as picklable
+    arrays and DataFrames, so that pages can be parsed in worker processes (see
+    `pyAFL.base.executor.ParseExecutor`). `parser` is the parser backend (see `pyAFL.base.parsing.parse_html`).
+    """
+    return _season_payload(*_parse_season_page(html, year, parser))
+
+
+def _season_payload(matches: "MatchTable", ladders: list, final_ladder) -> dict:
+    # The object saved in the local store
+    return {
+        "matches": {field: getattr(matches, field) for field in MatchTable.FIELDS},
+        "season_ladders": ladders,
+        "final_ladder": final_ladder,
+    }
+
+
+def _season_stats_from_payload(payload: dict) -> "SeasonStats":
+    return _season_stats(MatchTable(**payload["matches"]), payload["season_ladders"], payload["final_ladder"])
+
+
+def season_stats_many(seasons, max_workers: int = 8, parse_workers: int = None, force_live: bool = False) -> list:
+    """
+    Returns the stats of many seasons at once (see `pyAFL.base.executor.fetch_and_parse`). The pages are
+    fetched concurrently, and parsed in worker processes if `parse_workers` (or the shared
+    `parse_executor.workers`) is more than 1.
+
+    Parameters
+    ----------
+        seasons : iterable of Season or int (required)
+            seasons, or season years
+        max_workers : int
+            maximum number of requests in flight at once
+        parse_workers : int
+            number of worker processes parsing pages (default: `pyAFL.base.executor.parse_executor`)
+        force_live : bool
+            If True, does not use the local store or the cached requests
+
+    Returns
+    ----------
+        stats : list
+            SeasonStats of each season, in the order of `seasons`
+    """
+    seasons = [season if isinstance(season, Season) else Season(season) for season in seasons]
+
+    return fetch_and_parse(seasons, max_workers=max_workers, parse_workers=parse_workers, force_live=force_live)
+
+
+def _seasons_match_summary(years: list, stats: list, score_detail: bool) -> pd.DataFrame:
+    # The matches of several seasons in one frame. Categorical columns are re-categorised over every season,
+    # as concatenating categoricals with different categories gives object columns.
+    with metrics.timer("frame", page="season") as fields:
+        frames = []
+        for year, season in zip(years, stats):
+            frame = season.season_matches.to_frame(score_detail=score_detail)
+            del frame["Result"]
+            frame.insert(0, "Year", np.int16(year))
+            frames.append(frame)
+        summary = pd.concat(frames, ignore_index=True)
+        for column in ("Venue", "Home team", "Away Team", "Winning team", "Year stage"):
+            summary[column] = summary[column].astype("category")
+        summary["Year"] = summary["Year"].astype("int16")
+        fields["rows"] = len(summary)
+
+    return summary
+
+
+def _seasons_ladders(years: list, stats: list) -> pd.DataFrame:
+    # The round ladders of several seasons in one long frame. Each round ladder is a "Rd N Ladder" heading
+    # row, then one row per team (in ladder order) with its premiership points and percentage.
+    rows = {name: [] for name in ("Year", "Round", "Position", "Team", "Points", "Percentage")}
+    for year, season in zip(years, stats):
+        for ladder in season.season_ladders:
+            values = ladder.to_numpy()
+            round = int(str(values[0][0]).split(" ")[1])
+            for position, (team, points, percentage) in enumerate(values[1:, :3], 1):
+                rows["Year"].append(year)
+                rows["Round"].append(round)
+                rows["Position"].append(position)
+                rows["Team"].append(team)
+                rows["Points"].append(points)
+                rows["Percentage"].append(percentage)
+
+    return pd.DataFrame(
+        {
+            "Year": np.array(rows["Year"], dtype=np.int16),
+            "Round": np.array(rows["Round"], dtype=np.int16),
+            "Position": np.array(rows["Position"], dtype=np.int16),
+            "Team": pd.Categorical(rows["Team"]),
+            "Points": pd.to_numeric(pd.Series(rows["Points"], dtype=object), errors="coerce").astype("Int16"),
+            "Percentage": pd.to_numeric(pd.Series(rows["Percentage"], dtype=object), errors="coerce"),
+        }
+    )
+
+
+def _season_stats(matches: "MatchTable", ladders: list, final_ladder) -> "SeasonStats":
+    match_summary = matches.to_frame(score_detail=True)
+    del match_summary["Result"]
+
+    return SeasonStats(
+        season_matches=matches,
+        season_ladders=ladders,
+        final_ladder=final_ladder,
+        match_summary=match_summary,
+    )
+
+
+def _data_rows(head: list, body: list, foot: list) -> list:
+    # The data rows `pd.read_html` would return for a table: ragged rows are padded, and blank one-cell rows dropped
+    rows = body + foot
+    width = max((len(row) for row in head + rows), default=0)
+
+    return [row + [""] * (width - len(row)) for row in rows if len(row) > 1 or (row and row[0].strip())]
 
 
 class SeasonStats(object):
@@ -180,10 +421,201 @@ class SeasonStats(object):
         pass
 
 
+def _score_details(scores: pd.Series) -> np.ndarray:
+    # Scores are strings like '0.0 Â Â 2.0 Â Â 4.3 Â Â 9.4' and there are weird characters.
+    # Every number is extracted, so goals and behinds alternate: [0, 0, 2, 0, 4, 3, 9, 4]. Each match gets
+    # a fixed-width row of at least four quarters, padded with -1 (eg after extra time in other matches).
+    numbers = scores.astype(str).str.extractall(r"(\d+)")[0]
+    rows = numbers.index.get_level_values(0).to_numpy()
+    counts = np.bincount(rows, minlength=len(scores))
+    width = max(8, counts.max(initial=0))
+    positions = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    details = np.full((len(scores), width), -1, dtype=np.int16)
+    details[rows, positions] = numbers.to_numpy(dtype=np.int16)
+
+    return details
+
+
+class MatchTable(object):
+    """
+    A collection of matches, stored as one typed array per field rather than one object per match.
+     - Iterating or indexing with an integer returns lightweight `Match` views of the rows.
+     - Slices, and `by_round(n)` / `by_team(name)` when the matches are contiguous, return tables which
+     share the arrays of this table.
+     - `to_frame()` returns a DataFrame built on the same arrays, without copying them.
+
+    Attributes
+    ----------
+    date : numpy.ndarray (datetime64)
+    round : numpy.ndarray (int16)
+    game_number : numpy.ndarray (int16)
+    finals_stage : pandas.Categorical
+    venue : pandas.Categorical
+    home_team : pandas.Categorical
+    away_team : pandas.Categorical
+    home_team_score : numpy.ndarray (int16)
+    away_team_score : numpy.ndarray (int16)
+    home_team_score_detail : numpy.ndarray (int16, one row per match)
+        goals and behinds at the end of each quarter (and period of extra time), padded with -1
+    away_team_score_detail : numpy.ndarray (int16, one row per match)
+    winning_team : pandas.Categorical
+        winning team ("" for a draw)
+    margin : numpy.ndarray (int16)
+    result : numpy.ndarray (object)
+
+    Methods
+    -------
+    by_round(round)
+        returns the matches of a round
+    by_team(team)
+        returns the matches played by a team
+    to_frame(score_detail=False)
+        returns the matches as a DataFrame
+    """
+
+    FIELDS = (
+        "date", "round", "game_number", "finals_stage", "venue", "home_team", "away_team", "home_team_score",
+        "away_team_score", "home_team_score_detail", "away_team_score_detail", "winning_team", "margin", "result",
+    )
+    # DataFrame column name of each field (see `to_frame`)
+    COLUMNS = {
+        "Date": "date",
+        "Round": "round",
+        "Game number": "game_number",
+        "Venue": "venue",
+        "Home team": "home_team",
+        "Away Team": "away_team",
+        "Home team score": "home_team_score",
+        "Away team score": "away_team_score",
+        "Home team score detail": "home_team_score_detail",
+        "Away team score detail": "away_team_score_detail",
+        "Winning team": "winning_team",
+        "Margin": "margin",
+        "Year stage": "finals_stage",
+        "Result": "result",
+    }
+
+    def __init__(self, **arrays):
+        for field in self.FIELDS:
+            setattr(self, field, arrays[field])
+
+    @classmethod
+    def from_rows(cls, round: list, game_number: list, finals_stage: list, home: list, away: list):
+        """
+        Parses the text rows of match tables from AFLtables, all at once. Each match table has a row for
+        the home team and a row for the away team, whose first four cells are eg:
+
+            home: "West Coast", "0.0 Â Â 2.0 Â Â 4.3 Â Â 9.4", "58",
+                  "Fri 15-Apr-2022 5:40 PM (7:40 PM)  Att:  42,888 Venue: Perth Stadium"
+            away: "Sydney", "5.4 10.10 11.12 18.13", "121", "Sydney  won by  63 pts  [  Match stats  ]"
+
+        Parameters
+        ----------
+            round, game_number, finals_stage : list (required)
+                round number, game number in the round and stage of the season of each match
+            home, away : list (required)
+                text of the home team row and the away team row of each match
+
+        Returns
+        ----------
+            matches : MatchTable
+        """
+        home = pd.DataFrame([row[:4] for row in home], columns=range(4), dtype=object)
+        away = pd.DataFrame([row[:4] for row in away], columns=range(4), dtype=object)
+        info = home[3].astype(str)
+
+        # If local time is not AEST, AEST time appears in brackets, we pick AEST time. A date which cannot be
+        # parsed is NaT, rather than failing the whole season
+        start = info.str.extract(MATCH_START_RE)
+        date = pd.to_datetime(
+            start["day"] + " " + start["aest"].fillna(start["local"]), format="%d-%b-%Y %I:%M %p", errors="coerce"
+        )
+
+        home_team_score = pd.to_numeric(home[2]).to_numpy(dtype=np.int16)
+        away_team_score = pd.to_numeric(away[2]).to_numpy(dtype=np.int16)
+        winning_team = np.where(
+            home_team_score > away_team_score, home[0], np.where(home_team_score < away_team_score, away[0], "")
+        )
+
+        return cls(
+            date=date.to_numpy(),
+            round=np.array(round, dtype=np.int16),
+            game_number=np.array(game_number, dtype=np.int16),
+            finals_stage=pd.Categorical(finals_stage),
+            venue=pd.Categorical(info.str.split("Venue: ").str[1].str.strip()),
+            home_team=pd.Categorical(home[0].astype(str)),
+            away_team=pd.Categorical(away[0].astype(str)),
+            home_team_score=home_team_score,
+            away_team_score=away_team_score,
+            home_team_score_detail=_score_details(home[1]),
+            away_team_score_detail=_score_details(away[1]),
+            winning_team=pd.Categorical(winning_team),
+            margin=np.abs(home_team_score - away_team_score),
+            result=away[3].astype(str).str[:-18].str.strip().to_numpy(dtype=object),
+        )
+
+    def __repr__(self):
+        return f"<MatchTable: {len(self)} matches>"
+
+    def __len__(self):
+        return len(self.round)
+
+    def __iter__(self):
+        return (Match._view(self, i) for i in range(len(self)))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._take(key)
+        if not -len(self) <= key < len(self):
+            raise IndexError("match index out of range")
+
+        return Match._view(self, key % len(self))
+
+    def _take(self, indexer):
+        return MatchTable(**{field: getattr(self, field)[indexer] for field in self.FIELDS})
+
+    def _select(self, mask):
+        indices = np.flatnonzero(mask)
+        if len(indices) and indices[-1] - indices[0] == len(indices) - 1:
+            # Contiguous matches (eg a round) share this table's arrays
+            return self._take(slice(indices[0], indices[-1] + 1))
+        return self._take(indices)
+
+    def by_round(self, round: int):
+        """Returns the matches of round number `round`."""
+        return self._select(self.round == round)
+
+    def by_team(self, team: str):
+        """Returns the matches played by `team`, home or away."""
+        return self._select(np.asarray(self.home_team == team) | np.asarray(self.away_team == team))
+
+    def to_frame(self, score_detail: bool = False) -> pd.DataFrame:
+        """
+        Returns the matches as a DataFrame (with the columns of `SeasonStats.match_summary`, plus "Result").
+        The columns are built on the arrays of this table without copying them; the score detail columns
+        (lists of ints) are only included if `score_detail` is True.
+        """
+        data = {}
+        for column, field in self.COLUMNS.items():
+            values = getattr(self, field)
+            if field.endswith("_score_detail"):
+                if not score_detail:
+                    continue
+                values = pd.Series([row[row >= 0].tolist() for row in values], dtype=object)
+            data[column] = values
+
+        with metrics.timer("frame", page="season", rows=len(self)):
+            return pd.DataFrame(data, copy=False)
+
+
 class Match:
     """
     A class to represent a match, extracting data from dataframe with match information from AFLtables
 
+    A Match is a lightweight view of one row of a `MatchTable`: it has no per-instance `__dict__`, and its
+    quarter scores are stored in the table's fixed-width arrays.
+
     Attributes
     ----------
     date : datetime
@@ -206,6 +638,8 @@ class Match:
     ...
     """
 
+    __slots__ = ("_table", "_index")
+
     def __init__(
         self,
         match: pd.DataFrame,
@@ -233,49 +667,74 @@ class Match:
         # 1      Sydney        5.4 10.10 11.12 18.13  121          Sydney  won by  63 pts  [  Match stats  ]
         #
         # There are variations in the format...
-
-        self.round = round
-        self.game_number = game_number
-        self.finals_stage = finals_stage
-        self.date = self._parse_time(match)
-        self.venue = match.iat[0, 3].split("Venue: ")[1].strip()
-        self.result = match.iat[1, 3][:-18].strip()
-        self.home_team = match.iat[0, 0]
-        self.away_team = match.iat[1, 0]
-        self.home_team_score = int(match.iat[0, 2])
-        self.away_team_score = int(match.iat[1, 2])
-        self.home_team_score_detail = self._score_detail(match.iat[0, 1])
-        self.away_team_score_detail = self._score_detail(match.iat[1, 1])
-        if self.home_team_score > self.away_team_score:
-            self.winning_team = self.home_team
-            self.margin = self.home_team_score - self.away_team_score
-        elif self.home_team_score < self.away_team_score:
-            self.winning_team = self.away_team
-            self.margin = self.away_team_score - self.home_team_score
-        else:
-            self.winning_team = ""
-            self.margin = 0
-
-    def _parse_time(self, match):
-        date_field = match.iat[0, 3].split(" ")
-        # remove attendance field, it gets in the way
-        if date_field[5] == "Att:":
-            date_field = date_field[:4] + date_field[8:]
-
-        # If local time is not AEST, AEST time appears in brackets, we pick AEST time
-        if date_field[5].strip() == "Venue:":
-            # local time is AEST
-            match_date = " ".join(date_field[1:4])
-            return datetime.strptime(match_date, "%d-%b-%Y %I:%M %p")
-        else:
-            match_date = " ".join(date_field[1:2] + date_field[4:6])
-            return datetime.strptime(match_date, "%d-%b-%Y (%I:%M %p)")
-
-    def _score_detail(self, score):
-        # Score is a string like '0.0 Â Â 2.0 Â Â 4.3 Â Â 9.4' and there are weird characters
-        # Get the relevant ones with a regex, then split on decimals to split goals/behinds
-        strings = [x.split(".") for x in re.findall("\\d*\\.?\\d+", score)]
-        return [int(y) for x in strings for y in x]
+        home, away = ([str(value) for value in match.iloc[i, :4]] for i in (0, 1))
+        self._table = MatchTable.from_rows([round], [game_number], [finals_stage], [home], [away])
+        self._index = 0
+
+    @classmethod
+    def _view(cls, table: "MatchTable", index: int):
+        match = cls.__new__(cls)
+        match._table = table
+        match._index = index
+        return match
+
+    @property
+    def date(self) -> datetime:
+        return pd.Timestamp(self._table.date[self._index]).to_pydatetime()
+
+    @property
+    def round(self) -> int:
+        return int(self._table.round[self._index])
+
+    @property
+    def game_number(self) -> int:
+        return int(self._table.game_number[self._index])
+
+    @property
+    def finals_stage(self) -> str:
+        return self._table.finals_stage[self._index]
+
+    @property
+    def venue(self) -> str:
+        return self._table.venue[self._index]
+
+    @property
+    def result(self) -> str:
+        return self._table.result[self._index]
+
+    @property
+    def home_team(self) -> str:
+        return self._table.home_team[self._index]
+
+    @property
+    def away_team(self) -> str:
+        return self._table.away_team[self._index]
+
+    @property
+    def home_team_score(self) -> int:
+        return int(self._table.home_team_score[self._index])
+
+    @property
+    def away_team_score(self) -> int:
+        return int(self._table.away_team_score[self._index])
+
+    @property
+    def home_team_score_detail(self) -> list:
+        detail = self._table.home_team_score_detail[self._index]
+        return detail[detail >= 0].tolist()
+
+    @property
+    def away_team_score_detail(self) -> list:
+        detail = self._table.away_team_score_detail[self._index]
+        return detail[detail >= 0].tolist()
+
+    @property
+    def winning_team(self) -> str:
+        return self._table.winning_team[self._index]
+
+    @property
+    def margin(self) -> int:
+        return int(self._table.margin[self._index])
 
     def __repr__(self):
         output = f"MATCH:\n\t{self.home_team} vs {self.away_team}"
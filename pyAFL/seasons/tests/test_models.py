@@ -4,6 +4,7 @@ import pytest
 
 from pyAFL.base.exceptions import LookupError
 from pyAFL.seasons.models import Season, SeasonStats
+from pyAFL.testing.fixtures import season_page
 
 
 class TestSeasonModel:
@@ -16,22 +17,28 @@ class TestSeasonModel:
             Season(2019)._get_season_url() == "https://afltables.com/afl/seas/2019.html"
         )
 
-    def test_season_classmethod_get_season_url_failure(self):
+    def test_season_classmethod_get_season_url_failure(self, afltables):
         with pytest.raises(LookupError) as e:
             Season(12).get_season_stats()
 
         assert "Found no season for year" in str(e)
 
-    def test_season_classmethod_get_season_stats(self):
+    def test_season_classmethod_get_season_stats(self, afltables):
+        afltables.add_pages({"seas/2017.html": season_page(year=2017)})
         season = Season(2017)
 
         assert isinstance(season.get_season_stats(), SeasonStats)
 
 
+@pytest.fixture(scope="class")
+def matches_2017(request):
+    request.cls.matches = Season(2017).get_season_stats().season_matches
+
+
+# Asserts on the real 2017 season page
+@pytest.mark.network
+@pytest.mark.usefixtures("matches_2017")
 class TestSeasonStats:
-    season = Season(2017)
-    stats = season.get_season_stats()
-    matches = stats.season_matches
     # Match 54
     # St Kilda	                2.4   6.7  10.9 16.12	108
     # Greater Western Sydney	4.2   7.6 11.10 12.13	85
@@ -0,0 +1,204 @@
+from datetime import datetime
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyAFL.base.exceptions import LookupError
+from pyAFL.base.metrics import metrics
+from pyAFL.seasons.models import Match, MatchTable, Season, SeasonStats
+from pyAFL.session.rewriters import soup_rewriter
+from pyAFL.testing.fixtures import season_page
+
+MATCH_FIELDS = [
+    "date", "round", "game_number", "venue", "result", "winning_team", "margin", "home_team", "away_team",
+    "home_team_score", "away_team_score", "home_team_score_detail", "away_team_score_detail", "finals_stage",
+]
+
+
+def _season_html(**kwargs):
+    # Cached pages have been through the default link rewriter, which prettifies them
+    return soup_rewriter("https://afltables.com/afl/seas/2017.html", season_page(**kwargs)).decode()
+
+
+class TestSeasonStatsParsing:
+    html = _season_html()
+    stats = Season(2017, url="https://afltables.com/afl/seas/2017.html")._parse_season_stats(html)
+
+    def test_season_tables(self):
+        assert len(self.stats.season_matches) == 23 * 8 + 9
+        assert len(self.stats.season_ladders) == 23
+        assert self.stats.final_ladder.shape == (18, 4)
+        assert list(self.stats.match_summary.columns) == [
+            "Date", "Round", "Game number", "Venue", "Home team", "Away Team", "Home team score",
+            "Away team score", "Home team score detail", "Away team score detail", "Winning team", "Margin",
+            "Year stage",
+        ]
+
+    def test_matches_are_same_as_match_tables(self):
+        match_dfs = [df for df in pd.read_html(StringIO(self.html)) if df.shape == (2, 4)]
+
+        assert len(match_dfs) == len(self.stats.season_matches)
+        for df, match in zip(match_dfs, self.stats.season_matches):
+            expected = Match(df, match.round, match.game_number, match.finals_stage)
+            for field in MATCH_FIELDS:
+                assert getattr(match, field) == getattr(expected, field), field
+
+    def test_match_summary_matches_matches(self):
+        summary = self.stats.match_summary
+
+        assert summary["Home team"].tolist() == [match.home_team for match in self.stats.season_matches]
+        assert summary["Margin"].tolist() == [match.margin for match in self.stats.season_matches]
+        assert pd.api.types.is_datetime64_any_dtype(summary["Date"])
+
+    def test_finals(self):
+        grand_final = self.stats.season_matches[-1]
+
+        assert grand_final.finals_stage == "Grand Final"
+        assert grand_final.round == 28
+        assert grand_final.game_number == 1
+        assert self.stats.season_matches[23 * 8].finals_stage == "Qualifying Final"
+
+    def test_season_in_progress(self):
+        stats = Season(2017, url="https://afltables.com/afl/seas/2017.html")._parse_season_stats(
+            _season_html(complete_rounds=5)
+        )
+
+        assert len(stats.season_matches) == 5 * 8
+        assert stats.final_ladder == []
+
+    def test_no_season(self):
+        with pytest.raises(LookupError):
+            Season(12, url="https://afltables.com/afl/seas/12.html")._parse_season_stats("<html>Not Found</html>")
+
+
+class TestMatchTable:
+    season = Season(2017, url="https://afltables.com/afl/seas/2017.html")
+    matches = season._parse_season_stats(_season_html()).season_matches
+
+    def test_matches_are_slotted_views(self):
+        match = self.matches[5]
+
+        assert not hasattr(match, "__dict__")
+        assert match._table is self.matches
+        assert self.matches[-1].finals_stage == "Grand Final"
+        with pytest.raises(IndexError):
+            self.matches[len(self.matches)]
+
+    def test_typed_arrays(self):
+        assert self.matches.home_team_score.dtype == np.int16
+        assert self.matches.round.dtype == np.int16
+        assert self.matches.home_team_score_detail.shape == (len(self.matches), 8)
+        assert isinstance(self.matches.venue, pd.Categorical)
+
+    def test_slices_share_arrays(self):
+        sliced = self.matches[8:16]
+
+        assert len(sliced) == 8
+        assert np.shares_memory(sliced.home_team_score, self.matches.home_team_score)
+        assert sliced[0].home_team == self.matches[8].home_team
+
+    def test_by_round(self):
+        round_2 = self.matches.by_round(2)
+
+        assert len(round_2) == 8
+        assert {match.round for match in round_2} == {2}
+        assert [match.game_number for match in round_2] == list(range(1, 9))
+        assert np.shares_memory(round_2.margin, self.matches.margin)
+
+    def test_by_team(self):
+        richmond = self.matches.by_team("Richmond")
+
+        assert len(richmond) == sum(
+            match.home_team == "Richmond" or match.away_team == "Richmond" for match in self.matches
+        )
+        assert all("Richmond" in (match.home_team, match.away_team) for match in richmond)
+        assert len(self.matches.by_team("Babe Ruth FC")) == 0
+
+    def test_to_frame_does_not_copy(self):
+        df = self.matches.to_frame()
+
+        assert "Home team score detail" not in df.columns
+        assert np.shares_memory(df["Home team score"].to_numpy(), self.matches.home_team_score)
+        assert np.shares_memory(df["Date"].to_numpy(), self.matches.date)
+        assert df["Venue"].dtype == "category"
+
+    def test_match_from_dataframe_with_extra_time(self):
+        df = pd.DataFrame(
+            [
+                ["Geelong", "2.1 5.3 8.4 10.6 11.7 12.8", "80", "Sat 01-Oct-2016 2:30 PM  Att: 90,000 Venue: M.C.G."],
+                ["Sydney", "3.0 5.2 8.5 10.6 11.6 11.9", "75", "Geelong  won by  5 pts  [  Match stats  ]"],
+            ]
+        )
+
+        match = Match(df, 26, 1, "Grand Final")
+
+        assert match.home_team_score_detail == [2, 1, 5, 3, 8, 4, 10, 6, 11, 7, 12, 8]
+        assert match.date == datetime(2016, 10, 1, 14, 30)
+        assert match.venue == "M.C.G."
+        assert match.winning_team == "Geelong"
+        assert match.margin == 5
+        assert match.result == "Geelong  won by  5 pts"
+
+    def test_malformed_date_is_nat(self):
+        home = [
+            ["Geelong", "2.1 5.3 8.4 10.6", "66", "Sat 01-Oct-2016 2:30 PM  Att: 90,000 Venue: M.C.G."],
+            ["Richmond", "3.0 5.2 8.5 10.6", "66", "Sat 31-Foo-2016 2:30 PM  Att: 90,000 Venue: M.C.G."],
+        ]
+        away = [
+            ["Sydney", "3.0 5.2 8.5 9.6", "60", "Geelong  won by  6 pts  [  Match stats  ]"],
+            ["Carlton", "1.0 2.2 3.5 9.6", "60", "Richmond  won by  6 pts  [  Match stats  ]"],
+        ]
+
+        matches = MatchTable.from_rows([1, 1], [1, 2], ["Regular season"] * 2, home, away)
+
+        assert matches[0].date == datetime(2016, 10, 1, 14, 30)
+        assert pd.isna(matches[1].date)
+        assert matches[1].home_team == "Richmond"
+
+
+class TestSeasonRange:
+    @pytest.fixture
+    def seasons(self, afltables):
+        afltables.add_pages(
+            {f"seas/{year}.html": season_page(year=year, rounds=3, seed=year) for year in range(2015, 2018)}
+        )
+        return afltables
+
+    def test_range(self, seasons):
+        stats = Season.range(2015, 2017, workers=3)
+
+        assert list(stats.seasons) == [2015, 2016, 2017]
+        assert isinstance(stats.seasons[2016], SeasonStats)
+        summary = stats.match_summary
+        assert list(summary.Year.unique()) == [2015, 2016, 2017]
+        assert len(summary) == sum(len(season.season_matches) for season in stats.seasons.values())
+        assert list(summary["Year stage"].cat.categories) == [
+            "Elimination Final", "Grand Final", "Preliminary Final", "Qualifying Final", "Regular season",
+            "Semi Final",
+        ]
+        assert summary.Year.dtype == "int16" and summary.Round.dtype == "int16"
+        assert summary["Home team"].dtype == "category"
+        assert stats.final_ladders[2017].shape == (18, 4)
+
+    def test_range_ladders(self, seasons):
+        ladders = Season.range(2015, 2016).season_ladders
+
+        assert list(ladders.columns) == ["Year", "Round", "Position", "Team", "Points", "Percentage"]
+        assert len(ladders) == 2 * 3 * 18
+        assert list(ladders.Position[:18]) == list(range(1, 19))
+        assert ladders.Round.max() == 3
+
+    def test_range_seasons_are_parsed_once(self, seasons):
+        Season.range(2015, 2017)
+        with metrics.profile() as profile:
+            Season.range(2015, 2017)
+
+        stats = profile.stats()
+        assert stats["requests"]["count"] == 0
+        assert stats["parse"] == {}
+
+    def test_range_invalid(self):
+        with pytest.raises(ValueError):
+            Season.range(2017, 2015)
@@ -0,0 +1,149 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import aiohttp
+from requests import Request, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from requests_cache.models import AnyResponse
+from requests_cache.policy import CacheActions
+
+from pyAFL.base.metrics import metrics
+from pyAFL.session.session import session
+
+
+class AsyncAFLTablesSession(object):
+    """
+    asyncio counterpart of the shared `pyAFL.session.session`.
+
+    Pages are downloaded with aiohttp, so hundreds of requests can be in flight on one event loop.
+    Caching and link rewriting are delegated to the synchronous session, so both sessions share the
+    same cache entries, freshness policy (and conditional requests) and link rewriter. Cache reads,
+    cache writes and link rewriting run in the event loop's default executor so they do not block the loop.
+
+    Attributes
+    ----------
+    sync_session : __AFLTablesCachedSession
+        the synchronous session whose cache and link rewriter are used
+    max_connections : int
+        maximum number of simultaneous connections
+    max_connections_per_host : int
+        maximum number of simultaneous connections to a single host (0 is unlimited)
+
+    Methods
+    -------
+    get(url, force_live=False)
+        returns the (cached) response for `url`
+    close()
+        closes the underlying aiohttp session
+    """
+
+    def __init__(self, sync_session=session, max_connections: int = 100, max_connections_per_host: int = 0):
+        self.sync_session = sync_session
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self._client = None
+        self._client_loop = None
+
+    def __repr__(self):
+        return f"<AsyncAFLTablesSession: {self.sync_session.cache.cache_name}>"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_client(self) -> aiohttp.ClientSession:
+        # An aiohttp session is bound to the event loop it was created on, so create a new one if the loop changed
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.closed or self._client_loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.max_connections_per_host)
+            self._client = aiohttp.ClientSession(connector=connector)
+            self._client_loop = loop
+        return self._client
+
+    async def close(self):
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+        self._client = None
+
+    async def get(self, url: str, force_live: bool = False) -> AnyResponse:
+        """
+        Returns the response for `url`, from the shared cache if possible.
+
+        Parameters
+        ----------
+            url : str (required)
+                url to fetch
+            force_live : bool
+                If True, does not use the cached response. The live response still replaces the cached copy.
+
+        Returns
+        ----------
+            response : requests.Response or requests_cache.CachedResponse
+                response with its links rewritten, exactly as `pyAFL.session.session.get` would return it
+        """
+        if self.sync_session.snapshot is not None:
+            # Offline: pages are read from the memory-mapped snapshot bundle, without any request
+            return self.sync_session.get(url)
+
+        loop = asyncio.get_running_loop()
+
+        self.sync_session._count("requests")
+        start = time.perf_counter()
+        cached_response = None
+        if not force_live:
+            cached_response = await loop.run_in_executor(None, self.sync_session._get_cached_response, url)
+            if cached_response is not None and not cached_response.is_expired:
+                # Pages cached by an older link rewriter are rewritten (parsed and saved again) here
+                response = await loop.run_in_executor(None, self.sync_session._rewrite_links_hook, cached_response)
+                self.sync_session._record_request(url, "hit", response, time.perf_counter() - start)
+                return response
+
+        # An expired page is revalidated with a conditional request, as `pyAFL.session.session` does
+        request = self.sync_session.prepare_request(Request("GET", url))
+        headers = dict(request.headers)
+        if cached_response is not None:
+            actions = CacheActions()
+            actions.update_from_cached_response(cached_response)
+            headers.update(actions.validation_headers)
+
+        transport_url = self.sync_session.transport_url(request.url)
+        try:
+            response = await self._fetch(transport_url, request, headers)
+        except Exception:
+            metrics.record("request", url=url, outcome="error", status=None, seconds=time.perf_counter() - start)
+            raise
+
+        response = await loop.run_in_executor(
+            None, self.sync_session._cache_response, request, response, cached_response
+        )
+        outcome = "revalidated" if cached_response is not None and response is cached_response else "miss"
+        self.sync_session._record_request(url, outcome, response, time.perf_counter() - start)
+        return response
+
+    async def _fetch(self, transport_url: str, request, headers: dict) -> Response:
+        start = time.monotonic()
+        async with self._get_client().get(transport_url, headers=headers) as resp:
+            response = Response()
+            response.status_code = resp.status
+            response.reason = resp.reason
+            response.headers = CaseInsensitiveDict(resp.headers)
+            response.encoding = get_encoding_from_headers(response.headers)
+            response.url = str(resp.url) if transport_url == request.url else request.url
+            response.request = request
+            response._content = await resp.read()
+            response.elapsed = timedelta(seconds=time.monotonic() - start)
+
+        return response
+
+    async def get_many(self, urls, force_live: bool = False):
+        """
+        Fetches many urls concurrently. Returns the responses in the same order as `urls`.
+        """
+        return await asyncio.gather(*(self.get(url, force_live=force_live) for url in urls))
+
+
+async_session = AsyncAFLTablesSession()
@@ -0,0 +1,202 @@
+import sqlite3
+import time
+import zlib
+from datetime import timezone
+
+from requests_cache.backends.base import BaseCache
+from requests_cache.backends.sqlite import SQLiteCache, SQLiteDict
+
+# Default maximum size of the compressed pages in the cache. Pages which never expire are never evicted,
+# so only they can take the cache past this size.
+DEFAULT_MAX_SIZE = 1024 ** 3
+
+# Access times are only written back when they are older than this, so cache hits rarely write
+ACCESS_RESOLUTION = 60
+
+
+def _zstd():
+    # zstandard is optional: pages are compressed with zlib (gzip) if it is not installed
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def _compress(data: bytes, level: int = None) -> tuple:
+    zstandard = _zstd()
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=level or 10).compress(data)
+    return "zlib", zlib.compress(data, level or 6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        zstandard = _zstd()
+        if zstandard is None:
+            raise KeyError("page was compressed with zstd, which is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    return data
+
+
+class CompressedSQLiteDict(SQLiteDict):
+    """
+    SQLite table of compressed, serialised responses, with least-recently-used eviction.
+     - Each response is compressed with zstd (if installed) or zlib. The codec is saved with each row.
+     - When the compressed responses grow past `max_size`, the least recently used responses which expire
+     are deleted. Responses which never expire (eg pages of past seasons) are never evicted.
+     - The total size of the responses is kept up to date on each write, rather than summed over the table.
+     It is summed again after responses are deleted other than by eviction, and before evicting.
+    """
+
+    def __init__(
+        self, db_path, table_name: str = "responses", max_size: int = DEFAULT_MAX_SIZE, level: int = None, **kwargs
+    ):
+        self.max_size = max_size
+        self.level = level
+        self._size = None  # Total size of the compressed responses, or None if it must be summed again
+        super().__init__(db_path, table_name=table_name, **kwargs)
+
+    def init_db(self):
+        self.close()
+        self._size = None
+        with self._lock, self.connection(commit=True) as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table_name} "
+                "(key PRIMARY KEY, value BLOB, codec TEXT, size INTEGER, raw_size INTEGER, expires REAL, "
+                "accessed REAL)"
+            )
+            con.execute(f"CREATE INDEX IF NOT EXISTS {self.table_name}_lru ON {self.table_name} (accessed)")
+
+    def __getitem__(self, key):
+        with self.connection() as con:
+            row = con.execute(
+                f"SELECT value, codec, accessed FROM {self.table_name} WHERE key=?", (key,)
+            ).fetchone()
+        if not row:
+            raise KeyError(key)
+
+        value, codec, accessed = row
+        now = time.time()
+        if now - accessed > ACCESS_RESOLUTION:
+            with self.connection(commit=True) as con:
+                con.execute(f"UPDATE {self.table_name} SET accessed=? WHERE key=?", (now, key))
+
+        return self.serializer.loads(_decompress(codec, value))
+
+    def __setitem__(self, key, value):
+        raw = self.serializer.dumps(value)
+        codec, data = _compress(raw, self.level)
+        expires = getattr(value, "expires", None)
+        if expires is not None:
+            expires = expires.replace(tzinfo=timezone.utc).timestamp()
+
+        with self._lock:
+            with self.connection(commit=True) as con:
+                replaced = con.execute(f"SELECT size FROM {self.table_name} WHERE key=?", (key,)).fetchone()
+                con.execute(
+                    f"INSERT OR REPLACE INTO {self.table_name} (key, value, codec, size, raw_size, expires, accessed) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, sqlite3.Binary(data), codec, len(data), len(raw), expires, time.time()),
+                )
+            if self._size is not None:
+                self._size += len(data) - (replaced[0] if replaced else 0)
+            self.evict()
+
+    def __delitem__(self, key):
+        with self._lock:
+            self._size = None
+            super().__delitem__(key)
+
+    def bulk_delete(self, keys=None, values=None):
+        with self._lock:
+            self._size = None
+            super().bulk_delete(keys=keys, values=values)
+
+    def _total_size(self, con) -> int:
+        return con.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table_name}").fetchone()[0]
+
+    def evict(self):
+        """Deletes the least recently used responses which expire, until the cache is within `max_size`."""
+        if self.max_size is None:
+            return
+
+        with self._lock, self.connection(commit=True) as con:
+            if self._size is None:
+                self._size = self._total_size(con)
+            if self._size <= self.max_size:
+                return
+
+            # Summed again before evicting, as other processes may have written to the cache
+            size = self._total_size(con)
+            if size <= self.max_size:
+                self._size = size
+                return
+
+            evicted = []
+            for key, row_size in con.execute(
+                f"SELECT key, size FROM {self.table_name} WHERE expires IS NOT NULL ORDER BY accessed"
+            ):
+                if size <= self.max_size:
+                    break
+                evicted.append((key,))
+                size -= row_size
+            con.executemany(f"DELETE FROM {self.table_name} WHERE key=?", evicted)
+            self._size = size
+
+    def stats(self) -> dict:
+        """Returns the number of responses and their compressed (and uncompressed) size."""
+        with self.connection() as con:
+            entries, size, raw_size, permanent = con.execute(
+                f"SELECT COUNT(key), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0), "
+                f"COALESCE(SUM(expires IS NULL), 0) FROM {self.table_name}"
+            ).fetchone()
+
+        return {
+            "entries": entries,
+            "permanent_entries": permanent,
+            "bytes": size,
+            "raw_bytes": raw_size,
+            "max_bytes": self.max_size,
+        }
+
+
+class CompressedSQLiteCache(SQLiteCache):
+    """
+    Session cache backend which saves compressed pages in a single SQLite file, with a maximum size and
+    least-recently-used eviction (see `CompressedSQLiteDict`).
+
+    Parameters
+    ----------
+        db_path : str (required)
+            SQLite file path (".sqlite" is appended if there is no extension)
+        max_size : int
+            maximum size in bytes of the compressed pages (None for no limit). Pages which never expire are
+            kept even if they alone are larger.
+        level : int
+            compression level (default: 10 for zstd, 6 for zlib)
+        kwargs :
+            other `requests_cache.backends.sqlite.SQLiteCache` arguments, eg `use_cache_dir`
+    """
+
+    def __init__(self, db_path="http_cache", max_size: int = DEFAULT_MAX_SIZE, level: int = None, **kwargs):
+        BaseCache.__init__(self, cache_name=str(db_path), **kwargs)
+        self.responses = CompressedSQLiteDict(
+            db_path, table_name="responses", max_size=max_size, level=level, **kwargs
+        )
+        self.redirects = SQLiteDict(db_path, table_name="redirects", **kwargs)
+
+    @property
+    def max_size(self) -> int:
+        return self.responses.max_size
+
+    @max_size.setter
+    def max_size(self, value: int):
+        self.responses.max_size = value
+        self.responses.evict()
+
+    def stats(self) -> dict:
+        return self.responses.stats()
@@ -0,0 +1,540 @@
+import os
+import shutil
+import threading
+import time
+import urllib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from typing import Iterable, Iterator
+
+from requests import Request
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from requests_cache.session import CacheMixin
+from requests_cache.models import AnyResponse, CachedResponse, set_response_defaults
+from requests_cache.policy import CacheActions, get_expiration_datetime
+
+from pyAFL import config
+from pyAFL.base.metrics import metrics
+from pyAFL.session.backends import CompressedSQLiteCache
+from pyAFL.session.freshness import FreshnessPolicy
+from pyAFL.session.rewriters import LINK_REWRITERS
+
+# Response header used to record which link rewriter (and version) produced the cached html.
+REWRITER_HEADER = "X-pyAFL-Rewriter"
+# Folder (in the cache dir) of the filesystem cache of earlier versions, one file per page
+LEGACY_CACHE_NAME = "pyAFL_html_cache"
+
+
+class __AFLTablesCachedSession(CachedSession):
+
+    def __init__(self, *args, link_rewriter: str = "soup", freshness: FreshnessPolicy = None, **kwargs):
+        """
+        Parameters
+        ----------
+            link_rewriter : str
+                name of the link rewriter applied to every page before it is cached (see `LINK_REWRITERS`).
+                "soup" (default) re-serialises the page with BeautifulSoup's `prettify()`.
+                "fast" only rewrites the `href` values and leaves the rest of the bytes alone.
+            freshness : FreshnessPolicy
+                decides how long each page stays fresh (see `pyAFL.session.freshness`). If None, pages
+                expire after `expire_after` (or `urls_expire_after`).
+        """
+        super().__init__(*args, **kwargs)
+        self.link_rewriter = link_rewriter
+        self.freshness = freshness
+        self.snapshot = None
+        self.base_url = None
+        self._counts = Counter()
+        self._counts_lock = threading.Lock()
+        # Outcome ("hit", "miss" or "revalidated") of the request being sent by the current thread, for `metrics`
+        self._outcome = threading.local()
+        # Rewrite links as a response hook, which requests runs *before* requests_cache stores a new response.
+        # Cache hits which already carry the current rewriter version are then returned untouched.
+        self.hooks["response"].append(self._rewrite_links_hook)
+
+    @property
+    def link_rewriter(self) -> str:
+        return self._link_rewriter
+
+    @link_rewriter.setter
+    def link_rewriter(self, name: str):
+        if name not in LINK_REWRITERS:
+            raise ValueError(f"Unknown link rewriter '{name}'. Choose one of: {', '.join(LINK_REWRITERS)}")
+        self._link_rewriter = name
+
+    @property
+    def rewriter_version(self) -> str:
+        return LINK_REWRITERS[self.link_rewriter][1]
+
+    def _rewrite_links_hook(self, response: AnyResponse, *args, **kwargs) -> AnyResponse:
+        """ Rewrites the response html once, and stamps it with the rewriter version.
+            - New responses are rewritten before requests_cache saves them.
+            - Cached responses stamped with the current version are returned as-is (no parse, no write).
+            - Cached responses from another (or no) rewriter version are rewritten and saved again.
+              Note: switching from "soup" to "fast" does not undo the prettify of pages already cached;
+              clear the cache for byte-identical pages.
+        """
+        if response.headers.get(REWRITER_HEADER) == self.rewriter_version or response.status_code == 304:
+            return response
+
+        with metrics.timer("rewrite", url=response.url, bytes=len(response.content)):
+            self.post_process(response.url, response)
+        response.headers[REWRITER_HEADER] = self.rewriter_version
+
+        if getattr(response, "from_cache", False):
+            self.cache.save_response(response, response.cache_key, response.expires)
+
+        return response
+
+    def post_process(self, url: str, response: AnyResponse):
+        """ Converts the relative urls to absolute urls.
+            - Finds all <a> tags using the session's `link_rewriter`
+            - If the `href` value is a relative url, prepend it with the current request url.
+
+            Reasoning:
+            - afltable.com uses relative urls (eg `../teams/richmond_idx.html` rather
+            than `https://afltables.com/afl/teams/richmond_idx.html`).
+        """
+        rewriter, _ = LINK_REWRITERS[self.link_rewriter]
+        response._content = rewriter(url, response.content)
+
+        return response
+
+    def _count(self, name: str):
+        with self._counts_lock:
+            self._counts[name] += 1
+
+    def cache_stats(self, reset: bool = False) -> dict:
+        """
+        Returns a report of the cache: its size, and how many requests it has served since the session
+        was created (or last reset).
+
+        Parameters
+        ----------
+            reset : bool
+                If True, resets the request counts after reporting them
+
+        Returns
+        ----------
+            stats : dict
+                entries : number of cached pages
+                permanent_entries : number of cached pages which never expire (None if unknown)
+                bytes, raw_bytes : size of the cached pages as stored, and uncompressed (None if unknown)
+                max_bytes : maximum size of the cache (None if unlimited)
+                requests : number of requests
+                hits : requests served from the cache without contacting the server
+                revalidated : requests for expired pages which had not changed (304)
+                misses : requests which downloaded the page
+                hit_rate : proportion of requests which did not download the page (None if no requests)
+        """
+        if hasattr(self.cache, "stats"):
+            stats = self.cache.stats()
+        else:
+            stats = {
+                "entries": len(self.cache.responses),
+                "permanent_entries": None,
+                "bytes": None,
+                "raw_bytes": None,
+                "max_bytes": None,
+            }
+
+        with self._counts_lock:
+            requests = self._counts["requests"]
+            misses = self._counts["misses"]
+            revalidated = self._counts["revalidated"]
+            if reset:
+                self._counts.clear()
+
+        stats.update(
+            requests=requests,
+            hits=requests - misses - revalidated,
+            revalidated=revalidated,
+            misses=misses,
+            hit_rate=(requests - misses) / requests if requests else None,
+        )
+        return stats
+
+    def use_snapshot(self, path):
+        """
+        Mounts an offline snapshot bundle (see `pyAFL.session.snapshot`). While it is mounted, every page is
+        served from the bundle, and a page which is not in it raises `SnapshotMissError` rather than being
+        fetched. The request cache is not used.
+
+        Parameters
+        ----------
+            path : str or Snapshot (required)
+                bundle to mount, or None to unmount the current bundle and use the network again
+
+        Returns
+        ----------
+            snapshot : Snapshot
+                the mounted bundle (None if unmounted)
+        """
+        from pyAFL.session.snapshot import Snapshot
+
+        if self.snapshot is not None:
+            self.snapshot.close()
+        self.snapshot = path if path is None or isinstance(path, Snapshot) else Snapshot(path)
+
+        return self.snapshot
+
+    def use_base_url(self, base_url: str):
+        """
+        Sends the requests for afltables pages to another server, eg a local stand-in server replaying
+        recorded pages (see `pyAFL.testing.server`). Only the transport changes: the urls of requests,
+        responses, cache keys and rewritten links stay afltables urls, so the cache, the local store and
+        the models behave exactly as against afltables.com.
+
+        Parameters
+        ----------
+            base_url : str (required)
+                url the pages below `config.AFLTABLES_STATS_BASE_URL` are fetched from instead (eg
+                "http://127.0.0.1:8000/afl/"), or None to fetch them from afltables.com again
+        """
+        self.adapters.pop(config.AFLTABLES_STATS_BASE_URL, None)
+        self.base_url = None if base_url is None else base_url.rstrip("/") + "/"
+        if self.base_url is not None:
+            self.mount(config.AFLTABLES_STATS_BASE_URL, _BaseUrlAdapter(self))
+
+    def transport_url(self, url: str) -> str:
+        """Returns the url a request for `url` is sent to (see `use_base_url`)."""
+        if self.base_url is not None and url.startswith(config.AFLTABLES_STATS_BASE_URL):
+            return self.base_url + url[len(config.AFLTABLES_STATS_BASE_URL):]
+        return url
+
+    def send(self, request, **kwargs) -> AnyResponse:
+        self._count("requests")
+        self._outcome.value = "snapshot" if self.snapshot is not None else "hit"
+        start = time.perf_counter()
+        try:
+            if self.snapshot is not None:
+                response = self.snapshot.response(request.url)
+                response.request = request
+            else:
+                response = super().send(request, **kwargs)
+        except Exception:
+            seconds = time.perf_counter() - start
+            metrics.record("request", url=request.url, outcome="error", status=None, seconds=seconds)
+            raise
+
+        self._record_request(request.url, self._outcome.value, response, time.perf_counter() - start)
+        return response
+
+    def _record_request(self, url: str, outcome: str, response: AnyResponse, seconds: float):
+        if outcome != "hit" and response.status_code >= 400:
+            outcome = "error"
+        status, size = response.status_code, len(response.content)
+        metrics.record("request", url=url, outcome=outcome, status=status, seconds=seconds, bytes=size)
+
+    def stats(self, reset: bool = False) -> dict:
+        """
+        Returns the instrumentation of pyAFL (see `pyAFL.base.metrics`): fetch latency and outcomes, bytes read,
+        link rewriting, parse time per page type and DataFrame construction time, with a report of the request
+        cache (see `cache_stats`) and of the parsed page cache (see `pyAFL.base.memo`).
+
+        Parameters
+        ----------
+            reset : bool
+                If True, resets the totals and counts after reporting them
+
+        Returns
+        ----------
+            stats : dict
+                requests, rewrite, parse, frames : see `Metrics.stats`
+                cache : see `cache_stats`
+                parse_cache : entries and size of the parsed page cache (see `ParseCache.stats`)
+        """
+        from pyAFL.base.memo import parse_cache
+
+        stats = metrics.stats(reset=reset)
+        stats["cache"] = self.cache_stats(reset=reset)
+        stats["parse_cache"] = parse_cache.stats()
+        return stats
+
+    def get(self, url, force_live=False, **kwargs) -> AnyResponse:
+        # If `force_live` kwarg is provided, skip reading from the request cache.
+        # The live response still replaces the cached copy, so later requests see the fresh page.
+        if force_live:
+            headers = dict(kwargs.pop("headers", None) or {})
+            headers["Cache-Control"] = "no-cache"
+            return super().get(url, headers=headers, **kwargs)
+
+        # Else apply normal request caching logic
+        return super().get(url, **kwargs)
+
+    def get_many(
+        self,
+        urls: Iterable[str],
+        max_workers: int = 8,
+        per_host_rate: float = None,
+        force_live: bool = False,
+        **kwargs,
+    ) -> Iterator[AnyResponse]:
+        """
+        Fetches many urls concurrently, yielding each response as soon as it is available.
+         - Fresh cache hits are yielded straight away from the calling thread, without using a worker.
+         - Cache misses (and every url when `force_live` is set) are fetched by a bounded thread pool,
+         sharing this session's connection pool, and yielded in order of completion.
+         - Each distinct url is fetched once. An exception raised by any request is re-raised here,
+         and requests which have not started yet are cancelled.
+
+        Parameters
+        ----------
+            urls : iterable of str (required)
+                urls to fetch
+            max_workers : int
+                maximum number of requests in flight at once
+            per_host_rate : float
+                maximum number of requests per second sent to any single host (unlimited if None)
+            force_live : bool
+                If True, does not use cached requests (see `get`)
+
+        Returns
+        ----------
+            responses : iterator
+                iterator of responses, in order of completion
+        """
+        if self.snapshot is not None:
+            # Pages are read from the memory-mapped bundle, which is faster than handing them to threads
+            for url in dict.fromkeys(urls):
+                yield self.get(url, **kwargs)
+            return
+
+        misses = []
+        for url in dict.fromkeys(urls):
+            cached_response = None if force_live else self._get_fresh_cached_response(url)
+            if cached_response is not None:
+                self._count("requests")
+                metrics.record(
+                    "request", url=url, outcome="hit", status=cached_response.status_code, seconds=0.0,
+                    bytes=len(cached_response.content),
+                )
+                yield cached_response
+            else:
+                misses.append(url)
+
+        if not misses:
+            return
+
+        self._ensure_pool_size(max_workers)
+        rate_limiter = _HostRateLimiter(per_host_rate) if per_host_rate else None
+
+        def fetch(url):
+            if rate_limiter:
+                rate_limiter.wait(url)
+            return self.get(url, force_live=force_live, **kwargs)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(fetch, url) for url in misses]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _cache_key(self, request) -> str:
+        """Returns the cache key `send` would use for a prepared `request`."""
+        settings = self.merge_environment_settings(request.url, {}, None, None, None)
+        return self.cache.create_key(request, verify=settings["verify"])
+
+    def _get_cached_response(self, url: str):
+        """Returns the cached response for a GET request for `url` (even if it has expired), or None."""
+        request = self.prepare_request(Request("GET", url))
+        return self.cache.get_response(self._cache_key(request))
+
+    def _get_fresh_cached_response(self, url: str):
+        """Returns the cached response a GET request for `url` would be served, or None if it is missing or expired."""
+        response = self._get_cached_response(url)
+
+        if response is None or response.is_expired:
+            return None
+        return self._rewrite_links_hook(response)
+
+    def _send_and_cache(self, request, actions: CacheActions, cached_response: CachedResponse = None, **kwargs):
+        """
+        Sends `request` and caches the response. Replaces `CachedSession._send_and_cache`, so that the expiry of
+        every page is set by `self.freshness`.
+         - If the cached page has expired, the request is conditional (`actions.validation_headers`). When the
+         page has not changed (304), the cached page is returned with a new expiry, without being rewritten.
+        """
+        request.headers.update(actions.validation_headers)
+        response = super(CacheMixin, self).send(request, **kwargs)  # requests.Session.send
+
+        return self._save_response(actions, response, cached_response)
+
+    def _save_response(self, actions: CacheActions, response, cached_response: CachedResponse = None) -> AnyResponse:
+        actions.update_from_response(response)
+        if cached_response is not None and response.status_code == 304:
+            self._count("revalidated")
+            self._outcome.value = "revalidated"
+            self._set_expiry(actions, cached_response)
+            return self._update_revalidated_response(actions, response, cached_response)
+
+        self._count("misses")
+        self._outcome.value = "miss"
+        self._set_expiry(actions, response)
+        if self._is_cacheable(response, actions):
+            self.cache.save_response(response, actions.cache_key, actions.expires)
+
+        return set_response_defaults(response, actions.cache_key)
+
+    def _set_expiry(self, actions: CacheActions, response):
+        # A max-age sent with the request (eg `session.get(url, expire_after=...)`) takes precedence
+        if self.freshness is not None and "max-age" not in actions.request_directives:
+            actions.expire_after = self.freshness.expire_after(response.url, response.content)
+
+    def _cache_response(self, request, response, cached_response: CachedResponse = None) -> AnyResponse:
+        """
+        Rewrites and caches a `response` to `request` which was fetched outside of this session (eg by
+        `pyAFL.session.aio`), applying the same rewriting, expiry and cacheability rules as `send`.
+         - If `response` is a 304 to a conditional request for `cached_response`, `cached_response` is
+         returned with a new expiry.
+        """
+        actions = CacheActions.from_request(
+            cache_key=self._cache_key(request),
+            request=request,
+            cache_control=self.cache_control,
+            session_expire_after=self.expire_after,
+            urls_expire_after=self.urls_expire_after,
+        )
+        self._rewrite_links_hook(response)
+
+        return self._save_response(actions, response, cached_response)
+
+    def _ensure_pool_size(self, size: int):
+        """Grows the connection pool of the http(s) adapters so that `size` threads can share it."""
+        for prefix in ("https://", "http://"):
+            adapter = self.get_adapter(prefix)
+            if isinstance(adapter, HTTPAdapter) and adapter._pool_maxsize < size:
+                self.mount(
+                    prefix,
+                    HTTPAdapter(
+                        pool_connections=adapter._pool_connections,
+                        pool_maxsize=size,
+                        max_retries=adapter.max_retries,
+                    ),
+                )
+        adapter = self.adapters.get(config.AFLTABLES_STATS_BASE_URL)
+        if isinstance(adapter, _BaseUrlAdapter) and adapter._pool_maxsize < size:
+            self.mount(config.AFLTABLES_STATS_BASE_URL, _BaseUrlAdapter(self, pool_maxsize=size))
+
+
+class _BaseUrlAdapter(HTTPAdapter):
+    """
+    Sends requests to `session.transport_url(url)` rather than `url`, and returns the responses as if
+    they came from `url` (see `use_base_url`).
+    """
+
+    def __init__(self, session, **kwargs):
+        super().__init__(**kwargs)
+        self.session = session
+
+    def send(self, request, **kwargs):
+        url = request.url
+        request.url = self.session.transport_url(url)
+        try:
+            response = super().send(request, **kwargs)
+        finally:
+            request.url = url
+        response.url = url
+        return response
+
+
+class _HostRateLimiter(object):
+    """
+    Spaces out requests to each host so that no more than `rate` requests per second are started.
+    Safe to share between threads.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str):
+        host = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def migrate_legacy_cache(session, path: str) -> int:
+    """
+    Moves the pages cached by earlier versions of pyAFL (one file per page, in the `pyAFL_html_cache` folder)
+    into the cache of `session`, then deletes the folder. Called once, when the shared session is created.
+     - The pages expire as set by `session.freshness` (eg past seasons never expire), and their links are
+     rewritten when they are first used.
+     - Pages which cannot be read (eg cached by another version of requests_cache) are dropped.
+
+    Parameters
+    ----------
+        session : __AFLTablesCachedSession (required)
+        path : str (required)
+            folder of the filesystem cache
+
+    Returns
+    ----------
+        migrated : int
+            number of pages moved (0 if there is no folder)
+    """
+    if not os.path.isdir(path):
+        return 0
+
+    from requests_cache.backends.filesystem import FileDict
+
+    migrated = 0
+    legacy = FileDict(path)
+    for key in list(legacy.keys()):
+        try:
+            response = legacy[key]
+        except Exception:  # Unreadable or truncated file, or pickled by another version of requests_cache
+            continue
+        if response.status_code != 200:
+            continue
+
+        if session.freshness is None:
+            expires = response.expires
+        else:
+            expires = get_expiration_datetime(session.freshness.expire_after(response.url, response.content))
+        session.cache.save_response(response, key, expires)  # Both caches key pages the same way
+        migrated += 1
+
+    shutil.rmtree(path, ignore_errors=True)
+    return migrated
+
+
+def create_session() -> "__AFLTablesCachedSession":
+    """
+    Creates the shared session (see `pyAFL.session.session`), which opens the request cache. Called when the
+    shared session is first used.
+     - `PYAFL_BASE_URL` fetches the afltables pages from another server (eg a local stand-in server, see
+     `pyAFL.testing.server`)
+     - `PYAFL_SNAPSHOT` serves every page from an offline snapshot bundle (eg on machines without network access)
+     - The filesystem cache of earlier versions is moved into the request cache (see `migrate_legacy_cache`)
+    """
+    session = __AFLTablesCachedSession(
+        config.cache_path("pyAFL_html_cache.sqlite"),  # Saved in the cache dir (the user cache dir by default)
+        backend=CompressedSQLiteCache,     # Compressed pages in one SQLite file, with LRU eviction of expiring pages
+        max_size=1024 ** 3,                # Maximum size of the compressed pages (1 GB)
+        cache_control=False,               # Use Cache-Control response headers for expiration, if available
+        freshness=FreshnessPolicy(),       # Past seasons never expire, current pages are revalidated after 6 hours
+        expire_after=timedelta(days=365),  # Only used if `freshness` is None
+        allowable_codes=[200],             # Cache 400 responses as a solemn reminder of your failures
+        allowable_methods=['GET'],         # Cache whatever HTTP methods you want
+        stale_if_error=False,               # In case of request errors, use stale cache data if possible
+    )
+
+    migrate_legacy_cache(session, config.cache_path(LEGACY_CACHE_NAME))
+
+    if os.environ.get("PYAFL_BASE_URL"):
+        session.use_base_url(os.environ["PYAFL_BASE_URL"])
+    if os.environ.get("PYAFL_SNAPSHOT"):
+        session.use_snapshot(os.environ["PYAFL_SNAPSHOT"])
+
+    return session
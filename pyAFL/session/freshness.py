@@ -0,0 +1,98 @@
+import re
+import urllib
+from datetime import datetime, timedelta
+
+from requests_cache.policy.actions import NEVER_EXPIRE
+
+# Pages of one season: the season page (seas/2019.html) and the yearly player stats page (stats/2019.html)
+SEASON_URL_RE = re.compile(r"/(?:seas|stats)/(\d{4})\.html$")
+PLAYER_URL_RE = re.compile(r"/stats/players/[A-Za-z]/[^/]+\.html$")
+ALLGAMES_URL_RE = re.compile(r"/teams/[^/]+/allgames\.html$")
+
+# The seasons a page has data for: player pages have a table per season headed eg "St Kilda - 1962", and
+# allgames pages have a date for each game, eg "Sat 28-Mar-1992 2:10 PM"
+PLAYER_SEASON_RE = re.compile(rb"[A-Za-z] - ((?:18|19|20)\d\d)\b")
+GAME_DATE_RE = re.compile(rb"\d\d-[A-Z][a-z]{2}-((?:18|19|20)\d\d)\b")
+
+
+class FreshnessPolicy(object):
+    """
+    Decides how long each afltables page stays fresh in the request cache.
+     - Pages of past seasons (`seas/{year}.html`, `stats/{year}.html`) never expire.
+     - Player pages and team `allgames` pages never expire once their last season is over, ie for retired
+     players and defunct teams. Otherwise they expire after `current_ttl`.
+     - Pages of the current season expire after `current_ttl`; every other page after `default_ttl`.
+
+    Expired pages are revalidated with a conditional request (If-None-Match / If-Modified-Since), so an
+    unchanged page costs a 304 response and is not downloaded or rewritten again.
+
+    Attributes
+    ----------
+    current_ttl : timedelta
+        freshness of pages which change during the current season
+    default_ttl : timedelta
+        freshness of every other page (eg the player index pages)
+    current_season : int
+        the current season (default: this year)
+
+    Methods
+    -------
+    expire_after(url, content=None)
+        returns how long the page at `url` stays fresh (`NEVER_EXPIRE` for pages which never change)
+    """
+
+    def __init__(
+        self,
+        current_ttl: timedelta = timedelta(hours=6),
+        default_ttl: timedelta = timedelta(days=1),
+        current_season: int = None,
+    ):
+        self.current_ttl = current_ttl
+        self.default_ttl = default_ttl
+        self._current_season = current_season
+
+    def __repr__(self):
+        return f"<FreshnessPolicy: current season {self.current_season}, {self.current_ttl} / {self.default_ttl}>"
+
+    @property
+    def current_season(self) -> int:
+        return self._current_season or datetime.now().year
+
+    @current_season.setter
+    def current_season(self, year: int):
+        self._current_season = year
+
+    def expire_after(self, url: str, content: bytes = None):
+        """
+        Returns how long the page at `url` stays fresh.
+
+        Parameters
+        ----------
+            url : str (required)
+                page url
+            content : bytes (optional)
+                page content, used to find the last season of player and allgames pages
+
+        Returns
+        ----------
+            expire_after : timedelta or int
+                freshness of the page, or `NEVER_EXPIRE` (-1)
+        """
+        path = urllib.parse.urlsplit(url or "").path
+
+        match = SEASON_URL_RE.search(path)
+        if match:
+            return NEVER_EXPIRE if int(match.group(1)) < self.current_season else self.current_ttl
+
+        if PLAYER_URL_RE.search(path):
+            pattern = PLAYER_SEASON_RE
+        elif ALLGAMES_URL_RE.search(path):
+            pattern = GAME_DATE_RE
+        else:
+            return self.default_ttl
+
+        # A player (or team) who played last season may still play this season
+        seasons = [int(year) for year in pattern.findall(content or b"")]
+        if seasons and max(seasons) < self.current_season - 1:
+            return NEVER_EXPIRE
+        return self.current_ttl
@@ -0,0 +1,65 @@
+import re
+import urllib
+
+from pyAFL import config
+from pyAFL.base.lazy import lazy_import
+
+bs4 = lazy_import("bs4")
+
+# Matches either an html comment (which is skipped) or an opening <a ...> tag.
+_COMMENT_OR_ANCHOR_RE = re.compile(rb"<!--.*?-->|<a\s[^>]*>", re.I | re.S)
+# Matches the href attribute inside an <a> tag. The value may be double quoted, single quoted or unquoted.
+_HREF_RE = re.compile(rb"""(\shref\s*=\s*)("[^"]*"|'[^']*'|[^\s"'>]+)""", re.I)
+
+
+def _absolute_url(url: str, href: str) -> str:
+    if href and "://" not in href:
+        return urllib.parse.urljoin(url, href)
+    return href
+
+
+def soup_rewriter(url: str, content: bytes) -> bytes:
+    """ Converts the relative urls to absolute urls using a full BeautifulSoup parse.
+        - Parses the html with the BeautifulSoup backend of `pyAFL.config.HTML_PARSER` (lxml by default)
+        - Rewrites the `href` of every <a> tag
+        - Re-serialises the whole document with `prettify()`
+    """
+    soup = bs4.BeautifulSoup(content, config.HTML_PARSER)
+    for link in soup.find_all("a"):
+        if link.attrs.get("href"):
+            link.attrs["href"] = _absolute_url(url, link.attrs.get("href"))
+
+    return soup.prettify("utf-8")
+
+
+def fast_rewriter(url: str, content: bytes) -> bytes:
+    """ Converts the relative urls to absolute urls in a single regex pass over the raw bytes.
+        - Only the `href` values of <a> tags are changed; every other byte of the page is left alone.
+        - <a> tags inside html comments are ignored.
+        - Attribute values are handled as latin-1 so that non-ascii bytes survive unchanged.
+    """
+
+    def rewrite_href(match):
+        prefix, value = match.group(1), match.group(2)
+        quote = value[:1] if value[:1] in (b'"', b"'") else b""
+        href = value[len(quote):len(value) - len(quote)].decode("latin-1")
+        absolute = _absolute_url(url, href.strip())
+        if absolute == href.strip():
+            return match.group(0)
+        return prefix + quote + absolute.encode("latin-1") + quote
+
+    def rewrite_tag(match):
+        tag = match.group(0)
+        if tag.startswith(b"<!--"):
+            return tag
+        return _HREF_RE.sub(rewrite_href, tag, count=1)
+
+    return _COMMENT_OR_ANCHOR_RE.sub(rewrite_tag, content)
+
+
+# Available link rewriters, keyed by name, with the version stamped onto cached responses.
+# Bump a version whenever its rewriter changes its output, so that old cache entries are upgraded lazily.
+LINK_REWRITERS = {
+    "soup": (soup_rewriter, "soup-2"),
+    "fast": (fast_rewriter, "fast-1"),
+}
@@ -1,61 +1,64 @@
-import sys
-import urllib
-from datetime import timedelta
-
-from bs4 import BeautifulSoup
-from requests_cache import CachedSession
-from requests_cache.models import AnyResponse
-
-
-class __AFLTablesCachedSession(CachedSession):
-
-    def request(
-        self,
-        method: str,
-        url: str,
-        *args,
-        **kwargs,
-    ) -> AnyResponse:
-        response = super().request(method, url, **kwargs)
-        self.cache.save_response(self.post_process(url, response))
-        return response
-
-    def post_process(self, url: str, response: AnyResponse):
-        """ Converts the relative urls to absolute urls.
-            - Parses the response html
-            - Finds all <a> tags
-            - If the `href` value is a relative url, prepend it with the current request url.
-
-            Reasoning:
-            - afltable.com uses relative urls (eg `../teams/richmond_idx.html` rather
-            than `https://afltables.com/afl/teams/richmond_idx.html`).
-        """
-        soup = BeautifulSoup(response.content, "html.parser")
-        for link in soup.findAll("a"):
-            if link.attrs.get("href") and "://" not in link.attrs.get("href"):
-                link.attrs["href"] = urllib.parse.urljoin(url, link.attrs.get("href"))
-        html_out = soup.prettify("utf-8")
-        response._content = html_out
-
-        return response
-
-    def get(self, url, force_live=False, **kwargs) -> AnyResponse:
-        # If `force_live` kwarg is provided, disable request cache.
-        if force_live:
-            with self.cache_disabled():
-                return super().get(url, **kwargs)
-
-        # Else apply normal request caching logic
-        return super().get(url, **kwargs)
-
-
-session = __AFLTablesCachedSession(
-    "test_db" if "pytest" in sys.modules else "pyAFL_html_cache",
-    backend="filesystem",
-    use_cache_dir=True,                # Save files in the default user cache dir
-    cache_control=False,               # Use Cache-Control response headers for expiration, if available
-    expire_after=timedelta(days=365),  # Otherwise expire responses after one day
-    allowable_codes=[200],             # Cache 400 responses as a solemn reminder of your failures
-    allowable_methods=['GET'],         # Cache whatever HTTP methods you want
-    stale_if_error=False,               # In case of request errors, use stale cache data if possible
-)
+import threading
+
+
+class _LazySession(object):
+    """
+    The shared session, created when it is first used (see `pyAFL.session.cached.create_session`).
+
+    Importing pyAFL does not import requests_cache or open the request cache: short-lived programs which
+    only need eg a team name or url do not pay for them. Every attribute is read from (and set on) the
+    session, so `session.get(url)`, `session.cache` or `session.link_rewriter = "fast"` work as on the
+    session itself.
+
+    Attributes
+    ----------
+    created : bool
+        whether the session has been created
+    """
+
+    def __init__(self):
+        object.__setattr__(self, "_session", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def __repr__(self):
+        return repr(self._session) if self.created else "<Session: not created yet>"
+
+    @property
+    def created(self) -> bool:
+        return self._session is not None
+
+    def _get(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    from pyAFL.session.cached import create_session
+
+                    object.__setattr__(self, "_session", create_session())
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._get(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._get(), name)
+
+    def __dir__(self):
+        return dir(self._get())
+
+
+def __getattr__(name):
+    # The session class, its helpers and constants are defined in `pyAFL.session.cached`. Dunder names
+    # (eg `__path__`, looked up by the import system) are not forwarded.
+    if not name.startswith("__"):
+        from pyAFL.session import cached
+
+        if hasattr(cached, name):
+            return getattr(cached, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Shared, cached session every afltables page is fetched with
+session = _LazySession()
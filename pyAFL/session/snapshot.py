@@ -0,0 +1,282 @@
+"""
+Offline snapshot bundles of afltables pages.
+
+A snapshot is a single file holding the (link-rewritten) pages of a scope of seasons, teams and players,
+each compressed separately, with a manifest of the pages and their offsets. A session with a snapshot
+mounted (`session.use_snapshot(path)`, or the `PYAFL_SNAPSHOT` environment variable) serves every page
+from the memory-mapped bundle and never touches the network.
+
+Create a snapshot from the command line:
+
+    python -m pyAFL.session.snapshot afl.snapshot --years 2000-2022 \\
+        --teams Richmond Geelong --players "Stuart Magee"
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+from datetime import datetime, timezone
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from pyAFL import config
+from pyAFL.base.exceptions import SnapshotMissError
+from pyAFL.session.backends import _compress, _decompress
+
+# Bump whenever the layout of the bundle changes
+SNAPSHOT_VERSION = 1
+
+# Header: magic, version, offset and length of the json manifest (written after the pages)
+_MAGIC = b"PYAFLSNP"
+_HEADER = struct.Struct("<8sIQQ")
+
+# Response headers kept with each page
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class Snapshot(object):
+    """
+    A snapshot bundle opened for reading. The file is memory-mapped, so a page read only decompresses
+    that page, and processes reading the same bundle share it in the page cache.
+
+    Attributes
+    ----------
+    path : str
+        bundle file
+    manifest : dict
+        version, creation time, link rewriter, scope and pages of the bundle
+
+    Methods
+    -------
+    read(url)
+        returns the content of the page at `url`
+    response(url)
+        returns a `requests.Response` for the page at `url`
+    verify()
+        checks the digest of every page
+    close()
+        unmaps the bundle
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, manifest_offset, manifest_size = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a pyAFL snapshot")
+        if version != SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(
+                f"{self.path} is a version {version} snapshot, but this pyAFL reads version {SNAPSHOT_VERSION}. "
+                "Create the snapshot again."
+            )
+
+        self.manifest = json.loads(self._map[manifest_offset:manifest_offset + manifest_size])
+        self._pages = self.manifest["pages"]
+
+    def __repr__(self):
+        return f"<Snapshot: {self.path}, {len(self)} pages>"
+
+    def __len__(self):
+        return len(self._pages)
+
+    def __contains__(self, url: str):
+        return url in self._pages
+
+    def __iter__(self):
+        return iter(self._pages)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _page(self, url: str) -> dict:
+        page = self._pages.get(url)
+        if page is None:
+            raise SnapshotMissError(
+                f"{url} is not in the snapshot {self.path}. Create the snapshot with it in scope, "
+                "or unmount the snapshot with `session.use_snapshot(None)` to use the network."
+            )
+        return page
+
+    def read(self, url: str) -> bytes:
+        """Returns the content of the page at `url`. Raises `SnapshotMissError` if it is not in the bundle."""
+        page = self._page(url)
+        return _decompress(page["codec"], self._map[page["offset"]:page["offset"] + page["size"]])
+
+    def response(self, url: str) -> Response:
+        """Returns a `requests.Response` for the page at `url`, as the session would have returned it."""
+        page = self._page(url)
+
+        response = Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = url
+        response.headers = CaseInsensitiveDict(page["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = self.read(url)
+        response.from_cache = True
+        return response
+
+    def verify(self) -> list:
+        """Returns the urls of the pages whose content does not match the digest in the manifest."""
+        return [
+            url for url, page in self._pages.items() if hashlib.sha1(self.read(url)).hexdigest() != page["sha1"]
+        ]
+
+    def close(self):
+        if not self._map.closed:
+            self._map.close()
+
+
+def snapshot_urls(years=(), teams=(), players=()) -> list:
+    """
+    Returns the urls of the pages a snapshot of this scope contains.
+     - For each year: the season page and the yearly player stats page.
+     - For each team: the all-time players page and the all-time games page.
+     - For each player: the player page, and the index page their name is looked up on.
+
+    Parameters
+    ----------
+        years : iterable of int
+        teams : iterable of pyAFL.teams.models.Team
+        players : iterable of pyAFL.players.models.Player or str (player names)
+    """
+    from pyAFL.players.models import Player
+
+    urls = []
+    for year in years:
+        urls += [
+            config.AFLTABLES_STATS_BASE_URL + f"seas/{year}.html",
+            config.AFLTABLES_STATS_BASE_URL + f"stats/{year}.html",
+        ]
+    for team in teams:
+        urls += [team.all_time_players_url, team.all_time_games_url]
+    for player in players:
+        if isinstance(player, str):
+            words = player.split()
+            initial = words[min(1, len(words) - 1)][0].upper()
+            urls.append(config.AFLTABLES_STATS_BASE_URL + f"stats/players{initial}_idx.html")
+            player = Player(player)
+        urls.append(player.url)
+
+    return list(dict.fromkeys(urls))
+
+
+def create_snapshot(path: str, years=(), teams=(), players=(), urls=(), max_workers: int = 8) -> Snapshot:
+    """
+    Fetches every page of a scope (through the cached `pyAFL.session.session`) into one compressed
+    snapshot bundle, which `session.use_snapshot(path)` serves offline.
+
+    Parameters
+    ----------
+        path : str (required)
+            bundle file to write (replaced atomically)
+        years : iterable of int
+            seasons to include
+        teams : iterable of pyAFL.teams.models.Team
+            teams to include
+        players : iterable of pyAFL.players.models.Player or str
+            players (or player names) to include
+        urls : iterable of str
+            any other pages to include
+        max_workers : int
+            maximum number of requests in flight at once
+
+    Returns
+    ----------
+        snapshot : Snapshot
+            the new bundle, opened for reading
+    """
+    from pyAFL.session import session
+
+    years, teams, players = list(years), list(teams), list(players)
+    pages = {}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(b"\0" * _HEADER.size)
+            all_urls = snapshot_urls(years, teams, players) + list(urls)
+            for response in session.get_many(all_urls, max_workers=max_workers):
+                response.raise_for_status()
+                codec, data = _compress(response.content)
+                pages[response.url] = {
+                    "offset": f.tell(),
+                    "size": len(data),
+                    "raw_size": len(response.content),
+                    "codec": codec,
+                    "sha1": hashlib.sha1(response.content).hexdigest(),
+                    "headers": {name: response.headers[name] for name in _KEPT_HEADERS if name in response.headers},
+                }
+                f.write(data)
+
+            manifest = {
+                "version": SNAPSHOT_VERSION,
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "link_rewriter": session.rewriter_version,
+                "scope": {
+                    "years": years,
+                    "teams": [team.name for team in teams],
+                    "players": [player if isinstance(player, str) else player.name for player in players],
+                },
+                "pages": pages,
+            }
+            manifest_offset = f.tell()
+            manifest_size = f.write(json.dumps(manifest).encode())
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, SNAPSHOT_VERSION, manifest_offset, manifest_size))
+    except BaseException:
+        # Eg a missing page or a failed request: no partial bundle is left behind
+        os.remove(tmp_path)
+        raise
+
+    os.replace(tmp_path, path)
+    return Snapshot(path)
+
+
+def _years(values: list) -> list:
+    # "2010-2015" or "2010"
+    years = []
+    for value in values:
+        match = re.fullmatch(r"(\d{4})(?:-(\d{4}))?", value)
+        if match is None:
+            raise argparse.ArgumentTypeError(f"Invalid year or range of years: {value}")
+        years += range(int(match.group(1)), int(match.group(2) or match.group(1)) + 1)
+    return years
+
+
+def _teams(names: list) -> list:
+    from pyAFL.teams import ALL_TEAMS
+
+    teams = {team.name.lower(): team for team in ALL_TEAMS}
+    unknown = [name for name in names if name.lower() not in teams]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown teams: {', '.join(unknown)}")
+    return [teams[name.lower()] for name in names]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Creates an offline snapshot bundle of afltables pages.")
+    parser.add_argument("path", help="bundle file to write")
+    parser.add_argument("--years", nargs="*", default=[], help="seasons, eg 2019 or 2010-2015")
+    parser.add_argument("--teams", nargs="*", default=[], help="team names, eg Richmond")
+    parser.add_argument("--players", nargs="*", default=[], help='player names, eg "Stuart Magee"')
+    parser.add_argument("--max-workers", type=int, default=8, help="maximum number of requests in flight")
+    args = parser.parse_args()
+
+    with create_snapshot(
+        args.path, _years(args.years), _teams(args.teams), args.players, max_workers=args.max_workers
+    ) as snapshot:
+        print(f"Wrote {len(snapshot)} pages to {snapshot.path}")
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pyAFL.session import session
+from pyAFL.session.aio import AsyncAFLTablesSession
+
+
+def _run(coroutine_fn):
+    async def main():
+        async with AsyncAFLTablesSession() as async_session:
+            return await coroutine_fn(async_session)
+
+    return asyncio.run(main())
+
+
+class TestAsyncSession:
+
+    @pytest.fixture(autouse=True, scope="function")
+    def before_each(self):
+        session.cache.clear()
+
+    def test_async_response_is_rewritten_and_shared_with_sync_session(self, stand_in):
+        base_url, handler = stand_in
+        url = base_url + "/afl/stats/playersA_idx.html"
+
+        resp = _run(lambda s: s.get(url))
+
+        assert not resp.from_cache
+        assert f"{base_url}/afl/stats/players/A/Aaron_Black.html" in resp.text
+        sync_resp = session.get(url)
+        assert sync_resp.from_cache
+        assert sync_resp.content == resp.content
+        assert handler.hits["/afl/stats/playersA_idx.html"] == 1
+
+    def test_cached_pages_are_not_refetched(self, stand_in):
+        base_url, handler = stand_in
+        url = base_url + "/afl/stats/playersA_idx.html"
+        session.get(url)
+
+        resp = _run(lambda s: s.get(url))
+
+        assert resp.from_cache
+        assert handler.hits["/afl/stats/playersA_idx.html"] == 1
+
+    def test_cached_pages_are_rewritten_off_the_loop(self, stand_in, monkeypatch):
+        base_url, _ = stand_in
+        url = base_url + "/afl/stats/playersA_idx.html"
+        session.get(url)
+        rewrite = session._get()._rewrite_links_hook
+        threads = []
+
+        def rewrite_links_hook(response, *args, **kwargs):
+            threads.append(threading.current_thread())
+            return rewrite(response, *args, **kwargs)
+
+        monkeypatch.setattr(session, "_rewrite_links_hook", rewrite_links_hook)
+        _run(lambda s: s.get(url))
+
+        assert threads and threading.main_thread() not in threads
+
+    def test_force_live_refetches(self, stand_in):
+        base_url, handler = stand_in
+        url = base_url + "/afl/stats/playersA_idx.html"
+        session.get(url)
+
+        resp = _run(lambda s: s.get(url, force_live=True))
+
+        assert not resp.from_cache
+        assert handler.hits["/afl/stats/playersA_idx.html"] == 2
+
+    def test_missing_pages_are_not_cached(self, stand_in):
+        base_url, _ = stand_in
+        url = base_url + "/afl/seas/1800.html"
+
+        resp = _run(lambda s: s.get(url))
+
+        assert resp.status_code == 404
+        assert not session.get(url).from_cache
+
+    def test_requests_run_concurrently_on_one_loop(self, stand_in):
+        base_url, handler = stand_in
+        handler.latency = 0.2
+        urls = [f"{base_url}/afl/seas/{year}.html" for year in range(2010, 2020)]
+
+        start = time.monotonic()
+        responses = _run(lambda s: s.get_many(urls))
+
+        assert [resp.url for resp in responses] == urls
+        # One after another, the requests take 2s. The bound leaves room for starting the loop and the client
+        assert time.monotonic() - start < 0.2 * len(urls) * 3 / 4
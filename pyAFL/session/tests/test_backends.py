@@ -0,0 +1,145 @@
+import os
+from datetime import timedelta
+
+import pytest
+from requests_cache import CachedSession
+
+from pyAFL import config
+from pyAFL.session import backends, session
+from pyAFL.session.backends import CompressedSQLiteCache
+from pyAFL.session.cached import LEGACY_CACHE_NAME, REWRITER_HEADER, create_session
+from pyAFL.session.freshness import FreshnessPolicy
+
+
+@pytest.fixture
+def cached_session(tmp_path, stand_in):
+    base_url, handler = stand_in
+    handler.pages.update({f"/afl/page{i}.html": (b"<p>%d</p>" % i) * 2000 for i in range(6)})
+    cache = CompressedSQLiteCache(str(tmp_path / "cache"), max_size=None)
+    return CachedSession(backend=cache, expire_after=timedelta(days=1)), base_url, handler
+
+
+def _cached_pages(s):
+    return {s.cache.responses[key].url.rsplit("/", 1)[1] for key in list(s.cache.responses)}
+
+
+class TestCompressedSQLiteCache:
+    def test_pages_are_compressed(self, cached_session):
+        s, base_url, handler = cached_session
+        resp = s.get(base_url + "/afl/page0.html")
+
+        assert s.get(base_url + "/afl/page0.html").content == resp.content
+        assert handler.hits["/afl/page0.html"] == 1
+        stats = s.cache.stats()
+        assert stats["entries"] == 1
+        assert stats["bytes"] < stats["raw_bytes"] / 10
+
+    def test_lru_eviction_keeps_permanent_pages(self, cached_session, monkeypatch):
+        s, base_url, handler = cached_session
+        monkeypatch.setattr(backends, "ACCESS_RESOLUTION", -1)
+        s.get(base_url + "/afl/page0.html", expire_after=-1)  # never expires, eg a past season
+        for i in range(1, 4):
+            s.get(base_url + f"/afl/page{i}.html")
+        s.get(base_url + "/afl/page1.html")  # page 2 is now the least recently used expiring page
+
+        s.cache.max_size = s.cache.stats()["bytes"] - 1
+
+        assert _cached_pages(s) == {"page0.html", "page1.html", "page3.html"}
+
+        s.cache.max_size = 1
+        assert _cached_pages(s) == {"page0.html"}
+        assert s.cache.stats()["permanent_entries"] == 1
+
+    def test_writes_evict_least_recently_used(self, cached_session, monkeypatch):
+        s, base_url, _ = cached_session
+        monkeypatch.setattr(backends, "ACCESS_RESOLUTION", -1)
+        s.get(base_url + "/afl/page0.html")
+        s.cache.max_size = s.cache.stats()["bytes"] * 5 // 2  # room for two pages
+
+        for i in range(1, 6):
+            s.get(base_url + f"/afl/page{i}.html")
+
+        assert s.cache.stats()["entries"] == 2
+        assert s.cache.stats()["bytes"] <= s.cache.max_size
+
+    def test_size_is_kept_without_summing_the_table(self, cached_session, monkeypatch):
+        s, base_url, _ = cached_session
+        s.cache.max_size = 10 ** 9
+        s.get(base_url + "/afl/page0.html")
+        sums = []
+        total_size = backends.CompressedSQLiteDict._total_size
+        monkeypatch.setattr(
+            backends.CompressedSQLiteDict, "_total_size", lambda self, con: sums.append(1) or total_size(self, con)
+        )
+
+        for i in range(1, 6):
+            s.get(base_url + f"/afl/page{i}.html")
+        key = list(s.cache.responses)[0]
+        s.cache.responses[key] = s.cache.responses[key]  # replaces a saved response
+
+        assert not sums
+        assert s.cache.responses._size == s.cache.stats()["bytes"]
+        s.cache.responses.bulk_delete(keys=list(s.cache.responses)[:2])
+        s.cache.responses.evict()
+        assert s.cache.responses._size == s.cache.stats()["bytes"]
+
+    def test_clear(self, cached_session):
+        s, base_url, _ = cached_session
+        s.get(base_url + "/afl/page0.html")
+        s.cache.clear()
+
+        assert s.cache.stats()["entries"] == 0
+
+
+class TestCacheStats:
+
+    @pytest.fixture(autouse=True, scope="function")
+    def before_each(self):
+        session.cache.clear()
+        session.cache_stats(reset=True)
+
+    def test_hits_and_misses(self, stand_in):
+        base_url, _ = stand_in
+        url = base_url + "/afl/stats/playersA_idx.html"
+        session.get(url)
+        session.get(url)
+        list(session.get_many([url]))
+
+        stats = session.cache_stats()
+
+        assert stats["entries"] == 1
+        assert stats["bytes"] > 0
+        assert (stats["requests"], stats["hits"], stats["misses"], stats["revalidated"]) == (3, 2, 1, 0)
+        assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+    def test_revalidations(self, stand_in, monkeypatch):
+        base_url, _ = stand_in
+        monkeypatch.setattr(session, "freshness", FreshnessPolicy(current_ttl=timedelta(0), current_season=2019))
+        session.get(base_url + "/afl/seas/2019.html")
+        session.get(base_url + "/afl/seas/2019.html")
+
+        stats = session.cache_stats(reset=True)
+
+        assert (stats["requests"], stats["hits"], stats["misses"], stats["revalidated"]) == (2, 0, 1, 1)
+        assert stats["hit_rate"] == 0.5
+        assert session.cache_stats()["requests"] == 0
+
+
+class TestLegacyCache:
+    def test_filesystem_cache_is_migrated_once(self, tmp_path, cached_session, monkeypatch):
+        _, base_url, handler = cached_session
+        legacy_path = str(tmp_path / LEGACY_CACHE_NAME)
+        legacy = CachedSession(legacy_path, backend="filesystem")
+        legacy.get(base_url + "/afl/page0.html")
+        legacy.get(base_url + "/afl/page1.html")
+        (tmp_path / LEGACY_CACHE_NAME / "truncated.pickle").write_bytes(b"\x80")
+        hits = dict(handler.hits)
+
+        monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path))
+        s = create_session()
+        resp = s.get(base_url + "/afl/page0.html")
+
+        assert s.cache_stats()["entries"] == 2
+        assert resp.from_cache and resp.headers[REWRITER_HEADER] == s.rewriter_version
+        assert handler.hits == hits
+        assert not os.path.exists(legacy_path)
@@ -0,0 +1,124 @@
+import asyncio
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from pyAFL.seasons.models import Season
+from pyAFL.session import session
+from pyAFL.session.aio import AsyncAFLTablesSession
+from pyAFL.session.freshness import NEVER_EXPIRE, FreshnessPolicy
+from pyAFL.testing.fixtures import GAMES_PAGE, PLAYER_PAGE, season_page
+
+SEASON_URL = "https://afltables.com/afl/seas/{}.html"
+PLAYER_URL = "https://afltables.com/afl/stats/players/S/Stuart_Magee.html"
+ALLGAMES_URL = "https://afltables.com/afl/teams/adelaide/allgames.html"
+
+
+class TestFreshnessPolicy:
+    policy = FreshnessPolicy(current_ttl=timedelta(hours=1), default_ttl=timedelta(days=2), current_season=2019)
+
+    def test_past_seasons_never_expire(self):
+        assert self.policy.expire_after(SEASON_URL.format(2018)) == NEVER_EXPIRE
+        assert self.policy.expire_after("https://afltables.com/afl/stats/1990.html") == NEVER_EXPIRE
+
+    def test_current_season_expires(self):
+        assert self.policy.expire_after(SEASON_URL.format(2019)) == timedelta(hours=1)
+        assert self.policy.expire_after("https://afltables.com/afl/stats/2019.html") == timedelta(hours=1)
+
+    def test_retired_players_never_expire(self):
+        assert self.policy.expire_after(PLAYER_URL, PLAYER_PAGE) == NEVER_EXPIRE
+
+    def test_active_players_expire(self):
+        page = PLAYER_PAGE.replace(b"St Kilda - 1963", b"St Kilda - 2018")
+
+        assert self.policy.expire_after(PLAYER_URL, page) == timedelta(hours=1)
+        assert self.policy.expire_after(PLAYER_URL) == timedelta(hours=1)
+
+    def test_allgames_pages(self):
+        assert FreshnessPolicy(current_season=2030).expire_after(ALLGAMES_URL, GAMES_PAGE.encode()) == NEVER_EXPIRE
+        current_page = GAMES_PAGE.replace("1992", "2019").encode()
+        assert self.policy.expire_after(ALLGAMES_URL, current_page) == timedelta(hours=1)
+
+    def test_other_pages(self):
+        assert self.policy.expire_after("https://afltables.com/afl/stats/playersA_idx.html") == timedelta(days=2)
+
+
+class TestRevalidation:
+
+    @pytest.fixture(autouse=True, scope="function")
+    def before_each(self, monkeypatch):
+        session.cache.clear()
+        # Pages of the 2015 season are historical; pages of the 2019 season expire straight away
+        monkeypatch.setattr(session, "freshness", FreshnessPolicy(current_ttl=timedelta(0), current_season=2019))
+
+    def test_historical_page_never_expires(self, stand_in):
+        base_url, handler = stand_in
+        resp = session.get(base_url + "/afl/seas/2015.html")
+
+        assert session.cache.get_response(resp.cache_key).expires is None
+        assert session.get(base_url + "/afl/seas/2015.html").from_cache
+        assert handler.hits["/afl/seas/2015.html"] == 1
+
+    def test_unchanged_page_is_revalidated(self, stand_in, monkeypatch):
+        base_url, handler = stand_in
+        url = base_url + "/afl/seas/2019.html"
+        resp1 = session.get(url)
+
+        monkeypatch.setattr(session, "post_process", Mock(side_effect=AssertionError("unchanged page was rewritten")))
+        resp2 = session.get(url)
+
+        assert resp2.from_cache
+        assert resp2.content == resp1.content
+        assert handler.hits["/afl/seas/2019.html"] == 2
+        assert handler.not_modified["/afl/seas/2019.html"] == 1
+
+    def test_changed_page_is_downloaded(self, stand_in):
+        base_url, handler = stand_in
+        url = base_url + "/afl/seas/2019.html"
+        session.get(url)
+        handler.pages["/afl/seas/2019.html"] = b"<html><body>Season 2019 (updated)</body></html>"
+
+        resp = session.get(url)
+
+        assert not resp.from_cache
+        assert "updated" in resp.text
+        assert "/afl/seas/2019.html" not in handler.not_modified
+
+    def test_async_session_revalidates(self, stand_in):
+        base_url, handler = stand_in
+        url = base_url + "/afl/seas/2019.html"
+        session.get(url)
+
+        async def main():
+            async with AsyncAFLTablesSession() as async_session:
+                return await async_session.get(url)
+
+        resp = asyncio.run(main())
+
+        assert resp.from_cache
+        assert "Season 2019" in resp.text
+        assert handler.not_modified["/afl/seas/2019.html"] == 1
+
+    def test_unchanged_season_is_not_parsed_again(self, stand_in, monkeypatch):
+        base_url, handler = stand_in
+        handler.pages["/afl/seas/2019.html"] = season_page(year=2019)
+        url = base_url + "/afl/seas/2019.html"
+        stats = Season(2019, url=url).get_season_stats()
+
+        monkeypatch.setattr(Season, "_parse_season_stats", Mock(side_effect=AssertionError("season was parsed")))
+        stored = Season(2019, url=url).get_season_stats()
+
+        assert handler.not_modified["/afl/seas/2019.html"] == 1
+        assert len(stored.season_matches) == len(stats.season_matches)
+
+    def test_changed_season_is_parsed_again(self, stand_in):
+        base_url, handler = stand_in
+        handler.pages["/afl/seas/2019.html"] = season_page(year=2019, rounds=3, finals=False)
+        url = base_url + "/afl/seas/2019.html"
+        Season(2019, url=url).get_season_stats()
+
+        handler.pages["/afl/seas/2019.html"] = season_page(year=2019, rounds=4, finals=False)
+        stats = Season(2019, url=url).get_season_stats()
+
+        assert len(stats.season_matches) == 4 * 8
@@ -0,0 +1,75 @@
+import re
+
+import pytest
+
+from pyAFL.session import session
+from pyAFL.session.rewriters import LINK_REWRITERS, fast_rewriter, soup_rewriter
+
+URL = "https://afltables.com/afl/stats/2019.html"
+HTML = b"""<html>
+<head><title>2019   Player Stats</title></head>
+<body>
+<!-- <a href="commented/out.html">ignored</a> -->
+<table><tr><th>Adelaide   [Game by Game]</th></tr>
+<tr><td><A HREF="players/B/Brad_Crouch.html">Crouch, Brad</A></td>
+<td><a class="x" href='../teams/adelaide_idx.html'>Adelaide</a></td>
+<td><a href=../seas/2019.html>2019</a></td>
+<td><a href="https://afltables.com/afl/afl_index.html">Home</a></td>
+<td><a name="top">No href</a> caf\xe9</td></tr>
+</table>
+</body>
+</html>"""
+
+
+HREF_VALUE_RE = re.compile(rb"""(href\s*=\s*)("[^"]*"|'[^']*'|[^\s"'>]+)""", re.I)
+
+
+def _hrefs(html):
+    return [value.strip(b"\"'") for _, value in HREF_VALUE_RE.findall(html)]
+
+
+class TestFastRewriter:
+    def test_relative_hrefs_are_made_absolute(self):
+        html = fast_rewriter(URL, HTML)
+
+        assert b'HREF="https://afltables.com/afl/stats/players/B/Brad_Crouch.html"' in html
+        assert b"href='https://afltables.com/afl/teams/adelaide_idx.html'" in html
+        assert b"href=https://afltables.com/afl/seas/2019.html>" in html
+        assert b'href="https://afltables.com/afl/afl_index.html"' in html
+
+    def test_only_href_values_change(self):
+        html = fast_rewriter(URL, HTML)
+
+        assert HREF_VALUE_RE.sub(rb"\1", html) == HREF_VALUE_RE.sub(rb"\1", HTML)
+
+    def test_commented_anchors_are_ignored(self):
+        assert b'<a href="commented/out.html">' in fast_rewriter(URL, HTML)
+
+    def test_hrefs_match_soup_rewriter(self):
+        # The first href is inside the html comment, which both rewriters leave alone
+        fast_hrefs = _hrefs(fast_rewriter(URL, HTML))[1:]
+        soup_hrefs = _hrefs(soup_rewriter(URL, HTML))[1:]
+
+        assert len(fast_hrefs) == 4
+        assert fast_hrefs == soup_hrefs
+
+
+class TestSessionLinkRewriter:
+    @pytest.fixture(autouse=True)
+    def restore_rewriter(self):
+        name = session.link_rewriter
+        yield
+        session.link_rewriter = name
+
+    def test_default_rewriter_is_soup(self):
+        assert session.link_rewriter == "soup"
+        assert session.rewriter_version == LINK_REWRITERS["soup"][1]
+
+    def test_rewriter_is_configurable(self):
+        session.link_rewriter = "fast"
+
+        assert session.rewriter_version == LINK_REWRITERS["fast"][1]
+
+    def test_unknown_rewriter_throws_exception(self):
+        with pytest.raises(ValueError):
+            session.link_rewriter = "regex"
@@ -1,8 +1,16 @@
+import importlib
+import time
+from unittest.mock import Mock
+
 import pytest
 import requests
 from requests_cache.models import CachedResponse, Response
 
 from pyAFL.session import session
+from pyAFL.session.cached import REWRITER_HEADER
+
+# Module the session class is defined in
+session_module = importlib.import_module("pyAFL.session.cached")
 
 
 class TestRequestCaching:
@@ -23,7 +31,7 @@ class TestRequestCaching:
         with pytest.raises(requests.exceptions.ConnectionError):
             session.get("https://abcdefgh")
 
-    def test_second_request_is_from_cache(self):
+    def test_second_request_is_from_cache(self, afltables):
         url = "https://afltables.com/afl/stats/playersA_idx.html"
 
         resp1 = session.get(url)
@@ -36,7 +44,7 @@ class TestRequestCaching:
         assert hasattr(resp2, "from_cache")
         assert resp2.from_cache
 
-    def test_all_requests_with_force_live_are_not_from_cache(self):
+    def test_all_requests_with_force_live_are_not_from_cache(self, afltables):
         url = "https://afltables.com/afl/stats/playersB_idx.html"
 
         resp1 = session.get(url, force_live=True)
@@ -53,3 +61,126 @@ class TestRequestCaching:
         assert isinstance(resp3, Response)
         assert hasattr(resp3, "from_cache")
         assert not resp3.from_cache
+
+
+class TestRewriteOnStore:
+
+    @pytest.fixture(autouse=True, scope="function")
+    def before_each(self):
+        session.cache.clear()
+
+    def test_links_are_rewritten_before_first_store(self, stand_in):
+        base_url, _ = stand_in
+        url = base_url + "/afl/stats/playersA_idx.html"
+
+        resp = session.get(url)
+        cached = session.cache.get_response(resp.cache_key)
+
+        assert f"{base_url}/afl/stats/players/A/Aaron_Black.html".encode() in resp.content
+        assert cached.content == resp.content
+        assert cached.headers[REWRITER_HEADER] == session.rewriter_version
+
+    def test_cache_hit_skips_post_process_and_save(self, stand_in, monkeypatch):
+        base_url, handler = stand_in
+        url = base_url + "/afl/stats/playersA_idx.html"
+        resp1 = session.get(url)
+
+        post_process = Mock(side_effect=AssertionError("cache hit was re-parsed"))
+        save_response = Mock(side_effect=AssertionError("cache hit was written back"))
+        monkeypatch.setattr(session, "post_process", post_process)
+        monkeypatch.setattr(session.cache, "save_response", save_response)
+
+        resp2 = session.get(url)
+
+        assert resp2.from_cache
+        assert resp2.content == resp1.content
+        assert handler.hits["/afl/stats/playersA_idx.html"] == 1
+
+    def test_old_rewriter_version_is_upgraded_lazily(self, stand_in):
+        base_url, handler = stand_in
+        url = base_url + "/afl/stats/playersA_idx.html"
+        resp = session.get(url)
+        key = resp.cache_key
+
+        stale = session.cache.get_response(key)
+        stale.headers[REWRITER_HEADER] = "soup-0"
+        stale._content = handler.pages["/afl/stats/playersA_idx.html"]
+        session.cache.save_response(stale, key)
+
+        upgraded = session.get(url)
+
+        assert upgraded.from_cache
+        assert f"{base_url}/afl/stats/players/A/Aaron_Black.html".encode() in upgraded.content
+        assert session.cache.get_response(key).headers[REWRITER_HEADER] == session.rewriter_version
+
+    def test_force_live_refreshes_the_stored_copy(self, stand_in):
+        base_url, handler = stand_in
+        url = base_url + "/afl/stats/playersA_idx.html"
+        session.get(url)
+
+        resp = session.get(url, force_live=True)
+
+        assert not resp.from_cache
+        assert handler.hits["/afl/stats/playersA_idx.html"] == 2
+        assert session.get(url).from_cache
+
+
+class TestGetMany:
+
+    @pytest.fixture(autouse=True, scope="function")
+    def before_each(self):
+        session.cache.clear()
+
+    def test_all_responses_are_yielded_once(self, stand_in):
+        base_url, handler = stand_in
+        urls = [f"{base_url}/afl/seas/{year}.html" for year in range(2010, 2020)]
+
+        responses = list(session.get_many(urls + urls[:3], max_workers=4))
+
+        assert sorted(resp.url for resp in responses) == sorted(urls)
+        assert all(resp.status_code == 200 for resp in responses)
+        assert all(hits == 1 for hits in handler.hits.values())
+
+    def test_requests_run_concurrently(self, stand_in):
+        base_url, handler = stand_in
+        handler.latency = 0.2
+        urls = [f"{base_url}/afl/seas/{year}.html" for year in range(2010, 2018)]
+
+        start = time.monotonic()
+        list(session.get_many(urls, max_workers=8))
+
+        assert time.monotonic() - start < 0.2 * len(urls) / 2
+
+    def test_cache_hits_do_not_use_a_worker(self, stand_in, monkeypatch):
+        base_url, handler = stand_in
+        urls = [f"{base_url}/afl/seas/{year}.html" for year in range(2010, 2013)]
+        list(session.get_many(urls))
+
+        monkeypatch.setattr(session_module, "ThreadPoolExecutor", Mock(side_effect=AssertionError("worker used")))
+        responses = list(session.get_many(urls))
+
+        assert all(resp.from_cache for resp in responses)
+        assert all(hits == 1 for hits in handler.hits.values())
+
+    def test_force_live_refetches_cached_urls(self, stand_in):
+        base_url, handler = stand_in
+        urls = [f"{base_url}/afl/seas/{year}.html" for year in range(2010, 2013)]
+        list(session.get_many(urls))
+
+        responses = list(session.get_many(urls, force_live=True))
+
+        assert not any(resp.from_cache for resp in responses)
+        assert all(hits == 2 for hits in handler.hits.values())
+
+    def test_per_host_rate_spaces_out_requests(self, stand_in):
+        base_url, _ = stand_in
+        urls = [f"{base_url}/afl/seas/{year}.html" for year in range(2010, 2015)]
+
+        start = time.monotonic()
+        list(session.get_many(urls, max_workers=5, per_host_rate=20))
+
+        assert time.monotonic() - start >= (len(urls) - 1) / 20
+
+    def test_request_errors_are_raised(self, stand_in):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            list(session.get_many(["https://abcdefgh"]))
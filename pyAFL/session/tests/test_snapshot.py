@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+import requests
+
+from pyAFL import config
+from pyAFL.base.exceptions import LookupError, SnapshotMissError
+from pyAFL.players.models import Player
+from pyAFL.seasons.models import Season
+from pyAFL.session import session
+from pyAFL.session.aio import async_session
+from pyAFL.session.snapshot import SNAPSHOT_VERSION, Snapshot, create_snapshot, snapshot_urls
+from pyAFL.testing.fixtures import season_page
+
+
+@pytest.fixture
+def bundle(tmp_path, stand_in, monkeypatch):
+    base_url, handler = stand_in
+    monkeypatch.setattr(config, "AFLTABLES_STATS_BASE_URL", base_url + "/afl/")
+    handler.pages["/afl/seas/2017.html"] = season_page()
+    handler.pages["/afl/stats/2017.html"] = b"<html><body>2017 player stats</body></html>"
+    player = Player("Stuart Magee", url=base_url + "/afl/stats/players/S/Stuart_Magee.html")
+
+    snapshot = create_snapshot(str(tmp_path / "afl.snapshot"), years=[2017], players=[player])
+    snapshot.close()
+    yield str(tmp_path / "afl.snapshot"), base_url, handler
+    session.use_snapshot(None)
+
+
+class TestSnapshot:
+    def test_bundle_has_manifest_and_pages(self, bundle):
+        path, base_url, _ = bundle
+
+        with Snapshot(path) as snapshot:
+            assert snapshot.manifest["version"] == SNAPSHOT_VERSION
+            assert snapshot.manifest["scope"] == {"years": [2017], "teams": [], "players": ["Stuart Magee"]}
+            assert set(snapshot) == {
+                base_url + "/afl/seas/2017.html",
+                base_url + "/afl/stats/2017.html",
+                base_url + "/afl/stats/players/S/Stuart_Magee.html",
+            }
+            assert b"13-Oct-1943" in snapshot.read(base_url + "/afl/stats/players/S/Stuart_Magee.html")
+            page = snapshot.manifest["pages"][base_url + "/afl/seas/2017.html"]
+            assert page["size"] < page["raw_size"]
+            assert snapshot.verify() == []
+
+    def test_snapshot_urls(self, monkeypatch):
+        from pyAFL.teams import RIC
+
+        player_url = "https://afltables.com/afl/stats/players/S/Stuart_Magee.html"
+        monkeypatch.setattr(Player, "_get_player_url", lambda self: player_url)
+        urls = snapshot_urls(years=[2019], teams=[RIC], players=["Stuart Magee"])
+
+        assert urls == [
+            "https://afltables.com/afl/seas/2019.html",
+            "https://afltables.com/afl/stats/2019.html",
+            "https://afltables.com/afl/stats/teams/richmond.html",
+            "https://afltables.com/afl/teams/richmond/allgames.html",
+            "https://afltables.com/afl/stats/playersM_idx.html",
+            "https://afltables.com/afl/stats/players/S/Stuart_Magee.html",
+        ]
+
+    def test_not_a_snapshot(self, tmp_path):
+        (tmp_path / "other").write_bytes(b"\0" * 64)
+
+        with pytest.raises(ValueError):
+            Snapshot(str(tmp_path / "other"))
+
+    def test_failed_fetch_leaves_no_temporary_file(self, tmp_path, stand_in, monkeypatch):
+        base_url, _ = stand_in
+        monkeypatch.setattr(config, "AFLTABLES_STATS_BASE_URL", base_url + "/afl/")
+
+        with pytest.raises(requests.HTTPError):
+            create_snapshot(str(tmp_path / "afl.snapshot"), urls=[base_url + "/afl/missing.html"])
+        session.cache.clear()
+
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestOfflineSession:
+    def test_pages_are_served_from_the_bundle(self, bundle):
+        path, base_url, handler = bundle
+        hits = dict(handler.hits)
+        session.use_snapshot(path)
+
+        stats = Season(2017, url=base_url + "/afl/seas/2017.html").get_season_stats(force_live=True)
+        player = Player("Stuart Magee", url=base_url + "/afl/stats/players/S/Stuart_Magee.html")
+        player_stats = player.get_player_stats(force_live=True)
+        pages = list(session.get_many([base_url + "/afl/seas/2017.html", base_url + "/afl/stats/2017.html"]))
+
+        assert len(stats.season_matches) > 0
+        assert list(player_stats.season_stats_total.Year) == ["1962", "1963", "Totals"]
+        assert [page.status_code for page in pages] == [200, 200]
+        assert handler.hits == hits
+
+    def test_miss_raises_instead_of_using_the_network(self, bundle):
+        path, base_url, handler = bundle
+        session.use_snapshot(path)
+
+        with pytest.raises(SnapshotMissError) as error:
+            session.get(base_url + "/afl/seas/2010.html")
+        assert isinstance(error.value, LookupError)
+        assert "/afl/seas/2010.html" not in handler.hits
+
+        with pytest.raises(SnapshotMissError):
+            asyncio.run(async_session.get(base_url + "/afl/seas/2011.html"))
+
+        session.use_snapshot(None)
+        assert session.get(base_url + "/afl/seas/2010.html").status_code == 200
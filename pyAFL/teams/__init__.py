@@ -1,4 +1,4 @@
-from pyAFL.teams.models import Team
+from pyAFL.teams.models import Team, season_stats_all_teams
 
 ADE = Team("Adelaide", "adelaide")
 BRI = Team("Brisbane Lions", "brisbanel")
@@ -65,4 +65,32 @@ CURRENT_TEAMS = [
     SYD,
     WCE,
     WBD,
-]
\ No newline at end of file
+]
+
+__all__ = [
+    "Team",
+    "season_stats_all_teams",
+    "ADE",
+    "BRI",
+    "BRB",
+    "CAR",
+    "COL",
+    "ESS",
+    "FIZ",
+    "FRE",
+    "GEE",
+    "GC",
+    "GWS",
+    "HAW",
+    "MEL",
+    "NOR",
+    "POR",
+    "RIC",
+    "STK",
+    "SYD",
+    "UNI",
+    "WCE",
+    "WBD",
+    "ALL_TEAMS",
+    "CURRENT_TEAMS",
+]
@@ -1,13 +1,34 @@
-import pandas as pd
-from bs4 import BeautifulSoup
+from __future__ import annotations
+
+import functools
 import re
+import threading
+from collections import OrderedDict
 
+from pyAFL import config
 from pyAFL.base.exceptions import LookupError
-from pyAFL.players.models import Player
+from pyAFL.base.executor import fetch_and_parse
+from pyAFL.base.lazy import lazy_import
+from pyAFL.base.memo import parse_cache
+from pyAFL.base.metrics import metrics
+from pyAFL.base.models import AFLObject
+from pyAFL.base.parsing import (
+    find_all,
+    find_first,
+    get_attribute,
+    get_text,
+    parse_html,
+    rows_to_frame,
+    table_rows,
+)
+from pyAFL.base.store import page_digest, store
+from pyAFL.players.models import Player, player_stats_many
 from pyAFL.session import session
 
+pd = lazy_import("pandas")
+
 
-class Team(object):
+class Team(AFLObject):
     """
     A class to represent an AFL Team.
 
@@ -31,10 +52,15 @@ class Team(object):
             name : str (required)
                 name of the person in format "[first] [last]"
             url_identifier : str (required)
-                string parameter used in AFLtables URLs to identify team. Note that the naming convention changes from team to team
-                Examples: - for Adelaide: url_identifier = "adelaide" (see https://afltables.com/afl/stats/teams/adelaide.html)
-                          - for Greater Western Sydney: url_identifier = "gws" (see https://afltables.com/afl/stats/teams/gws.html)
-                          - for Western Bulldogs: url_identifier = "bullldogs" (see https://afltables.com/afl/stats/teams/bullldogs.html)
+                string parameter used in AFLtables URLs to identify team. Note that the naming convention
+                changes from team to team
+                Examples:
+                 - for Adelaide: url_identifier = "adelaide"
+                   (see https://afltables.com/afl/stats/teams/adelaide.html)
+                 - for Greater Western Sydney: url_identifier = "gws"
+                   (see https://afltables.com/afl/stats/teams/gws.html)
+                 - for Western Bulldogs: url_identifier = "bullldogs"
+                   (see https://afltables.com/afl/stats/teams/bullldogs.html)
 
         """
 
@@ -61,6 +87,8 @@ class Team(object):
     def _get_players(self):
         """
         Returns a list of pyAFL.Player objects for all players contained in `self.all_time_players_url`
+         - The names and urls of the players are parsed once per page, and kept in the local store and the
+         parse cache.
 
         Returns
         ----------
@@ -68,19 +96,94 @@ class Team(object):
                 list of pyAFL.Player objects
 
         """
-        resp = session.get(self.all_time_players_url)
-        soup = BeautifulSoup(resp.text, "html.parser")
+        key = self.all_time_players_url
+        roster = self._get_object_from_db(kind="team_players", key=key)
+        if roster is None:
+            resp = session.get(self.all_time_players_url)
+            roster = self._get_object_from_db(response=resp, kind="team_players", key=key)
+            if roster is None:
+                roster = self._parse_players(resp.text)
+                self._save_object_to_db(roster, response=resp, kind="team_players", key=key, team=self.name)
+
+        return [Player(name, url=url) for name, url in roster]
+
+    def players_frame(self) -> pd.DataFrame:
+        """
+        Returns every player who has played for the team as one DataFrame, parsed once from the table of
+        `self.all_time_players_url` (see `parse_team_players_page`), without constructing a Player per row.
+         - The frame is kept in the local store and the parse cache, like `players`.
+
+        Returns
+        ----------
+            players : Pandas dataframe
+                one row per player: "Player" (as listed, eg "Magee, Stuart"), "Url" (of the player's page),
+                and the typed columns of the page (eg "Games", "Wins", "Draws", "Losses", "Goals",
+                "FirstSeason", "LastSeason")
+        """
+        key = self.all_time_players_url
+        roster = self._get_object_from_db(kind="team_roster", key=key)
+        if roster is None:
+            resp = session.get(self.all_time_players_url)
+            roster = self._get_object_from_db(response=resp, kind="team_roster", key=key)
+            if roster is None:
+                roster = parse_team_players_page(resp.text)
+                self._save_object_to_db(roster, response=resp, kind="team_roster", key=key, team=self.name)
+
+        return roster
+
+    def player_stats(
+        self, workers: int = 8, parse_workers: int = None, averages: bool = False, force_live: bool = False
+    ) -> pd.DataFrame:
+        """
+        Returns the career stats of every player who has played for the team, as one frame with a row per
+        player and season. The player pages are fetched concurrently and parsed in worker processes if
+        `parse_workers` is more than 1 (see `pyAFL.players.models.player_stats_many`); pages already parsed
+        are read from the local store.
+
+        Parameters
+        ----------
+            workers : int
+                maximum number of requests in flight at once
+            parse_workers : int
+                number of worker processes parsing pages (default: `pyAFL.base.executor.parse_executor`)
+            averages : bool
+                If True, returns the per-game averages of each season rather than the season totals
+            force_live : bool
+                If True, does not use the local store or the cached requests
+
+        Returns
+        ----------
+            player_stats : Pandas dataframe
+                "Player" and "Url" (as in `players_frame`), "Year", then the columns of the player pages'
+                season tables (for every team the player played for, see the "Team" column). The "Totals"
+                rows of the player pages are left out.
+        """
+        roster = self.players_frame()
+        players = [Player(name, url=url) for name, url in zip(roster["Player"], roster["Url"])]
+        stats = player_stats_many(players, max_workers=workers, parse_workers=parse_workers, force_live=force_live)
 
-        player_table = soup.find("table")
-        player_table_body = player_table.find("tbody")
-        player_anchor_tags = player_table_body.findAll("a")
+        frames = []
+        for player, player_stats in zip(players, stats):
+            df = player_stats.season_stats_average if averages else player_stats.season_stats_total
+            df = df[df["Year"].astype(str).str.fullmatch(r"\d{4}")]
+            frames.append(df.assign(Player=player.name, Url=player.url))
+        if not frames:
+            return pd.DataFrame(columns=["Player", "Url", "Year"])
 
-        players = [
-            Player(player.text, url=player.attrs.get("href"))
-            for player in player_anchor_tags
-        ]
+        player_stats = pd.concat(frames, ignore_index=True)
+        player_stats["Year"] = player_stats["Year"].astype("int16")
+        columns = ["Player", "Url"] + [column for column in player_stats.columns if column not in ("Player", "Url")]
+        return player_stats[columns]
 
-        return players
+    @metrics.timed("parse", page="team_players")
+    def _parse_players(self, html: str) -> list:
+        document = parse_html(html)
+
+        player_table = find_first(document, "table")
+        player_table_body = find_first(player_table, "tbody")
+        player_anchor_tags = find_all(player_table_body, "a")
+
+        return [(get_text(player), get_attribute(player, "href")) for player in player_anchor_tags]
 
     def season_stats(self, year: int):
         """
@@ -98,29 +201,63 @@ class Team(object):
                 dataframe summarising individual player (and team total) stats for the specified year.
 
         """
+        season_stats = self._get_object_from_db(kind="team_season_stats", key=f"{year}:{self.name}")
+        if season_stats is not None:
+            return season_stats
+
         season_player_stats_url = f"https://afltables.com/afl/stats/{year}.html"
         resp = session.get(season_player_stats_url)
 
-        if resp.status_code == 404:
-            raise Exception(f"Could not find season stats for year: {year}")
+        return self._parse_season_stats(year, resp)
+
+    async def season_stats_async(self, year: int):
+        """
+        Awaitable version of `season_stats`. The page is fetched with `pyAFL.session.aio.async_session`
+        and parsed in the event loop's default executor.
+
+        Parameters
+        ----------
+            year : int (required)
+                year as a four-digit integer (e.g. 2019)
+
+        Returns
+        ----------
+            season_stats : Pandas dataframe
+                dataframe summarising individual player (and team total) stats for the specified year.
+
+        """
+        import asyncio
+
+        from pyAFL.session.aio import async_session  # Imported here so that aiohttp is only loaded when used
+
+        loop = asyncio.get_running_loop()
+        season_stats = await loop.run_in_executor(
+            None, functools.partial(self._get_object_from_db, kind="team_season_stats", key=f"{year}:{self.name}")
+        )
+        if season_stats is not None:
+            return season_stats
+
+        resp = await async_session.get(f"https://afltables.com/afl/stats/{year}.html")
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        team_tables = soup.findAll("table")
+        return await loop.run_in_executor(None, self._parse_season_stats, year, resp)
 
-        for table in team_tables:
-            if table.find("th"):
-                stripped_string = table.find("th").text.replace("/n", "").strip()
-                if stripped_string.startswith(self.name):
-                    df = pd.read_html(str(table))
-                    break
+    def _parse_season_stats(self, year: int, resp):
+        # Stats saved from the same page (eg after a 304 revalidation) are returned without parsing it again
+        season_stats = self._get_object_from_db(response=resp, kind="team_season_stats", key=f"{year}:{self.name}")
+        if season_stats is not None:
+            return season_stats
 
-        if df is None:
+        season_stats = get_season_stats_page(year, resp).team_stats(self.name)
+
+        if season_stats is None:
             raise LookupError(
-                f"Could not find season stats table for team {self.name} in year {year} at URL https://afltables.com/afl/stats/{year}.html"
+                f"Could not find season stats table for team {self.name} in year {year} at URL "
+                f"https://afltables.com/afl/stats/{year}.html"
             )
 
-        season_stats = df[0]
-        season_stats.columns = season_stats.columns.droplevel()
+        self._save_object_to_db(
+            season_stats, response=resp, kind="team_season_stats", key=f"{year}:{self.name}", team=self.name, year=year
+        )
 
         return season_stats
 
@@ -128,9 +265,35 @@ class Team(object):
     def games(self):
         return self._get_games()
 
+    async def games_async(self):
+        """
+        Awaitable version of the `games` property. The page is fetched with `pyAFL.session.aio.async_session`
+        and parsed in the event loop's default executor.
+
+        Returns
+        ----------
+            games : Pandas dataframe
+                dataframe listing all games played by the team. Contains results and match metadata.
+
+        """
+        import asyncio
+
+        from pyAFL.session.aio import async_session  # Imported here so that aiohttp is only loaded when used
+
+        loop = asyncio.get_running_loop()
+        games = await loop.run_in_executor(None, self._get_stored_games)
+        if games is not None:
+            return games
+
+        resp = await async_session.get(self.all_time_games_url)
+
+        return await loop.run_in_executor(None, self._get_games_from_page, resp)
+
     def _get_games(self):
         """
         Returns a Pandas dataframe listing every match contained in `self.all_time_games_url`
+         - Games saved in the local store (`pyAFL.base.store.store`) are returned without fetching the page,
+         until the page expires (see `pyAFL.session.freshness`), and then without parsing it if it has not changed.
 
         Returns
         ----------
@@ -138,24 +301,353 @@ class Team(object):
                 dataframe listing all games played by the team. Contains results and match metadata.
 
         """
+        games = self._get_stored_games()
+        if games is not None:
+            return games
+
         resp = session.get(self.all_time_games_url)
-        soup = BeautifulSoup(resp.text, "html.parser")
 
-        seasons = soup.findAll("table")
+        return self._get_games_from_page(resp)
+
+    def _get_stored_games(self, resp=None):
+        return self._get_object_from_db(response=resp, kind="team_games", key=self.all_time_games_url)
+
+    def _get_games_from_page(self, resp):
+        games = self._get_stored_games(resp)
+        if games is not None:
+            return games
+
+        return self._save_games(self._parse_games(resp.text), resp)
+
+    def _save_games(self, games: pd.DataFrame, resp) -> pd.DataFrame:
+        if self._caching_enabled():
+            self._save_object_to_db(
+                games, response=resp, kind="team_games", key=self.all_time_games_url, name=self.name, team=self.name
+            )
+            store.put_games(self.name, games)
+
+        return games
+
+    # Bulk loading protocol (see `pyAFL.base.executor.fetch_and_parse`)
+    def _page_url(self) -> str:
+        return self.all_time_games_url
 
+    def _page_parser(self):
+        return functools.partial(parse_games_page, parser=config.HTML_PARSER)
+
+    def _get_stored_result(self, resp=None):
+        return self._get_stored_games(resp)
+
+    def _result_from_parsed(self, resp, parsed: pd.DataFrame) -> pd.DataFrame:
+        return self._save_games(parsed, resp)
+
+    def _parse_games(self, html: str):
+        return parse_games_page(html)
+
+
+@metrics.timed("parse", page="games")
+def parse_games_page(html: str, parser: str = None) -> pd.DataFrame:
+    """
+    Parses a team's all-time games page (`Team.all_time_games_url`) into one DataFrame of every game.
+    A module-level function, so that pages can be parsed in worker processes (see
+    `pyAFL.base.executor.ParseExecutor`). `parser` is the parser backend (see `pyAFL.base.parsing.parse_html`).
+    """
+    document = parse_html(html, parser)
+
+    # Every season table is read in a single pass over the page; the rows of all seasons are then
+    # converted to one frame. Seasons normally share their header, but any which differ are kept apart.
+    rows_by_header = OrderedDict()
+    for season_html in find_all(document, "table"):
+        head, body, foot = table_rows(season_html)
+        if not head:
+            continue
+        header = tuple(head[0])  # Column names are on the first header row
+        rows = (body + foot)[:-2]  # The last two rows of each season are its totals
+        rows_by_header.setdefault(header, []).extend(row + [""] * (len(header) - len(row)) for row in rows)
+    if not rows_by_header:
+        rows_by_header[GAMES_HEADER] = []  # No games: an empty frame, with the usual columns and types
+
+    with metrics.timer("frame", page="games") as fields:
+        games = pd.concat(
+            [pd.DataFrame(rows, columns=_unique_game_columns(header)) for header, rows in rows_by_header.items()],
+            ignore_index=True,
+        )
+        games = _games_dtypes(games)
+        games.index = pd.DatetimeIndex(games.Date, name="Date")
+        games = games.sort_index(kind="stable")
+        fields["rows"] = len(games)
+
+    return games
+
+
+@metrics.timed("parse", page="team_players")
+def parse_team_players_page(html: str, parser: str = None) -> pd.DataFrame:
+    """
+    Parses a team's players page (`Team.all_time_players_url`) into one typed DataFrame, with a row per
+    player who has played for the team: "Player" (as listed, eg "Magee, Stuart") and "Url" (of the
+    player's page), then the other columns of the page.
+     - The games column (eg "239 (130-2-107)") is split into "Games", "Wins", "Draws" and "Losses".
+     - "FirstSeason" and "LastSeason" are read from the "Seasons" column (eg "1962-1972").
+     - Dates of birth are dates, and the other columns of whole numbers are ints.
+    A module-level function, so that pages can be parsed in worker processes (see
+    `pyAFL.base.executor.ParseExecutor`). `parser` is the parser backend (see `pyAFL.base.parsing.parse_html`).
+    """
+    table = find_first(parse_html(html, parser), "table")
+    if table is None:
+        raise LookupError("Found no players table on the team's players page")
+
+    header = [" ".join(get_text(cell, " ").split()) for cell in find_all(find_first(table, "tr"), "th")]
+    rows = []
+    for row in find_all(table, "tr"):
+        anchor = find_first(row, "a")
+        if anchor is None:
+            continue  # Header (and totals) rows
+        cells = [" ".join(get_text(cell, " ").split()) for cell in find_all(row, "td")]
+        rows.append(cells + [""] * (len(header) - len(cells)) + [get_attribute(anchor, "href")])
+
+    with metrics.timer("frame", page="team_players") as fields:
+        roster = _roster_dtypes(pd.DataFrame(rows, columns=_unique_game_columns(tuple(header)) + ["Url"]))
+        fields["rows"] = len(roster)
+
+    return roster
+
+
+# Matches the games of a player for a team, with their wins, draws and losses, eg "239 (130-2-107)"
+ROSTER_GAMES_RE = r"^(?P<Games>\d+)(?: ?\((?P<Wins>\d+)-(?P<Draws>\d+)-(?P<Losses>\d+)\))?$"
+ROSTER_DATE_FORMATS = ("%d-%b-%Y", "%Y-%m-%d")  # Eg "13-Oct-1943"
+
+
+def _roster_dtypes(roster: pd.DataFrame) -> pd.DataFrame:
+    columns = {"Player": roster["Player"] if "Player" in roster else roster.iloc[:, 0], "Url": roster["Url"]}
+    for column in roster.columns:
+        values = roster[column]
+        if column in columns:
+            continue
+        elif column.startswith("Games"):
+            games = values.str.extract(ROSTER_GAMES_RE)
+            for name in games.columns:
+                if games[name].notna().any():
+                    columns[name] = _small_ints(games[name].fillna(""), "int16")
+        elif column == "Seasons":
+            columns[column] = values
+            years = values.str.findall(r"\d{4}")
+            columns["FirstSeason"] = _small_ints(years.str[0].fillna(""), "int16")
+            columns["LastSeason"] = _small_ints(years.str[-1].fillna(""), "int16")
+        elif column == "DOB":
+            columns[column] = _dates(values)
+        elif values.str.fullmatch(r"[\d,]*").all() and (values != "").any():
+            columns[column] = _small_ints(values, "int32")
+        else:
+            columns[column] = values
+
+    return pd.DataFrame(columns)
+
+
+def _dates(values: pd.Series) -> pd.Series:
+    # The first of `ROSTER_DATE_FORMATS` which every date is written in
+    for date_format in ROSTER_DATE_FORMATS:
+        dates = pd.to_datetime(values, format=date_format, errors="coerce")
+        if dates.notna().sum() == (values != "").sum():
+            return dates
+    return dates
+
+
+# Header of the `allgames.html` tables
+GAMES_HEADER = ("Rnd", "T", "Opponent", "Scoring", "F", "Scoring", "A", "R", "M", "W-D-L", "Venue", "Crowd", "Date")
+# Column names of the `allgames.html` tables, and the names they are given in `Team.games`
+GAMES_COLUMNS = {"A": "Against", "F": "For", "R": "Result", "M": "Margin"}
+# Each "Scoring" column (quarter by quarter scores) is named after the final score column which follows it
+GAMES_SCORING_COLUMNS = {"F": "ForScoring", "A": "AgainstScoring"}
+GAMES_DATE_FORMAT = "%a %d-%b-%Y %I:%M %p"  # Eg "Fri 22-Mar-1991 7:40 PM"
+
+
+def _unique_game_columns(header: tuple) -> list:
+    columns = []
+    for i, name in enumerate(header):
+        following = header[i + 1] if i + 1 < len(header) else None
+        if name == "Scoring" and following in GAMES_SCORING_COLUMNS:
+            name = GAMES_SCORING_COLUMNS[following]
+        name = GAMES_COLUMNS.get(name, name)
+        while name in columns:
+            name = f"{name}.1"
+        columns.append(name)
+
+    return columns
+
+
+def _small_ints(values: pd.Series, dtype: str) -> pd.Series:
+    # Numpy ints when every value is present, otherwise the equivalent nullable pandas ints (eg "Int16")
+    numbers = pd.to_numeric(values.str.replace(",", "", regex=False), errors="coerce")
+    if numbers.isna().any():
+        return numbers.astype(dtype.capitalize())
+    return numbers.astype(dtype)
+
+
+def _games_dtypes(games: pd.DataFrame) -> pd.DataFrame:
+    for column, dtype in (("For", "int16"), ("Against", "int16"), ("Margin", "int16"), ("Crowd", "int32")):
+        if column in games:
+            games[column] = _small_ints(games[column], dtype)
+
+    for column in ("Rnd", "T", "Opponent", "Result", "Venue"):
+        if column in games:
+            games[column] = games[column].astype("category")
+
+    dates = pd.to_datetime(games.Date, format=GAMES_DATE_FORMAT, errors="coerce")
+    # Dates in any other format (eg old games without a start time) are parsed one by one
+    other_format = dates.isna() & games.Date.ne("")
+    if other_format.any():
+        dates[other_format] = [pd.to_datetime(date, errors="coerce") for date in games.Date[other_format]]
+    games["Date"] = dates
+
+    return games
+
+
+class SeasonStatsPage(object):
+    """
+    A parsed `stats/{year}.html` page, which holds the season stats table of every team for one year.
+
+    The page is parsed once, into the text rows of each team's table (see `pyAFL.base.parsing.table_rows`).
+    Each team's table is converted to a DataFrame the first time it is asked for; callers receive a copy,
+    so the kept frame is never modified.
+
+    Attributes
+    ----------
+    year : int
+        season year
+    team_names : list
+        title of each team table (eg "Adelaide"), in page order
+    """
+
+    def __init__(self, year: int, html: str = None, tables: dict = None):
+        """
+        Parses the page `html`, or reuses the `tables` (team table title -> text rows) of an earlier parse.
+        """
+        self.year = year
+        self._frames = {}  # team table title -> DataFrame
+        self._lock = threading.Lock()
+
+        if tables is None:
+            tables = {}
+            with metrics.timer("parse", page="season_stats", bytes=len(html)):
+                for table in find_all(parse_html(html), "table"):
+                    th = find_first(table, "th")
+                    if th is not None and get_text(th).strip() not in tables:
+                        tables[get_text(th).strip()] = table_rows(table)
+        self._tables = tables  # team table title -> text rows
+
+    def __repr__(self):
+        return f"<SeasonStatsPage: {self.year}>"
+
+    @property
+    def team_names(self) -> list:
+        return [re.sub(r"\s*\[.*\]$", "", title) for title in self._tables]
+
+    def _frame(self, title: str) -> pd.DataFrame:
+        with self._lock:
+            if title not in self._frames:
+                with metrics.page("season_stats"):
+                    df = rows_to_frame(*self._tables[title])
+                df.columns = df.columns.droplevel()
+                self._frames[title] = df
+            return self._frames[title]
+
+    def team_stats(self, team_name: str):
+        """
+        Returns a copy of the season stats table whose title starts with `team_name`, or None if the page has none.
+        """
+        for title in self._tables:
+            if title.startswith(team_name):
+                return self._frame(title).copy()
+
+        return None
+
+    def all_teams(self) -> pd.DataFrame:
+        """
+        Returns the season stats tables of every team on the page as one DataFrame, with a "Team" column first.
+        """
         dfs = []
-        for season_html in seasons:
-            df = pd.read_html(str(season_html))[0]
-            df.columns = df.columns.droplevel(1)
-            df = df.iloc[0:-2, :]
+        for title, team_name in zip(self._tables, self.team_names):
+            df = self._frame(title).copy()
+            df.insert(0, "Team", team_name)
             dfs.append(df)
 
-        games = pd.concat(dfs)
-        games.index = pd.to_datetime(games.Date)
-        games = games.sort_index()
+        return pd.concat(dfs, ignore_index=True)
 
-        games = games.rename(
-            columns={"A": "Against", "F": "For", "R": "Result", "M": "Margin"}
-        )
 
-        return games
+def get_season_stats_page(year: int, resp) -> SeasonStatsPage:
+    """
+    Returns the parsed `stats/{year}.html` page for the response `resp`.
+     - The tables of parsed pages are kept in the parse cache (`pyAFL.base.memo.parse_cache`) and shared by
+     every Team. A page is parsed again only if its content changed (eg during a season).
+
+    Parameters
+    ----------
+        year : int (required)
+            year as a four-digit integer (e.g. 2019)
+        resp : requests.Response (required)
+            response for https://afltables.com/afl/stats/{year}.html
+
+    Returns
+    ----------
+        page : SeasonStatsPage
+    """
+    if resp.status_code == 404:
+        raise Exception(f"Could not find season stats for year: {year}")
+
+    digest = page_digest(resp.content)
+    tables = parse_cache.get("season_stats_page", year, Team.PARSER_VERSION, digest=digest)
+    if tables is not None:
+        return SeasonStatsPage(year, tables=tables)
+
+    page = SeasonStatsPage(year, resp.text)
+    parse_cache.put(
+        "season_stats_page", year, page._tables, Team.PARSER_VERSION, digest=digest, url=getattr(resp, "url", None)
+    )
+
+    return page
+
+
+def season_stats_all_teams(year: int) -> pd.DataFrame:
+    """
+    Returns the season stats of every team for the specified year as one Pandas dataframe, from a single
+    parse of https://afltables.com/afl/stats/{year}.html.
+
+    Parameters
+    ----------
+        year : int (required)
+            year as a four-digit integer (e.g. 2019)
+
+    Returns
+    ----------
+        season_stats : Pandas dataframe
+            dataframe of individual player (and team total) stats for the year, with a "Team" column.
+
+    """
+    resp = session.get(f"https://afltables.com/afl/stats/{year}.html")
+
+    return get_season_stats_page(year, resp).all_teams()
+
+
+def games_many(teams, max_workers: int = 8, parse_workers: int = None, force_live: bool = False) -> list:
+    """
+    Returns the games of many teams at once (see `pyAFL.base.executor.fetch_and_parse`). The pages are
+    fetched concurrently, and parsed in worker processes if `parse_workers` (or the shared
+    `parse_executor.workers`) is more than 1.
+
+    Parameters
+    ----------
+        teams : iterable of Team (required)
+            eg `pyAFL.teams.ALL_TEAMS`
+        max_workers : int
+            maximum number of requests in flight at once
+        parse_workers : int
+            number of worker processes parsing pages (default: `pyAFL.base.executor.parse_executor`)
+        force_live : bool
+            If True, does not use the local store or the cached requests
+
+    Returns
+    ----------
+        games : list
+            DataFrame of the games of each team (as `Team.games`), in the order of `teams`
+    """
+    return fetch_and_parse(teams, max_workers=max_workers, parse_workers=parse_workers, force_live=force_live)
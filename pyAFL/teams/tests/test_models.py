@@ -1,10 +1,19 @@
+from io import StringIO
+
 import pandas as pd
 import pytest
+import requests
+from bs4 import BeautifulSoup
 
 import pyAFL.teams
+from pyAFL.base.exceptions import LookupError
+from pyAFL.base.memo import parse_cache
+from pyAFL.base.metrics import metrics
 from pyAFL.players.models import Player
 from pyAFL.teams import ALL_TEAMS, CURRENT_TEAMS
-from pyAFL.teams.models import Team
+from pyAFL.teams import models as team_models
+from pyAFL.teams.models import Team, parse_team_players_page
+from pyAFL.testing.fixtures import GAMES_PAGE, ROSTER_PAGE, STATS_PAGE, player_page, team_players_page
 
 
 class TestTeamModel:
@@ -12,7 +21,7 @@ class TestTeamModel:
         with pytest.raises(TypeError):
             Team()
 
-    def test_team_property_players(self):
+    def test_team_property_players(self, afltables):
         test_team = ALL_TEAMS[0]
         players = test_team.players
 
@@ -21,7 +30,7 @@ class TestTeamModel:
         assert isinstance(players[0], Player)
         assert "https://afltables.com/afl/stats/players" in players[0].url
 
-    def test_team_method_season_stats_invalid_year(self):
+    def test_team_method_season_stats_invalid_year(self, afltables):
         test_team = ALL_TEAMS[0]
 
         with pytest.raises(Exception) as e1:
@@ -32,14 +41,15 @@ class TestTeamModel:
         assert "Could not find season stats for year" in str(e1)
         assert "Could not find season stats for year" in str(e2)
 
-    def test_team_method_season_stats_valid_year(self):
+    def test_team_method_season_stats_valid_year(self, afltables):
         test_team = CURRENT_TEAMS[0]
         season_stats = test_team.season_stats(2019)
 
         assert isinstance(season_stats, pd.DataFrame)
         assert "Player" in season_stats.columns
 
-    def test_team_method_season_stats_adelaide_and_portadelaide_naming_conflict(self):
+    def test_team_method_season_stats_adelaide_and_portadelaide_naming_conflict(self, afltables):
+        afltables.add_pages({"stats/2019.html": STATS_PAGE.encode()})
         adelaide_crows = pyAFL.teams.ADE
         port_adelaide = pyAFL.teams.POR
 
@@ -49,10 +59,176 @@ class TestTeamModel:
         assert port_adelaide_season_stats.Player[0] == "Boak, Travis"  # We expect to find Travis Boak in Port Adelaide
         assert adelaide_season_stats.Player[0] == "Crouch, Brad"  # We expect to find Brad Crouch in Adelaide Crows
 
-    def test_team_property_games(self):
+    def test_team_property_games(self, afltables):
         test_team = ALL_TEAMS[0]
         games = test_team.games
 
         assert isinstance(games, pd.DataFrame)
         assert isinstance(games.index, pd.DatetimeIndex)
         assert len(games.index) > len(games.loc["2019-01-01":"2019-08-01"].index)
+
+
+def _response(html: str, status_code: int = 200):
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp._content = html.encode()
+    resp.encoding = "utf-8"
+    return resp
+
+
+class TestTeamRoster:
+    def test_players_frame_from_page(self):
+        roster = parse_team_players_page(ROSTER_PAGE)
+
+        assert list(roster.columns) == [
+            "Player", "Url", "Cap", "#", "DOB", "Games", "Wins", "Draws", "Losses", "Goals",
+            "Seasons", "FirstSeason", "LastSeason",
+        ]
+        assert list(roster.Player) == ["Magee, Stuart", "Smith, Ross"]
+        assert roster.Url[0] == "https://afltables.com/afl/stats/players/S/Stuart_Magee.html"
+        assert list(roster.Games) == [239, 1]
+        assert list(roster.Wins) == [130, 0]
+        assert list(roster.Draws) == [2, 0]
+        assert list(roster.FirstSeason) == [1962, 2003]
+        assert list(roster.LastSeason) == [1972, 2003]
+        assert roster.DOB[0] == pd.Timestamp("1943-10-13")
+
+    def test_players_frame_dtypes(self):
+        roster = parse_team_players_page(team_players_page(count=50))
+
+        assert len(roster) == 50
+        for column in ("Games", "Wins", "Draws", "Losses", "FirstSeason", "LastSeason"):
+            assert roster[column].dtype == "int16"
+        assert roster.Goals.dtype == "int32"
+        assert roster.DOB.dtype.kind == "M"
+        assert (roster.Wins + roster.Draws + roster.Losses == roster.Games).all()
+
+    def test_players_frame_matches_players(self, afltables):
+        afltables.add_pages({"stats/teams/adelaide.html": team_players_page(count=5)})
+        roster = pyAFL.teams.ADE.players_frame()
+
+        assert list(roster.Player) == [player.name for player in pyAFL.teams.ADE.players]
+        assert list(roster.Url) == [player.url for player in pyAFL.teams.ADE.players]
+        assert sum(afltables.hits.values()) == 1
+
+    def test_player_stats_of_every_player(self, afltables):
+        afltables.add_pages({"stats/teams/adelaide.html": team_players_page(count=3)})
+        roster = pyAFL.teams.ADE.players_frame()
+        afltables.add_pages(
+            {url.split("/afl/", 1)[-1]: player_page(seasons=4, seed=i) for i, url in enumerate(roster.Url)}
+        )
+
+        stats = pyAFL.teams.ADE.player_stats(workers=2)
+
+        assert list(stats.columns[:4]) == ["Player", "Url", "Year", "Team"]
+        assert len(stats) == 3 * 4
+        assert list(stats.Player.unique()) == list(roster.Player)
+        assert stats.Year.dtype == "int16"
+        assert list(stats.Year[:4]) == [1962, 1963, 1964, 1965]
+
+
+class TestSeasonStatsPage:
+    def test_team_season_stats_from_page(self):
+        adelaide = pyAFL.teams.ADE._parse_season_stats(2019, _response(STATS_PAGE))
+        port_adelaide = pyAFL.teams.POR._parse_season_stats(2019, _response(STATS_PAGE))
+
+        assert list(adelaide.Player) == ["Crouch, Brad", "Sloane, Rory", "Totals"]
+        assert list(adelaide.KI) == [1001, 350, 1351]
+        assert port_adelaide.Player[0] == "Boak, Travis"
+
+    def test_page_is_parsed_once_per_year_and_content(self):
+        with metrics.profile() as profile:
+            pyAFL.teams.ADE._parse_season_stats(2019, _response(STATS_PAGE))
+            pyAFL.teams.POR._parse_season_stats(2019, _response(STATS_PAGE))
+        assert profile.stats()["parse"]["season_stats"]["count"] == 1
+
+        with metrics.profile() as profile:
+            pyAFL.teams.ADE._parse_season_stats(2019, _response(STATS_PAGE.replace("350", "351")))
+        assert profile.stats()["parse"]["season_stats"]["count"] == 1
+
+    def test_returned_frames_are_copies(self):
+        stats = pyAFL.teams.ADE._parse_season_stats(2019, _response(STATS_PAGE))
+        stats["KI"] = 0
+
+        assert pyAFL.teams.ADE._parse_season_stats(2019, _response(STATS_PAGE)).KI[0] == 1001
+
+    def test_missing_team_and_year(self):
+        with pytest.raises(LookupError):
+            pyAFL.teams.RIC._parse_season_stats(2019, _response(STATS_PAGE))
+        with pytest.raises(Exception) as e:
+            pyAFL.teams.ADE._parse_season_stats(2050, _response("", status_code=404))
+
+        assert "Could not find season stats for year" in str(e)
+
+    def test_all_teams(self):
+        page = team_models.get_season_stats_page(2019, _response(STATS_PAGE))
+        all_teams = page.all_teams()
+
+        assert page.team_names == ["Adelaide", "Port Adelaide"]
+        assert list(all_teams.columns) == ["Team", "#", "Player", "KI"]
+        assert list(all_teams.Team) == ["Adelaide"] * 3 + ["Port Adelaide"] * 2
+        assert list(all_teams.Player) == ["Crouch, Brad", "Sloane, Rory", "Totals", "Boak, Travis", "Totals"]
+
+    def test_pages_are_kept_in_the_parse_cache(self):
+        team_models.get_season_stats_page(2019, _response(STATS_PAGE))
+        assert parse_cache.get("season_stats_page", 2019, Team.PARSER_VERSION) is not None
+
+        parse_cache.invalidate(kind="season_stats_page")
+        with metrics.profile() as profile:
+            team_models.get_season_stats_page(2019, _response(STATS_PAGE))
+        assert profile.stats()["parse"]["season_stats"]["count"] == 1
+
+
+class TestTeamGames:
+    def test_games_from_page(self):
+        games = pyAFL.teams.ADE._parse_games(GAMES_PAGE)
+
+        assert list(games.columns) == [
+            "Rnd", "T", "Opponent", "ForScoring", "For", "AgainstScoring", "Against",
+            "Result", "Margin", "W-D-L", "Venue", "Crowd", "Date",
+        ]
+        assert isinstance(games.index, pd.DatetimeIndex)
+        assert list(games.index) == [
+            pd.Timestamp("1991-03-22 19:40"), pd.Timestamp("1992-03-28 14:10"), pd.Timestamp("1992-04-04"),
+        ]
+        assert list(games.Opponent) == ["Hawthorn", "Geelong", "Carlton"]
+        assert list(games.For) == [155, 68, 108]
+        assert list(games.Margin) == [93, -11, 45]
+        assert games.Crowd.iloc[0] == 44902
+        assert games.Crowd.isna().iloc[2]
+        assert games.ForScoring.iloc[0] == "6.2 11.3 19.6 24.11"
+
+    def test_games_dtypes(self):
+        games = pyAFL.teams.ADE._parse_games(GAMES_PAGE)
+
+        assert games.For.dtype == "int16"
+        assert games.Against.dtype == "int16"
+        assert games.Margin.dtype == "int16"
+        assert games.Crowd.dtype == "Int32"
+        for column in ("Opponent", "Venue", "Result"):
+            assert isinstance(games[column].dtype, pd.CategoricalDtype)
+
+    def test_games_from_page_without_tables(self):
+        games = team_models.parse_games_page("<html><body><p>No games</p></body></html>")
+
+        assert games.empty
+        assert list(games.columns) == list(pyAFL.teams.ADE._parse_games(GAMES_PAGE).columns)
+        assert games.For.dtype == "int16"
+        assert isinstance(games.index, pd.DatetimeIndex)
+
+    def test_games_match_per_table_read_html(self):
+        games = pyAFL.teams.ADE._parse_games(GAMES_PAGE)
+
+        dfs = []
+        for table in BeautifulSoup(GAMES_PAGE, "html.parser").find_all("table"):
+            df = pd.read_html(StringIO(str(table)))[0]
+            df.columns = df.columns.droplevel(1)
+            dfs.append(df.iloc[0:-2, :])
+        expected = pd.concat(dfs)
+        expected.index = pd.DatetimeIndex(expected.Date.map(pd.Timestamp))
+        expected = expected.sort_index()
+
+        assert list(games.Opponent.astype(str)) == list(expected.Opponent)
+        assert list(games.For) == list(expected.F)
+        assert list(games.Margin) == list(expected.M)
+        assert list(games.index) == list(expected.index)
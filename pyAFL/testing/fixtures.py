@@ -0,0 +1,423 @@
+"""
+afltables pages for tests and benchmarks.
+
+ - Synthetic pages, laid out like the afltables pages they stand in for: small pages for unit tests
+ (`PLAYER_PAGE`, `STATS_PAGE`, `ROSTER_PAGE`, `GAMES_PAGE`, `season_page`), and pages of roughly the size
+ of the real ones (`synthetic_pages`).
+ - Recorded pages: real afltables pages saved to a directory with `record_pages`, one file per page at
+ its path below the afltables base url (eg `DIR/seas/2019.html`), and read back with `load_pages`.
+
+Both can be served by `pyAFL.testing.server.StandInServer`. Record pages from the command line:
+
+    python -m pyAFL.testing.fixtures DIR seas/2019.html stats/2019.html teams/richmond/allgames.html
+"""
+import argparse
+import os
+import random
+from datetime import datetime, timedelta
+
+import requests
+
+from pyAFL import config
+
+PLAYER_PAGE = b"""<html>
+<body>
+<center>
+<b>Born:</b> 13-Oct-1943 (<b>Debut:</b> 18y 218d <b>Last:</b> 31y 321d)<br>
+<b>Height:</b> 180 cm <b>Weight:</b> 80 kg
+</center>
+<table>
+<thead><tr><th>Year</th><th>Team</th><th>GM</th><th>KI</th></tr></thead>
+<tbody>
+<tr><td>1962</td><td><a href="../../teams/stkilda_idx.html">St Kilda</a></td><td>12</td><td>100</td></tr>
+<tr><td>1963</td><td><a href="../../teams/stkilda_idx.html">St Kilda</a></td><td>10</td><td>80</td></tr>
+</tbody>
+<tfoot><tr><td>Totals</td><td></td><td>22</td><td>180</td></tr></tfoot>
+</table>
+<table>
+<thead><tr><th>Year</th><th>Team</th><th>GM</th><th>KI</th></tr></thead>
+<tbody>
+<tr><td>1962</td><td>St Kilda</td><td>12</td><td>8.33</td></tr>
+<tr><td>1963</td><td>St Kilda</td><td>10</td><td>8.00</td></tr>
+</tbody>
+</table>
+<table>
+<thead><tr><th colspan="3">St Kilda - 1962</th></tr><tr><th>Gm</th><th>Opponent</th><th>KI</th></tr></thead>
+<tbody><tr><td>1</td><td>Carlton</td><td>9</td></tr><tr><td>2</td><td>Geelong</td><td>7</td></tr></tbody>
+</table>
+<table>
+<thead><tr><th colspan="3">St Kilda - 1963</th></tr><tr><th>Gm</th><th>Opponent</th><th>KI</th></tr></thead>
+<tbody><tr><td>1</td><td>Essendon</td><td>8</td></tr></tbody>
+</table>
+</body>
+</html>"""
+
+
+# Yearly stats page (`stats/{year}.html`) of two teams whose names overlap
+STATS_PAGE = """<html><body>
+<table><thead><tr><th colspan="3">Adelaide [Game by Game]</th></tr>
+<tr><th>#</th><th>Player</th><th>KI</th></tr></thead>
+<tbody><tr><td>1</td><td>Crouch, Brad</td><td>1,001</td></tr>
+<tr><td>2</td><td>Sloane, Rory</td><td>350</td></tr></tbody>
+<tfoot><tr><td></td><td>Totals</td><td>1,351</td></tr></tfoot></table>
+<table><thead><tr><th colspan="3">Port Adelaide [Game by Game]</th></tr>
+<tr><th>#</th><th>Player</th><th>KI</th></tr></thead>
+<tbody><tr><td>10</td><td>Boak, Travis</td><td>400</td></tr></tbody>
+<tfoot><tr><td></td><td>Totals</td><td>400</td></tr></tfoot></table>
+</body></html>"""
+
+# Players page of a team (`stats/teams/{team}.html`) listing two players
+ROSTER_PAGE = """
+<table>
+<thead><tr><th>Cap</th><th>#</th><th>Player</th><th>DOB</th><th>Games (W-D-L)</th><th>Goals</th><th>Seasons</th>
+</tr></thead>
+<tbody>
+<tr><td>312</td><td>1</td>
+<td><a href="https://afltables.com/afl/stats/players/S/Stuart_Magee.html">Magee, Stuart</a></td>
+<td>13-Oct-1943</td><td>239 (130-2-107)</td><td>139</td><td>1962-1972</td></tr>
+<tr><td>1121</td><td>2</td>
+<td><a href="https://afltables.com/afl/stats/players/R/Ross_Smith.html">Smith, Ross</a></td>
+<td>2-Jan-1982</td><td>1 (0-0-1)</td><td>0</td><td>2003</td></tr>
+</tbody>
+</table>
+"""
+
+_GAMES_HEADER = (
+    "<thead><tr><th>Rnd</th><th>T</th><th>Opponent</th><th>Scoring</th><th>F</th><th>Scoring</th><th>A</th>"
+    "<th>R</th><th>M</th><th>W-D-L</th><th>Venue</th><th>Crowd</th><th>Date</th></tr>"
+    '<tr><th colspan="13">{year}</th></tr></thead>'
+)
+_GAMES_ROW = "<tr>" + "<td>{}</td>" * 13 + "</tr>"
+_GAMES_FOOTER = _GAMES_ROW.format(*["Totals"] + [""] * 12) + _GAMES_ROW.format(*["Averages"] + [""] * 12)
+_GAMES = {
+    1992: [
+        (
+            "R1", "A", "Geelong", "3.2 5.4 8.6 10.8", "68", "4.1 7.3 9.5 12.7", "79", "L", "-11", "0-0-1",
+            "Kardinia Park", "24,511", "Sat 28-Mar-1992 2:10 PM",
+        ),
+        (
+            "R2", "H", "Carlton", "5.5 8.8 12.10 16.12", "108", "2.1 4.3 6.7 9.9", "63", "W", "45", "1-0-1",
+            "Football Park", "", "Sat 04-Apr-1992",
+        ),
+    ],
+    1991: [
+        (
+            "R1", "H", "Hawthorn", "6.2 11.3 19.6 24.11", "155", "1.2 4.5 7.7 9.8", "62", "W", "93", "1-0-0",
+            "Football Park", "44,902", "Fri 22-Mar-1991 7:40 PM",
+        ),
+    ],
+}
+
+# Games page of a team (`teams/{team}/allgames.html`) with three games over two seasons, most recent first
+GAMES_PAGE = "<html><body>{}</body></html>".format(
+    "".join(
+        f"<table>{_GAMES_HEADER.format(year=year)}<tbody>{''.join(_GAMES_ROW.format(*row) for row in rows)}</tbody>"
+        f"<tfoot>{_GAMES_FOOTER}</tfoot></table>"
+        for year, rows in _GAMES.items()
+    )
+)
+
+
+SEASON_TEAMS = [
+    "Adelaide", "Brisbane Lions", "Carlton", "Collingwood", "Essendon", "Fremantle", "Geelong", "Gold Coast",
+    "Greater Western Sydney", "Hawthorn", "Melbourne", "North Melbourne", "Port Adelaide", "Richmond",
+    "St Kilda", "Sydney", "West Coast", "Western Bulldogs",
+]
+SEASON_VENUES = ["M.C.G.", "Docklands", "Adelaide Oval", "Perth Stadium", "Gabba", "S.C.G.", "Kardinia Park"]
+SEASON_FINALS = [
+    ("Qualifying Final", 2), ("Elimination Final", 2), ("Semi Final", 2), ("Preliminary Final", 2), ("Grand Final", 1),
+]
+
+
+def _quarters(rng):
+    goals = behinds = 0
+    quarters = []
+    for _ in range(4):
+        goals += rng.randint(0, 6)
+        behinds += rng.randint(0, 6)
+        quarters.append(f"{goals}.{behinds}")
+    return quarters, goals * 6 + behinds
+
+
+def _match_table(rng, year, date, home, away, complete=True):
+    home_quarters, home_score = _quarters(rng)
+    away_quarters, away_score = _quarters(rng)
+    if not complete:
+        home_quarters = away_quarters = []
+        home_score = away_score = ""
+    # Matches played outside of Victoria also show the AEST start time in brackets
+    start = date.strftime("%a %d-%b-%Y %-I:%M %p")
+    if rng.random() < 0.3:
+        start += (date + timedelta(minutes=30)).strftime(" (%-I:%M %p)")
+    if complete and home_score != away_score:
+        winner = home if home_score > away_score else away
+        result = f"<b>{winner}</b> won by <b>{abs(home_score - away_score)} pts</b>"
+    else:
+        result = "Match drawn" if complete else ""
+    venue = rng.choice(SEASON_VENUES)
+    return (
+        '<table style="font: 12px Verdana;" width="100%" border="1">'
+        f'<tr><td width="16%"><a href="../teams/{home.lower()}/{year}_gbg.html">{home}</a></td>'
+        f'<td width="17%"><tt>{"&nbsp;&nbsp;".join(home_quarters)}</tt></td><td width="5%"><b>{home_score}</b></td>'
+        f'<td width="62%"><font size="1">{start} <b>Att:</b> {rng.randint(5000, 99000):,} <b>Venue:</b> '
+        f'<a href="../venues/{venue}.html">{venue}</a></font></td></tr>'
+        f'<tr><td><a href="../teams/{away.lower()}/{year}_gbg.html">{away}</a></td>'
+        f'<td><tt>{"&nbsp;&nbsp;".join(away_quarters)}</tt></td><td><b>{away_score}</b></td>'
+        f'<td>{result} [<a href="../stats/games/{year}/{rng.randint(0, 10**9)}.html">Match stats</a>]</td></tr>'
+        "</table><br>\n"
+    )
+
+
+def _ladder_table(rng, label, teams):
+    rows = "".join(
+        f"<tr><td>{team}</td><td>{rng.randint(0, 80)}</td><td>{rng.uniform(60, 150):.1f}</td></tr>" for team in teams
+    )
+    return f'<table border="1"><tr><td colspan="3"><b>{label}</b></td></tr>{rows}</table>\n'
+
+
+def season_page(
+    year: int = 2017, rounds: int = 23, finals: bool = True, complete_rounds: int = None, seed: int = 0
+) -> bytes:
+    """
+    Returns a page laid out like the afltables `seas/{year}.html` pages: for each round a round heading, one
+    table per match, a bye table and the round's ladder; then the finals; then the end-of-season ladder.
+    Matches from round `complete_rounds + 1` onwards have no scores (a season in progress).
+    """
+    rng = random.Random(seed)
+    date = datetime(year, 3, 20, 19, 25)
+    parts = []
+    for round in range(1, rounds + 1):
+        parts.append(f'<table width="100%"><tr><td colspan="5"><b>Round: {round}</b></td></tr></table>\n')
+        teams = rng.sample(SEASON_TEAMS, len(SEASON_TEAMS))
+        for home, away in zip(teams[0:16:2], teams[1:16:2]):
+            complete = complete_rounds is None or round <= complete_rounds
+            parts.append(_match_table(rng, year, date, home, away, complete))
+            date += timedelta(hours=rng.choice([3, 5, 20]))
+        parts.append(f'<table><tr><td>Bye</td><td>{teams[16]}, {teams[17]}</td></tr></table>\n')
+        parts.append(_ladder_table(rng, f"Rd {round} Ladder", teams))
+        date += timedelta(days=3)
+    if finals:
+        for stage, matches in SEASON_FINALS:
+            parts.append(f'<table width="100%"><tr><td colspan="5"><b>{stage}</b></td></tr></table>\n')
+            for _ in range(matches):
+                home, away = rng.sample(SEASON_TEAMS, 2)
+                parts.append(_match_table(rng, year, date, home, away))
+                date += timedelta(days=1)
+            date += timedelta(days=5)
+    rows = "".join(
+        f"<tr><td>{team}</td><td>{i}</td><td>{rng.randint(0, 80)}</td><td>{rng.uniform(60, 150):.1f}</td></tr>"
+        for i, team in enumerate(SEASON_TEAMS, 1)
+    )
+    parts.append(
+        '<table border="1"><thead><tr><th colspan="2">Team</th><th colspan="2">Ladder</th></tr>'
+        f"<tr><th>Name</th><th>#</th><th>Pts</th><th>%</th></tr></thead><tbody>{rows}"
+        "<tr><td>Totals</td><td></td><td>1296</td><td></td></tr></tbody></table>\n"
+    )
+    return f"<html><head><title>{year} Season</title></head><body>{''.join(parts)}</body></html>".encode()
+
+
+_FIRST_NAMES = ["Jack", "Tom", "Sam", "Josh", "Ben", "Matt", "Luke", "Dan", "Nick", "Alex", "Will", "Jake"]
+_LAST_NAMES = ["Martin", "Smith", "Brown", "Riewoldt", "Cotchin", "Edwards", "Grimes", "Vlastuin", "Lynch", "Prestia"]
+_STATS = ["KI", "MK", "HB", "DI", "GL", "BH", "HO", "TK", "RB", "IF", "CL", "CG", "FF", "FA", "BR", "CP", "UP", "CM"]
+
+
+def _player_names(rng, count: int, surnames=_LAST_NAMES) -> list:
+    suffixes = ["", "e", "son", "ey"]
+    return [(rng.choice(_FIRST_NAMES), rng.choice(surnames) + rng.choice(suffixes)) for _ in range(count)]
+
+
+def _player_href(first: str, last: str) -> str:
+    return f"players/{first[0]}/{first}_{last}.html"
+
+
+def index_page(player: str = "Stuart Magee", count: int = 1500, seed: int = 0) -> bytes:
+    """
+    Returns a `stats/players{initial}_idx.html` page: one row per player whose surname starts with the
+    initial of `player`, linking to the player's page. `player` is listed among `count` other players.
+    """
+    rng = random.Random(seed)
+    first, last = player.split(" ", 1)
+    surnames = [last[0].upper() + name[1:] for name in _LAST_NAMES]
+    names = sorted(_player_names(rng, count, surnames))
+    names.insert(count // 2, (first, last.replace(" ", "_")))
+    rows = "".join(
+        f'<tr><td><a href="{_player_href(first, last)}">{last}, {first}</a></td>'
+        f"<td>{rng.randint(1897, 2020)}</td><td>{rng.randint(1, 300)}</td><td>{rng.choice(SEASON_TEAMS)}</td></tr>\n"
+        for first, last in names
+    )
+    return f"<html><body><table><tbody>{rows}</tbody></table></body></html>".encode()
+
+
+def listed_index_page(players) -> bytes:
+    """
+    Returns a short `stats/players{initial}_idx.html` page listing only `players`, in order: tuples of the
+    name as listed and the path of the player page, eg ("Brown, Nathan", "N/Nathan_Brown0.html").
+    """
+    rows = "".join(f'<tr><td><a href="players/{path}">{name}</a></td></tr>\n' for name, path in players)
+    return f"<html><body><table><tbody>{rows}</tbody></table></body></html>".encode()
+
+
+def player_page(seasons: int = 14, seed: int = 0) -> bytes:
+    """Returns a player page: bio, career totals and averages, and one table of games per season."""
+    rng = random.Random(seed)
+    years = range(1962, 1962 + seasons)
+    header = "".join(f"<th>{stat}</th>" for stat in _STATS)
+    totals, averages, games = [], [], []
+    for year in years:
+        stats = [rng.randint(0, 400) for _ in _STATS]
+        totals.append(
+            f'<tr><td>{year}</td><td><a href="../../teams/stkilda_idx.html">St Kilda</a></td><td>22</td>' +
+            "".join(f"<td>{stat}</td>" for stat in stats) + "</tr>"
+        )
+        averages.append(
+            f"<tr><td>{year}</td><td>St Kilda</td><td>22</td>" +
+            "".join(f"<td>{stat / 22:.2f}</td>" for stat in stats) + "</tr>"
+        )
+        rows = "".join(
+            f"<tr><td>{game}</td><td>{rng.choice(SEASON_TEAMS)}</td>" +
+            "".join(f"<td>{rng.randint(0, 30)}</td>" for _ in _STATS) + "</tr>"
+            for game in range(1, 23)
+        )
+        games.append(
+            f'<table><thead><tr><th colspan="{len(_STATS) + 2}">St Kilda - {year}</th></tr>'
+            f"<tr><th>Gm</th><th>Opponent</th>{header}</tr></thead><tbody>{rows}</tbody></table>\n"
+        )
+    columns = f"<thead><tr><th>Year</th><th>Team</th><th>GM</th>{header}</tr></thead>"
+    return (
+        "<html><body><center><b>Born:</b> 13-Oct-1943 (<b>Debut:</b> 18y 218d <b>Last:</b> 31y 321d)<br>"
+        "<b>Height:</b> 180 cm <b>Weight:</b> 80 kg</center>\n"
+        f"<table>{columns}<tbody>{''.join(totals)}</tbody>"
+        f"<tfoot><tr><td>Totals</td><td></td><td>{22 * seasons}</td>{'<td>0</td>' * len(_STATS)}</tr></tfoot>"
+        "</table>\n"
+        f"<table>{columns}<tbody>{''.join(averages)}</tbody></table>\n"
+        f"{''.join(games)}</body></html>"
+    ).encode()
+
+
+def team_players_page(count: int = 1400, seed: int = 0) -> bytes:
+    """
+    Returns a `stats/teams/{team}.html` page: one row per player who has played for the team, with their
+    games (wins, draws and losses), goals and seasons for the team.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i, (first, last) in enumerate(_player_names(rng, count), 1):
+        games = rng.randint(1, 300)
+        wins = rng.randint(0, games)
+        draws = rng.randint(0, (games - wins) // 10)
+        debut = rng.randint(1908, 2020)
+        final = min(2022, debut + rng.randint(0, 15))
+        born = datetime(debut - rng.randint(17, 22), rng.randint(1, 12), rng.randint(1, 28))
+        rows.append(
+            f'<tr><td>{i}</td><td>{rng.randint(1, 60)}</td><td><a href="../{_player_href(first, last)}">{last}, '
+            f"{first}</a></td><td>{born:%d-%b-%Y}</td><td>{games} ({wins}-{draws}-{games - wins - draws})</td>"
+            f"<td>{rng.randint(0, 500)}</td><td>{debut}{f'-{final}' if final > debut else ''}</td></tr>\n"
+        )
+    return (
+        "<html><body><table><thead><tr><th>Cap</th><th>#</th><th>Player</th><th>DOB</th><th>Games (W-D-L)</th>"
+        f"<th>Goals</th><th>Seasons</th></tr></thead><tbody>{''.join(rows)}</tbody></table></body></html>"
+    ).encode()
+
+
+def allgames_page(first_year: int = 1908, last_year: int = 2022, seed: int = 0) -> bytes:
+    """Returns a `teams/{team}/allgames.html` page: one table of games per season, most recent first."""
+    rng = random.Random(seed)
+    row = "<tr>" + "<td>{}</td>" * 13 + "</tr>"
+    tables = []
+    for year in range(last_year, first_year - 1, -1):
+        date = datetime(year, 3, 25, 14, 10)
+        wins = draws = losses = 0
+        rows = []
+        for round in range(1, 23):
+            quarters_for, score_for = _quarters(rng)
+            quarters_against, score_against = _quarters(rng)
+            result = "W" if score_for > score_against else "L" if score_for < score_against else "D"
+            wins, draws, losses = wins + (result == "W"), draws + (result == "D"), losses + (result == "L")
+            rows.append(row.format(
+                f"R{round}", rng.choice("HA"), rng.choice(SEASON_TEAMS), " ".join(quarters_for), score_for,
+                " ".join(quarters_against), score_against, result, score_for - score_against,
+                f"{wins}-{draws}-{losses}", rng.choice(SEASON_VENUES), f"{rng.randint(5000, 99000):,}",
+                date.strftime("%a %d-%b-%Y %-I:%M %p"),
+            ))
+            date += timedelta(days=7)
+        tables.append(
+            "<table><thead><tr><th>Rnd</th><th>T</th><th>Opponent</th><th>Scoring</th><th>F</th><th>Scoring</th>"
+            "<th>A</th><th>R</th><th>M</th><th>W-D-L</th><th>Venue</th><th>Crowd</th><th>Date</th></tr>"
+            f'<tr><th colspan="13">{year}</th></tr></thead><tbody>{"".join(rows)}</tbody>'
+            f"<tfoot>{row.format(*['Totals'] + [''] * 12)}{row.format(*['Averages'] + [''] * 12)}</tfoot></table>\n"
+        )
+    return f"<html><body>{''.join(tables)}</body></html>".encode()
+
+
+def stats_page(year: int = 2019, players: int = 40, seed: int = 0) -> bytes:
+    """Returns a `stats/{year}.html` page: one table of player season stats per team."""
+    rng = random.Random(seed)
+    header = "".join(f"<th>{stat}</th>" for stat in _STATS)
+    tables = []
+    for team in SEASON_TEAMS:
+        rows = "".join(
+            f"<tr><td>{rng.randint(1, 50)}</td><td>{last}, {first}</td>" +
+            "".join(f"<td>{rng.randint(0, 600):,}</td>" for _ in _STATS) + "</tr>"
+            for first, last in _player_names(rng, players)
+        )
+        tables.append(
+            f'<table><thead><tr><th colspan="{len(_STATS) + 2}">{team} [Game by Game]</th></tr>'
+            f"<tr><th>#</th><th>Player</th>{header}</tr></thead><tbody>{rows}</tbody>"
+            f"<tfoot><tr><td></td><td>Totals</td>{'<td>0</td>' * len(_STATS)}</tr></tfoot></table>\n"
+        )
+    return f"<html><body>{''.join(tables)}</body></html>".encode()
+
+
+def synthetic_pages(player: str = "Stuart Magee", team: str = "richmond", year: int = 2019) -> dict:
+    """
+    Returns synthetic pages of roughly the size of the real ones, keyed by their path below the afltables
+    base url: the index page and page of `player`, the players and games pages of `team` (url identifier),
+    and the season and player stats pages of `year`.
+    """
+    first, last = player.split(" ", 1)
+    return {
+        f"stats/players{last[0].upper()}_idx.html": index_page(player=player),
+        f"stats/{_player_href(first, last.replace(' ', '_'))}": player_page(),
+        f"stats/teams/{team}.html": team_players_page(),
+        f"teams/{team}/allgames.html": allgames_page(),
+        f"stats/{year}.html": stats_page(year),
+        f"seas/{year}.html": season_page(year=year),
+    }
+
+
+def load_pages(fixtures_dir: str) -> dict:
+    """Returns the pages recorded in `fixtures_dir` (see `record_pages`), keyed by their path below the base url."""
+    pages = {}
+    for root, _, files in os.walk(fixtures_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                pages[os.path.relpath(path, fixtures_dir).replace(os.sep, "/")] = f.read()
+    return pages
+
+
+def record_pages(fixtures_dir: str, pages) -> dict:
+    """
+    Downloads `pages` (paths below the afltables base url, eg "seas/2019.html") from afltables.com into
+    `fixtures_dir`, and returns them keyed by path.
+    """
+    recorded = {}
+    for page in pages:
+        # Use plain requests: the pyAFL session would return an already rewritten page
+        resp = requests.get(config.AFLTABLES_STATS_BASE_URL + page)
+        resp.raise_for_status()
+        path = os.path.join(fixtures_dir, *page.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(resp.content)
+        recorded[page] = resp.content
+    return recorded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures_dir", help="directory to save the recorded pages to")
+    parser.add_argument("pages", nargs="*", help="paths below the base url (default: those of synthetic_pages)")
+    args = parser.parse_args()
+    recorded = record_pages(args.fixtures_dir, args.pages or list(synthetic_pages()))
+    print(f"Recorded {len(recorded)} pages to {args.fixtures_dir}")
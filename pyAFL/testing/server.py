@@ -0,0 +1,273 @@
+"""
+A local HTTP server standing in for afltables.com.
+
+The server replays pages (recorded or synthetic, see `pyAFL.testing.fixtures`) with configurable latency,
+bandwidth, error rate and ETag behaviour. Point the session at it with `session.use_base_url(server.base_url)`
+to test or benchmark the concurrency, caching and revalidation of pyAFL deterministically, without
+the network:
+
+    >>> from pyAFL.seasons.models import Season
+    >>> from pyAFL.session import session
+    >>> from pyAFL.testing.fixtures import synthetic_pages
+    >>> from pyAFL.testing.server import StandInServer
+    >>> with StandInServer(synthetic_pages(), latency=0.05) as server:
+    ...     session.use_base_url(server.base_url)
+    ...     stats = Season(2019).get_season_stats()
+    >>> session.use_base_url(None)
+
+Or run it from the command line, eg to load test another process (with PYAFL_BASE_URL set to the base url
+it prints):
+
+    python -m pyAFL.testing.server --fixtures DIR --port 8000 --latency 0.05 --error-rate 0.01
+"""
+import argparse
+import hashlib
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ETag behaviours
+ETAGS = ("strong", "weak", None)
+
+DEFAULT_LAST_MODIFIED = "Mon, 01 Jan 2018 00:00:00 GMT"
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        stand_in = self.server.stand_in
+        path = self.path.split("?", 1)[0]
+        stand_in._count("hits", path)
+        if stand_in.latency or stand_in.jitter:
+            time.sleep(stand_in.latency + stand_in._random() * stand_in.jitter)
+
+        if stand_in.error_rate and stand_in._random() < stand_in.error_rate:
+            stand_in._count("errors", path)
+            return self._send(stand_in.error_status)
+
+        body = stand_in.pages.get(path)
+        if body is None:
+            return self._send(404)
+
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        etag = stand_in.etag(body)
+        if etag:
+            headers["ETag"] = etag
+        if stand_in.last_modified:
+            headers["Last-Modified"] = stand_in.last_modified
+
+        if etag and "If-None-Match" in self.headers:
+            not_modified = etag in [value.strip() for value in self.headers["If-None-Match"].split(",")]
+        else:
+            modified_since = self.headers.get("If-Modified-Since")
+            not_modified = bool(stand_in.last_modified) and modified_since == stand_in.last_modified
+        if not_modified:
+            stand_in._count("not_modified", path)
+            return self._send(304, headers)
+
+        self._send(200, headers, body)
+
+    def _send(self, status: int, headers: dict = None, body: bytes = b""):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self._write(body)
+
+    def _write(self, body: bytes):
+        bandwidth = self.server.stand_in.bandwidth
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+        # Sends the body in chunks of 1/20 s worth of bytes
+        chunk_size = max(1, int(bandwidth / 20))
+        for i in range(0, len(body), chunk_size):
+            chunk = body[i:i + chunk_size]
+            self.wfile.write(chunk)
+            self.wfile.flush()
+            time.sleep(len(chunk) / bandwidth)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(object):
+    """
+    A local HTTP server replaying afltables pages, in a background thread.
+     - Each GET waits `latency` seconds (plus up to `jitter` seconds), then fails with `error_status`
+     with probability `error_rate`, else sends the page at `bandwidth` bytes per second. Unknown paths
+     get a 404.
+     - Pages are sent with an ETag (a digest of the page; "weak" ETags are prefixed with W/) and a
+     Last-Modified header. Conditional requests for an unchanged page get a 304.
+     - The hits, errors and 304s of each path are counted.
+
+    Settings can be changed while the server runs, eg `server.latency = 0.2`.
+
+    Attributes
+    ----------
+    pages : dict
+        page content (bytes) keyed by request path, eg "/afl/seas/2019.html"
+    latency, jitter : float
+        seconds before each response
+    bandwidth : float
+        bytes per second the body of each response is sent at (unlimited if None)
+    error_rate : float
+        proportion of requests answered with `error_status`
+    error_status : int
+        status of the failed requests (default 503)
+    etags : str
+        "strong", "weak" or None (no ETags)
+    last_modified : str
+        Last-Modified header sent with every page (None to send none)
+    hits, errors, not_modified : collections.Counter
+        number of requests, failed requests and 304 responses per path
+    url : str
+        url of the server, eg "http://127.0.0.1:8000"
+    base_url : str
+        url the afltables pages are served below, for `session.use_base_url`
+
+    Methods
+    -------
+    start()
+        starts serving, in a background thread
+    stop()
+        stops serving
+    add_pages(pages, prefix="/afl/")
+        serves `pages` (keyed by path below the afltables base url) below `prefix`
+    reset_counts()
+        empties `hits`, `errors` and `not_modified`
+    """
+
+    def __init__(
+        self,
+        pages: dict = None,
+        latency: float = 0,
+        jitter: float = 0,
+        bandwidth: float = None,
+        error_rate: float = 0,
+        error_status: int = 503,
+        etags: str = "strong",
+        last_modified: str = DEFAULT_LAST_MODIFIED,
+        seed: int = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        if etags not in ETAGS:
+            raise ValueError(f"Unknown ETag behaviour '{etags}'. Choose one of: {', '.join(map(str, ETAGS))}")
+        self.pages = {}
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.etags = etags
+        self.last_modified = last_modified
+        self.hits = Counter()
+        self.errors = Counter()
+        self.not_modified = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._address = (host, port)
+        self._server = None
+        self._thread = None
+        if pages:
+            self.add_pages(pages)
+
+    def __repr__(self):
+        return f"<StandInServer: {self.url if self._server else 'stopped'}, {len(self.pages)} pages>"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        return self.url + "/afl/"
+
+    def add_pages(self, pages: dict, prefix: str = "/afl/"):
+        """Serves `pages` (content keyed by path below the afltables base url, eg "seas/2019.html") below `prefix`."""
+        self.pages.update({prefix + path.lstrip("/"): body for path, body in pages.items()})
+
+    def etag(self, body: bytes):
+        """Returns the ETag sent with `body`, or None."""
+        if self.etags is None:
+            return None
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        return "W/" + etag if self.etags == "weak" else etag
+
+    def reset_counts(self):
+        with self._lock:
+            self.hits.clear()
+            self.errors.clear()
+            self.not_modified.clear()
+
+    def _count(self, counter: str, path: str):
+        with self._lock:
+            getattr(self, counter)[path] += 1
+
+    def _random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def start(self) -> "StandInServer":
+        """Starts serving in a background thread. Returns the server."""
+        if self._server is None:
+            self._server = ThreadingHTTPServer(self._address, _StandInHandler)
+            self._server.daemon_threads = True
+            self._server.stand_in = self
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = self._thread = None
+
+
+if __name__ == "__main__":
+    from pyAFL.testing.fixtures import load_pages, synthetic_pages
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", help="directory of recorded pages (default: synthetic pages)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0, help="seconds before each response")
+    parser.add_argument("--jitter", type=float, default=0, help="up to this many more seconds before each response")
+    parser.add_argument("--bandwidth", type=float, help="bytes per second of each response")
+    parser.add_argument("--error-rate", type=float, default=0, help="proportion of requests which fail")
+    parser.add_argument("--error-status", type=int, default=503, help="status of the failed requests")
+    parser.add_argument("--etags", choices=["strong", "weak", "none"], default="strong")
+    args = parser.parse_args()
+
+    server = StandInServer(
+        load_pages(args.fixtures) if args.fixtures else synthetic_pages(),
+        latency=args.latency,
+        jitter=args.jitter,
+        bandwidth=args.bandwidth,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        etags=None if args.etags == "none" else args.etags,
+        host=args.host,
+        port=args.port,
+    ).start()
+    print(f"Serving {len(server.pages)} pages below {server.base_url} (PYAFL_BASE_URL={server.base_url})")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
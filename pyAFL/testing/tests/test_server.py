@@ -0,0 +1,168 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+import requests
+
+from pyAFL.players.models import Player
+from pyAFL.seasons.models import Season
+from pyAFL.session import session
+from pyAFL.session.aio import AsyncAFLTablesSession
+from pyAFL.session.freshness import FreshnessPolicy
+from pyAFL.testing.fixtures import load_pages, season_page, synthetic_pages
+from pyAFL.testing.server import StandInServer
+
+PAGE = b"<html><body>Season 2019</body></html>"
+
+
+@pytest.fixture
+def server():
+    with StandInServer({"seas/2019.html": PAGE}, seed=0) as server:
+        yield server
+
+
+class TestStandInServer:
+    def test_pages_are_served_with_validators(self, server):
+        resp = requests.get(server.base_url + "seas/2019.html")
+
+        assert resp.status_code == 200
+        assert resp.content == PAGE
+        assert resp.headers["ETag"] == server.etag(PAGE)
+        assert resp.headers["Last-Modified"] == server.last_modified
+        assert requests.get(server.base_url + "seas/2010.html").status_code == 404
+        assert server.hits == {"/afl/seas/2019.html": 1, "/afl/seas/2010.html": 1}
+
+    def test_conditional_requests(self, server):
+        url = server.base_url + "seas/2019.html"
+        etag = requests.get(url).headers["ETag"]
+
+        assert requests.get(url, headers={"If-None-Match": etag}).status_code == 304
+        assert requests.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+        assert requests.get(url, headers={"If-Modified-Since": server.last_modified}).status_code == 304
+        assert server.not_modified["/afl/seas/2019.html"] == 2
+
+    def test_weak_and_missing_etags(self, server):
+        url = server.base_url + "seas/2019.html"
+        server.etags = "weak"
+        assert requests.get(url).headers["ETag"].startswith('W/"')
+
+        server.etags = None
+        server.last_modified = None
+        resp = requests.get(url)
+        assert "ETag" not in resp.headers and "Last-Modified" not in resp.headers
+        assert requests.get(url, headers={"If-Modified-Since": "Mon, 01 Jan 2018 00:00:00 GMT"}).status_code == 200
+
+    def test_latency_and_bandwidth(self, server):
+        url = server.base_url + "seas/2019.html"
+        server.latency = 0.2
+        start = time.monotonic()
+        requests.get(url)
+        assert time.monotonic() - start >= 0.2
+
+        server.latency = 0
+        server.pages["/afl/seas/2019.html"] = b"x" * 20000
+        server.bandwidth = 50000
+        start = time.monotonic()
+        assert len(requests.get(url).content) == 20000
+        assert time.monotonic() - start >= 0.3
+
+    def test_error_rate(self, server):
+        url = server.base_url + "seas/2019.html"
+        server.error_rate = 0.5
+        statuses = [requests.get(url).status_code for _ in range(40)]
+
+        assert set(statuses) == {200, 503}
+        assert server.errors["/afl/seas/2019.html"] == statuses.count(503)
+
+        # The same seed fails the same requests
+        with StandInServer({"seas/2019.html": PAGE}, error_rate=0.5, seed=0) as other:
+            assert [requests.get(other.base_url + "seas/2019.html").status_code for _ in range(40)] == statuses
+
+    def test_unknown_etag_behaviour(self):
+        with pytest.raises(ValueError):
+            StandInServer(etags="sometimes")
+
+
+class TestFixtures:
+    def test_recorded_pages_are_loaded_by_path(self, tmp_path):
+        (tmp_path / "stats" / "players" / "S").mkdir(parents=True)
+        (tmp_path / "stats" / "players" / "S" / "Stuart_Magee.html").write_bytes(b"player")
+        (tmp_path / "seas").mkdir()
+        (tmp_path / "seas" / "2019.html").write_bytes(PAGE)
+
+        assert load_pages(str(tmp_path)) == {"stats/players/S/Stuart_Magee.html": b"player", "seas/2019.html": PAGE}
+
+    def test_synthetic_pages(self):
+        pages = synthetic_pages(player="Stuart Magee", team="richmond", year=2019)
+
+        assert sorted(pages) == [
+            "seas/2019.html",
+            "stats/2019.html",
+            "stats/players/S/Stuart_Magee.html",
+            "stats/playersM_idx.html",
+            "stats/teams/richmond.html",
+            "teams/richmond/allgames.html",
+        ]
+        assert b"players/S/Stuart_Magee.html" in pages["stats/playersM_idx.html"]
+        assert pages["seas/2019.html"] == season_page(year=2019)
+
+
+class TestBaseUrlOverride:
+    def test_models_are_served_by_the_stand_in(self, afltables):
+        player = Player("Stuart Magee")
+        stats = Season(2019).get_season_stats()
+
+        assert player.url == "https://afltables.com/afl/stats/players/S/Stuart_Magee.html"
+        assert player.get_player_stats().season_results.years[0] == 1962
+        assert len(stats.season_matches) > 0
+        assert afltables.hits["/afl/stats/playersM_idx.html"] == 1
+        assert afltables.hits["/afl/seas/2019.html"] == 1
+
+    def test_responses_keep_afltables_urls(self, afltables):
+        url = "https://afltables.com/afl/stats/playersM_idx.html"
+        resp = session.get(url)
+
+        assert resp.url == url
+        assert b'href="https://afltables.com/afl/stats/players/S/Stuart_Magee.html"' in resp.content
+        assert session.get(url).from_cache
+        assert afltables.hits["/afl/stats/playersM_idx.html"] == 1
+
+    def test_revalidation(self, afltables, monkeypatch):
+        monkeypatch.setattr(session, "freshness", FreshnessPolicy(current_ttl=timedelta(0), current_season=2019))
+        url = "https://afltables.com/afl/seas/2019.html"
+        session.get(url)
+
+        assert session.get(url).from_cache
+        assert afltables.not_modified["/afl/seas/2019.html"] == 1
+
+    def test_concurrent_requests_under_latency(self, afltables):
+        afltables.add_pages({f"seas/{year}.html": PAGE for year in range(2010, 2018)})
+        afltables.latency = 0.2
+        urls = [f"https://afltables.com/afl/seas/{year}.html" for year in range(2010, 2018)]
+
+        start = time.monotonic()
+        responses = list(session.get_many(urls, max_workers=8))
+
+        assert sorted(resp.url for resp in responses) == urls
+        assert time.monotonic() - start < 0.2 * len(urls) / 2
+
+    def test_async_session(self, afltables):
+        url = "https://afltables.com/afl/stats/playersM_idx.html"
+
+        async def get():
+            async with AsyncAFLTablesSession() as async_session:
+                return await async_session.get(url)
+
+        resp = asyncio.run(get())
+
+        assert resp.status_code == 200
+        assert resp.url == url
+        assert afltables.hits["/afl/stats/playersM_idx.html"] == 1
+
+    def test_unmounted(self, afltables):
+        session.use_base_url(None)
+
+        url = "https://afltables.com/afl/seas/2019.html"
+        assert session.transport_url(url) == url
+        assert "https://afltables.com/afl/" not in session.adapters